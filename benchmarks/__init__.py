@@ -0,0 +1,5 @@
+# pycoreconf benchmarks
+#
+# Offline benchmark suite for the conversion and datastore hot paths, run on
+# the bundled samples and on synthetic configs of growing size and depth.
+# Run with: python -m benchmarks --help
@@ -0,0 +1,63 @@
+# pycoreconf benchmark suite
+#
+# Usage (from the project root):
+#   python -m benchmarks                          # run, compare with benchmarks/baseline.json
+#   python -m benchmarks --filter "datastore/*"   # only matching cases (glob)
+#   python -m benchmarks --save-baseline          # run and store the results as the new baseline
+#   python -m benchmarks --threshold 0.3 --quick  # 30% tolerance, smaller synthetic scales
+#
+# Exits with status 1 if a case regressed beyond the threshold.
+
+import argparse
+import sys
+from pathlib import Path
+
+from . import cases, runner
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="pycoreconf benchmark suite")
+    parser.add_argument("--filter", metavar="GLOB", help="only run cases whose name matches GLOB")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per case (best is kept)")
+    parser.add_argument("--quick", action="store_true", help="use smaller synthetic scales")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="tolerated relative regression (default: 0.2, i.e. 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--output", type=Path, help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = runner.run(cases.all_cases(quick=args.quick), args.filter, args.repeat)
+
+    if args.output:
+        runner.save(args.output, results)
+
+    if args.save_baseline:
+        if args.baseline.exists():
+            # Keep the baseline of the cases that were not run
+            merged = runner.load(args.baseline)
+            merged.update(results)
+            results = merged
+        runner.save(args.baseline, results)
+        print(f"\nBaseline saved to {args.baseline} ({len(results)} cases)")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    regressions = runner.compare(results, runner.load(args.baseline), args.threshold)
+    if not regressions:
+        print(f"\nNo regression beyond {args.threshold:.0%} (baseline: {args.baseline})")
+        return 0
+
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} (baseline: {args.baseline}):")
+    for name, metric, base, current, change in regressions:
+        print(f"  {name:<60} {metric:<12} {base:>12.1f} -> {current:>12.1f} ({change:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# pycoreconf benchmark: "encode"
+# Measures encode() and encode_stream() time and peak memory on the sample configurations:
+#  - samples/multisid: schc.json (ietf-schc + ietf-schc-oam)
+#  - samples/datastore: seeded coreconf-m2m transducer configs of growing size
+#
+# Usage: python benchmarks/bench_encode.py [--repeat N] [--transducers N ...]
+
+import argparse
+import json
+import random
+import timeit
+import tracemalloc
+from pathlib import Path
+
+import pycoreconf
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SAMPLES = PROJECT_ROOT / "samples"
+
+M2M_TYPES = [
+    "coreconf-m2m:solar-radiation", "coreconf-m2m:precipitation",
+    "coreconf-m2m:air-temperature", "coreconf-m2m:relative-humidity",
+    "coreconf-m2m:barometric-pressure", "coreconf-m2m:wind-speed",
+]
+
+
+def count_nodes(obj):
+    """Return the number of dict/list/leaf nodes of a tree."""
+    count = 0
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        count += 1
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return count
+
+
+def m2m_config(n_transducers, seed=0):
+    """Generate a coreconf-m2m config with n transducers (same shape as samples/datastore/main.py)."""
+    rng = random.Random(seed)
+    transducers = []
+    for i in range(n_transducers):
+        value = rng.randint(0, 1000)
+        transducers.append({
+            "type": M2M_TYPES[i % len(M2M_TYPES)],
+            "id": i // len(M2M_TYPES),
+            "unit": "u",
+            "precision": rng.randint(0, 2),
+            "quantity": {
+                "value": value,
+                "statistics": {
+                    "min": value - rng.randint(0, 50),
+                    "max": value + rng.randint(0, 50),
+                    "mean": value,
+                    "median": value,
+                    "stdev": rng.randint(0, 100),
+                    "sample-count": rng.randint(100, 10000),
+                },
+            },
+        })
+    return {"coreconf-m2m:transducers": {"transducer": transducers}}
+
+
+class NullWriter:
+    """Binary sink discarding everything written to it."""
+
+    def write(self, data):
+        return len(data)
+
+
+def measure(name, func, nodes, repeat):
+    """Print time per call and peak traced memory of func()."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<36} nodes={nodes:>7}  "
+          f"{best * 1e6:>10.1f} us/op  peak={peak / 1024:>9.1f} KiB")
+
+
+def bench(name, model, config, repeat):
+    """Benchmark encode() and, when available, encode_stream() on one config."""
+    nodes = count_nodes(config)
+    measure(f"{name} encode", lambda: model.encode(config), nodes, repeat)
+    if hasattr(model, "encode_stream"):
+        sink = NullWriter()
+        measure(f"{name} encode_stream", lambda: model.encode_stream(config, sink), nodes, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--transducers", type=int, nargs="+", default=[12, 120, 1200])
+    args = parser.parse_args()
+
+    multisid = pycoreconf.CORECONFModel([
+        str(SAMPLES / "multisid" / "ietf-schc@2023-01-28.sid"),
+        str(SAMPLES / "multisid" / "ietf-schc-oam@2021-11-10.sid"),
+    ])
+    with open(SAMPLES / "multisid" / "schc.json") as f:
+        bench("multisid/schc.json", multisid, json.load(f), args.repeat)
+
+    m2m = pycoreconf.CORECONFModel(str(SAMPLES / "datastore" / "coreconf-m2m@2026-03-29.sid"))
+    for n in args.transducers:
+        bench(f"datastore/m2m x{n}", m2m, m2m_config(n), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
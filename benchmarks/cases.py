@@ -0,0 +1,174 @@
+# Benchmark cases: conversion and datastore hot paths on the bundled samples
+# and on synthetic configs of growing list size and nesting depth.
+#
+# Each case is a (name, setup) pair; setup() builds the workload outside the
+# measurement and returns the zero-argument callable timed as one operation.
+
+import itertools
+import json
+import tempfile
+from pathlib import Path
+
+import cbor2 as cbor
+import pycoreconf
+from pycoreconf.generator import WorkloadGenerator
+
+from . import synthetic
+from .bench_encode import m2m_config
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SAMPLES = PROJECT_ROOT / "samples"
+
+# Synthetic scales: (entries per list, list nesting depth)
+SYNTHETIC_SCALES = [(1000, 1), (32, 2), (10, 3), (5, 5)]
+QUICK_SYNTHETIC_SCALES = [(100, 1), (5, 3)]
+
+# Encoded size of the configs generated from the sample models
+GENERATED_SIZE = 256 * 1024
+
+M2M_TRANSDUCERS = 1200
+SCHC_RULES = 100
+SCHC_ENTRIES = 10
+
+
+def _model(*sid_files):
+    return pycoreconf.CORECONFModel([str(SAMPLES / f) for f in sid_files])
+
+
+def _load_json(path):
+    with open(SAMPLES / path) as f:
+        return json.load(f)
+
+
+def _cycle(items):
+    """Return a callable returning the next item of *items* on each call."""
+    return itertools.cycle(items).__next__
+
+
+def conversion_cases(prefix, model, config):
+    """Cases for encode()/decode() and the tree conversions of one config."""
+    payload = model.encode(config)
+    sid_tree = cbor.loads(payload)
+    return [
+        (f"{prefix}/encode", lambda: lambda: model.encode(config)),
+        (f"{prefix}/decode", lambda: lambda: model.decode(payload)),
+        (f"{prefix}/identifier_to_sid_tree", lambda: lambda: model._identifier_to_sid_tree(config)),
+        (f"{prefix}/sid_to_identifier_tree", lambda: lambda: model._sid_to_identifier_tree(sid_tree)),
+    ]
+
+
+def datastore_cases(prefix, model, payload, xpaths, values):
+    """Cases for datastore get/set/delete on a rotating set of XPaths."""
+
+    def get():
+        ds = model.create_datastore_from_cbor(payload)
+        path = _cycle(xpaths)
+        return lambda: ds[path()]
+
+    def set_():
+        ds = model.create_datastore_from_cbor(payload)
+        path, value = _cycle(xpaths), _cycle(values)
+        def op():
+            ds[path()] = value()
+        return op
+
+    def delete():
+        # Delete then re-create the leaf, so the datastore keeps its size
+        ds = model.create_datastore_from_cbor(payload)
+        path, value = _cycle(xpaths), _cycle(values)
+        def op():
+            xpath = path()
+            del ds[xpath]
+            ds[xpath] = value()
+        return op
+
+    return [
+        (f"{prefix}/ds_get", get),
+        (f"{prefix}/ds_set", set_),
+        (f"{prefix}/ds_delete_set", delete),
+    ]
+
+
+def sample_cases():
+    cases = []
+
+    basic = _model("basic/example-1.sid")
+    cases += conversion_cases("basic", basic, _load_json("basic/ex1-config.json"))
+
+    libconf = _model("libconf/example-2.sid")
+    cases += conversion_cases("libconf", libconf, _load_json("libconf/ex2-config.json"))
+
+    multisid = _model("multisid/ietf-schc@2023-01-28.sid", "multisid/ietf-schc-oam@2021-11-10.sid")
+    schc = _load_json("multisid/schc.json")
+    cases += conversion_cases("multisid/schc", multisid, schc)
+
+    # SID query engine: one leaf of a nested list entry
+    sid_tree = cbor.loads(multisid.encode(schc))
+    rule = [r for r in schc["ietf-schc:schc"]["rule"] if r.get("entry")][-1]
+    entry = rule["entry"][-1]
+    field_length = multisid.sids["/ietf-schc:schc/rule/entry/field-length"]
+    keys = [rule["rule-id-value"], rule["rule-id-length"],
+            multisid.sids[entry["field-id"]], entry["field-position"], multisid.sids[entry["direction-indicator"]]]
+    cases.append(("multisid/schc/execute_sid_query",
+                  lambda: lambda: multisid._execute_sid_query(sid_tree, field_length, keys)))
+
+    m2m = _model("datastore/coreconf-m2m@2026-03-29.sid")
+    m2m_cfg = m2m_config(M2M_TRANSDUCERS)
+    cases += conversion_cases(f"datastore/m2m x{M2M_TRANSDUCERS}", m2m, m2m_cfg)
+    transducers = m2m_cfg["coreconf-m2m:transducers"]["transducer"]
+    cases += datastore_cases(
+        f"datastore/m2m x{M2M_TRANSDUCERS}", m2m, m2m.encode(m2m_cfg),
+        [f"/transducers/transducer[type='{t['type']}'][id='{t['id']}']/quantity/value" for t in transducers[::37]],
+        list(range(100)),
+    )
+
+    ietf_schc = _model("datastore/ietf-schc@2026-02-24.sid")
+    ds = ietf_schc.create_datastore()
+    with ds.transaction() as tx:
+        for r in range(SCHC_RULES):
+            for e in range(SCHC_ENTRIES):
+                tx[f"/schc/rule[rule-id-value='{r}'][rule-id-length='8']/entry[entry-index='{e}']/field-length"] = 8
+    cases += datastore_cases(
+        f"datastore/ietf-schc {SCHC_RULES}x{SCHC_ENTRIES}", ietf_schc, ds.to_cbor(),
+        [f"/schc/rule[rule-id-value='{r}'][rule-id-length='8']/entry[entry-index='{r % SCHC_ENTRIES}']/field-length"
+         for r in range(0, SCHC_RULES, 7)],
+        list(range(1, 64)),
+    )
+
+    return cases
+
+
+def synthetic_cases(scales=SYNTHETIC_SCALES):
+    cases = []
+    for breadth, depth in scales:
+        with tempfile.TemporaryDirectory(prefix="pycoreconf-bench-") as directory:
+            model = pycoreconf.CORECONFModel(synthetic.write_sid_file(directory, depth))
+        config = synthetic.config(breadth, depth)
+        prefix = f"synthetic/{breadth}^{depth}"
+        cases += conversion_cases(prefix, model, config)
+        cases += datastore_cases(
+            prefix, model, model.encode(config),
+            [synthetic.innermost_xpath(depth, i % breadth) for i in range(0, 97, 3)],
+            list(range(100)),
+        )
+    return cases
+
+
+def generated_cases(size=GENERATED_SIZE):
+    """Conversion cases on configs generated from the sample models (see pycoreconf.generator)."""
+    cases = []
+    for name, sid_files in [
+        ("multisid/schc", ("multisid/ietf-schc@2023-01-28.sid", "multisid/ietf-schc-oam@2021-11-10.sid")),
+        ("datastore/m2m", ("datastore/coreconf-m2m@2026-03-29.sid",)),
+        ("datastore/ietf-schc", ("datastore/ietf-schc@2026-02-24.sid",)),
+    ]:
+        model = _model(*sid_files)
+        config = WorkloadGenerator(model, seed=0).config(target_size=size)
+        cases += conversion_cases(f"generated/{name} {size // 1024}KiB", model, config)
+    return cases
+
+
+def all_cases(quick=False):
+    """Return the list of (name, setup) benchmark cases."""
+    return (sample_cases() + generated_cases()
+            + synthetic_cases(QUICK_SYNTHETIC_SCALES if quick else SYNTHETIC_SCALES))
@@ -0,0 +1,123 @@
+# Benchmark measurement and baseline comparison
+
+import fnmatch
+import gc
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+
+try:
+    import resource
+except ImportError: # not available on Windows
+    resource = None
+
+import pycoreconf
+
+# Allocation changes below this size are considered noise
+ALLOC_NOISE_KIB = 4.0
+
+
+def peak_rss_kib():
+    """Return the peak resident set size of the process so far (KiB), or None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == "darwin" else float(peak) # bytes on macOS
+
+
+def measure(op, repeat=5):
+    """
+    Measure one operation.
+
+    Returns:
+        Dict with ops_per_sec (best of *repeat* timing runs), alloc_kib (peak
+        memory traced by tracemalloc during one call) and peak_rss_kib (peak
+        RSS of the process after the runs; grows monotonically across cases).
+    """
+    op() # warm-up: caches, lazy compilation
+
+    timer = timeit.Timer(op)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    gc.collect()
+    tracemalloc.start()
+    op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": 1.0 / best,
+        "alloc_kib": peak / 1024,
+        "peak_rss_kib": peak_rss_kib(),
+    }
+
+
+def run(cases, pattern=None, repeat=5, report=print):
+    """Run the cases whose name matches the glob *pattern*; return {name: result}."""
+    results = {}
+    for name, setup in cases:
+        if pattern and not fnmatch.fnmatch(name, pattern):
+            continue
+        result = results[name] = measure(setup(), repeat)
+        report(format_result(name, result))
+    return results
+
+
+def format_result(name, result):
+    rss = result["peak_rss_kib"]
+    rss = f"{rss / 1024:>8.1f} MiB" if rss is not None else "       n/a"
+    return (f"{name:<60} {result['ops_per_sec']:>12.1f} ops/s  "
+            f"alloc={result['alloc_kib']:>10.1f} KiB  rss={rss}")
+
+
+def environment():
+    """Describe the environment the results were measured in."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pycoreconf": pycoreconf.__version__,
+    }
+
+
+def save(path, results):
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline.
+
+    A case regresses if its ops/s dropped by more than *threshold* (a fraction,
+    e.g. 0.2 for 20%), or if its traced allocations grew by more than
+    *threshold* (and by more than ALLOC_NOISE_KIB).
+
+    Returns:
+        List of (name, metric, baseline value, current value, relative change)
+        regressions; cases missing from either side are ignored.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        speed = result["ops_per_sec"] / base["ops_per_sec"] - 1
+        if speed < -threshold:
+            regressions.append((name, "ops_per_sec", base["ops_per_sec"], result["ops_per_sec"], speed))
+
+        alloc, base_alloc = result["alloc_kib"], base["alloc_kib"]
+        if alloc - base_alloc > ALLOC_NOISE_KIB and alloc > base_alloc * (1 + threshold):
+            regressions.append((name, "alloc_kib", base_alloc, alloc, alloc / base_alloc - 1 if base_alloc else float("inf")))
+
+    return regressions
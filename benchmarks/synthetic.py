@@ -0,0 +1,105 @@
+# Synthetic nested-list model and configs for scaling benchmarks
+#
+# The model has one top-level container holding a list nested *depth* levels
+# deep (level-1/level-2/...); every entry has a uint32 key and one leaf of each
+# common type. Configs fill every list with *breadth* entries, so a config has
+# breadth ** depth entries at the innermost level.
+
+import json
+import os
+import random
+
+MODULE = "bench-synthetic"
+ENTRY_POINT = 70000
+
+IDENTITIES = ["kind-a", "kind-b", "kind-c"]
+ENUM = {"0": "low", "1": "medium", "2": "high"}
+
+# Leaves of every list entry: (name, type)
+LEAVES = [
+    ("id", "uint32"),
+    ("name", "string"),
+    ("counter", "uint64"),
+    ("offset", "int32"),
+    ("ratio", "decimal64"),
+    ("enabled", "boolean"),
+    ("level", ENUM),
+    ("kind", "identityref"),
+]
+
+
+def sid_file(depth):
+    """Return the content of a SID file for a model with *depth* nested lists."""
+    items = [{"namespace": "module", "identifier": MODULE, "status": "unstable", "sid": str(ENTRY_POINT)}]
+    key_mapping = {}
+    sid = ENTRY_POINT
+
+    def add(namespace, identifier, dtype=None):
+        nonlocal sid
+        sid += 1
+        item = {"namespace": namespace, "identifier": identifier, "status": "unstable", "sid": str(sid)}
+        if dtype is not None:
+            item["type"] = dtype
+        items.append(item)
+        return sid
+
+    for identity in IDENTITIES:
+        add("identity", identity)
+
+    path = f"/{MODULE}:root"
+    add("data", path)
+    for level in range(1, depth + 1):
+        path += f"/level-{level}"
+        list_sid = add("data", path)
+        for name, dtype in LEAVES:
+            leaf_sid = add("data", f"{path}/{name}", dtype)
+            if name == "id":
+                key_mapping[str(list_sid)] = [leaf_sid]
+
+    return {
+        "ietf-sid-file:sid-file": {
+            "module-name": MODULE,
+            "sid-file-status": "unpublished",
+            "assignment-range": [{"entry-point": str(ENTRY_POINT), "size": str(sid - ENTRY_POINT + 1)}],
+            "item": items,
+            "key-mapping": key_mapping,
+        }
+    }
+
+
+def write_sid_file(directory, depth):
+    """Write the SID file of a *depth* levels model to *directory*; return its path."""
+    path = os.path.join(directory, f"{MODULE}-depth{depth}.sid")
+    with open(path, "w") as f:
+        json.dump(sid_file(depth), f)
+    return path
+
+
+def config(breadth, depth, seed=0):
+    """Return an identifier-keyed config with *breadth* entries in every list."""
+    rng = random.Random(seed)
+
+    def entries(level):
+        result = []
+        for i in range(breadth):
+            entry = {
+                "id": i,
+                "name": f"entry-{level}-{i}",
+                "counter": rng.randrange(2**40),
+                "offset": rng.randint(-2**20, 2**20),
+                "ratio": round(rng.uniform(-100, 100), 2),
+                "enabled": rng.random() < 0.5,
+                "level": rng.choice(list(ENUM.values())),
+                "kind": f"{MODULE}:{rng.choice(IDENTITIES)}",
+            }
+            if level < depth:
+                entry[f"level-{level + 1}"] = entries(level + 1)
+            result.append(entry)
+        return result
+
+    return {f"{MODULE}:root": {"level-1": entries(1)}}
+
+
+def innermost_xpath(depth, index=0, leaf="counter"):
+    """Return the XPath of a leaf of an innermost entry (every key = *index*)."""
+    return "/root" + "".join(f"/level-{level}[id='{index}']" for level in range(1, depth + 1)) + f"/{leaf}"
@@ -0,0 +1,127 @@
+# Batch conversion, in-process or over a pool of worker processes
+
+import concurrent.futures
+import logging
+import os
+import pickle
+
+_logger = logging.getLogger(__name__)
+
+# Model of the current worker process (set by _init_worker)
+_worker_model = None
+
+
+class BatchItemError(Exception):
+    """
+    Raised (or returned in place of a result) when an item of a batch fails.
+
+    Attributes:
+        index: Position of the failed item in the batch.
+        error: Original exception raised while converting the item.
+    """
+
+    def __init__(self, index, error):
+        super().__init__(f"Item {index}: {type(error).__name__}: {error}")
+        self.index = index
+        self.error = error
+
+    def __reduce__(self):
+        return type(self), (self.index, self.error)
+
+
+def _init_worker(model_class, sid_files, model_description_file, cache_dir):
+    """Process pool initializer: build the worker's model once."""
+    global _worker_model
+    _worker_model = model_class(sid_files, model_description_file, cache_dir=cache_dir)
+    _logger.debug("Worker %d loaded model for %d SID file(s)", os.getpid(), len(sid_files))
+
+
+def _convert_items(convert, items, kwargs):
+    """Convert items one by one; return a list of (ok, result or exception)."""
+    results = []
+    for item in items:
+        try:
+            results.append((True, convert(item, **kwargs)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+def _run_chunk(method, items, kwargs):
+    """Process pool task: convert a chunk of items with the worker's model."""
+    if _worker_model is None:
+        raise RuntimeError("Worker process has no model; create the pool with model.process_pool().")
+
+    results = _convert_items(getattr(_worker_model, method), items, kwargs)
+
+    # Errors must survive the trip back to the parent process
+    for i, (ok, value) in enumerate(results):
+        if not ok:
+            try:
+                pickle.dumps(value)
+            except Exception:
+                results[i] = (False, RuntimeError(f"{type(value).__name__}: {value}"))
+
+    return results
+
+
+def make_pool(model, workers=None):
+    """Create a process pool whose workers each rebuild *model* once at startup."""
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(type(model), list(model.sid_files), model.model_description_file, model.cache_dir),
+    )
+
+
+def run_batch(model, method, items, kwargs, workers=None, chunksize=None, errors="raise", pool=None):
+    """
+    Convert a batch of items with one of the model's methods.
+
+    Small batches (below model.batch_parallel_threshold) are converted in-process
+    unless a pool is given; larger ones are split into chunks and spread over a
+    process pool. Results are returned in input order.
+
+    Raises:
+        ValueError: If errors is not "raise" or "capture".
+        BatchItemError: On the first failed item, if errors="raise".
+    """
+
+    if errors not in ("raise", "capture"):
+        raise ValueError(f"errors must be 'raise' or 'capture', not {errors!r}")
+
+    items = list(items)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if pool is None and (workers <= 1 or len(items) < model.batch_parallel_threshold):
+        _logger.debug("Converting %d item(s) in-process (%s)", len(items), method)
+        results = _convert_items(getattr(model, method), items, kwargs)
+    else:
+        if chunksize is None:
+            # About four chunks per worker to balance uneven item sizes
+            chunksize = max(1, -(-len(items) // (workers * 4)))
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+
+        _logger.debug("Converting %d item(s) in %d chunk(s) of %d (%s)",
+                      len(items), len(chunks), chunksize, method)
+
+        executor = pool if pool is not None else make_pool(model, workers)
+        try:
+            results = []
+            for chunk_results in executor.map(_run_chunk, [method] * len(chunks), chunks,
+                                              [kwargs] * len(chunks)):
+                results.extend(chunk_results)
+        finally:
+            if pool is None:
+                executor.shutdown()
+
+    output = []
+    for index, (ok, value) in enumerate(results):
+        if not ok:
+            if errors == "raise":
+                raise BatchItemError(index, value) from value
+            value = BatchItemError(index, value)
+        output.append(value)
+
+    return output
@@ -0,0 +1,129 @@
+# Incremental CBOR encoding of SID trees, reusing the bytes of unchanged subtrees
+
+import io
+import cbor2 as cbor
+import logging
+
+from .mapped import encode_mapped
+
+_logger = logging.getLogger(__name__)
+
+# CBOR major types
+_MAJOR_ARRAY = 4
+_MAJOR_MAP = 5
+
+
+class SubtreeCache:
+    """
+    Encoded bytes of the top-level subtrees of a SID tree and of their list entries.
+
+    Each top-level subtree is cached with the encoded bytes of the entries of
+    the first list level below it. Subtrees and entries are marked dirty when
+    mutated (see mark_dirty()); encode() re-encodes only the dirty ones and
+    splices the cached bytes of the others. The output is identical to
+    cbor.dumps() of the whole tree.
+
+    Cached values are matched by identity, so replacing a subtree or an entry
+    object is detected; in-place changes must be reported with mark_dirty().
+    """
+
+    __slots__ = ("_top",)
+
+    def __init__(self):
+        # {top-level delta: [subtree, bytes or None (dirty), {id(entry): (entry, bytes)}]}
+        self._top = {}
+
+    def __bool__(self):
+        return bool(self._top)
+
+    def mark_dirty(self, top_delta, entry=None, entries=False):
+        """
+        Mark a top-level subtree as changed.
+
+        Args:
+            top_delta: Top-level key of the changed subtree.
+            entry: Changed first-level list entry of the subtree, if any.
+            entries: If True, every list entry of the subtree may have changed.
+        """
+        cached = self._top.get(top_delta)
+        if cached is None:
+            return
+        cached[1] = None
+        if entries:
+            cached[2] = {}
+        elif entry is not None:
+            cached[2].pop(id(entry), None)
+
+    def clear(self):
+        self._top.clear()
+
+    def encode(self, data):
+        """Return the CBOR encoding of a SID tree, updating the cache."""
+        previous = self._top
+        top = {}
+        fp = io.BytesIO()
+        encoder = cbor.CBOREncoder(fp, default=encode_mapped)
+        encoded = [] # [(delta, subtree, start, end, entries, new entries)]
+
+        encoder.encode_length(_MAJOR_MAP, len(data))
+        for delta, value in data.items():
+            encoder.encode(delta)
+
+            cached = previous.get(delta)
+            if cached is not None and cached[0] is value and cached[1] is not None:
+                top[delta] = cached
+                encoder.write(cached[1])
+                continue
+
+            entries = {}
+            fresh = []
+            start = fp.tell()
+            _encode_subtree(encoder, fp, value, cached[2] if cached is not None else {}, entries, fresh)
+            encoded.append((delta, value, start, fp.tell(), entries, fresh))
+
+        # Cache the bytes of the re-encoded subtrees and entries
+        output = fp.getvalue()
+        for delta, value, start, end, entries, fresh in encoded:
+            for entry, entry_start, entry_end in fresh:
+                entries[id(entry)] = (entry, output[entry_start:entry_end])
+            top[delta] = [value, output[start:end], entries]
+
+        self._top = top
+
+        _logger.debug("Encoded SID tree (subtrees=%d, re-encoded=%d)", len(data), len(encoded))
+
+        return output
+
+
+def _encode_subtree(encoder, fp, value, cached, entries, fresh):
+    """
+    Encode a subtree, walking it down to its first list level.
+
+    List entries found in *cached* are written from their cached bytes (and
+    recorded in *entries*); the others are encoded and their (entry, start, end)
+    positions appended to *fresh*. Other values are encoded as a whole.
+    """
+    if type(value) is dict:
+        encoder.encode_length(_MAJOR_MAP, len(value))
+        for delta, child in value.items():
+            encoder.encode(delta)
+            _encode_subtree(encoder, fp, child, cached, entries, fresh)
+
+    elif type(value) is list:
+        encoder.encode_length(_MAJOR_ARRAY, len(value))
+        for item in value:
+            if type(item) is not dict:
+                encoder.encode(item) # leaf-list item
+                continue
+
+            entry = cached.get(id(item))
+            if entry is not None and entry[0] is item:
+                entries[id(item)] = entry
+                encoder.write(entry[1])
+            else:
+                start = fp.tell()
+                encoder.encode(item)
+                fresh.append((item, start, fp.tell()))
+
+    else:
+        encoder.encode(value) # leaf, or mapped subtree (copied by encode_mapped)
@@ -0,0 +1,348 @@
+# Compiled YANG leaf value converters
+
+import base64
+import cbor2 as cbor
+import logging
+import threading
+from collections import namedtuple
+from decimal import Decimal
+
+_logger = logging.getLogger(__name__)
+
+# Per-leaf, per-node and per-query debug messages (matched union member,
+# datastore get/set, SID queries, ...) are only logged when TRACE is set, so
+# that hot paths skip even the logger level check. The logger must also be at
+# DEBUG level.
+TRACE = False
+
+# RFC 9254 CBOR tags
+BITS_CBOR_TAG_VALUE = 43
+ENUMERATION_CBOR_TAG_VALUE = 44
+IDENTITYREF_CBOR_TAG_VALUE = 45
+INSTANCE_IDENTIFIER_CBOR_TAG_VALUE = 46
+SID_CBOR_TAG_VALUE = 47
+
+INTEGER_TYPES = frozenset(["int8", "int16", "int32", "int64",
+                           "uint8", "uint16", "uint32", "uint64"])
+WIDE_INTEGER_TYPES = frozenset(["int64", "uint64"])
+UNHANDLED_TYPES = frozenset(["empty", "leafref", "instance-identifier"])
+
+# Union subtypes encoded with an explicit CBOR tag (RFC 9254 Section 6.12)
+_UNION_TAGS = {
+    "identityref": IDENTITYREF_CBOR_TAG_VALUE,
+    "bits": BITS_CBOR_TAG_VALUE,
+    "instance-identifier": INSTANCE_IDENTIFIER_CBOR_TAG_VALUE,
+}
+
+
+# Both directions of an enumeration: names {int: str} and values {str: int}
+EnumTable = namedtuple("EnumTable", ["names", "values"])
+
+
+def enum_table(dtype):
+    """Return the EnumTable of an enumeration type ({"value": "name"})."""
+    names = {int(value): name for value, name in dtype.items()}
+    return EnumTable(names, {name: value for value, name in names.items()})
+
+
+class TypeWarnings:
+    """
+    Rate-limited warnings about leaf values kept as-is, for one model.
+
+    Warnings about unhandled or unrecognized types, unmatched union values and
+    unexpected CBOR tags are logged once per SID (and kind); later occurrences
+    are only counted. Each CORECONFModel has its own (ccm.type_warnings);
+    converters compiled without one share a module-wide instance.
+    """
+
+    def __init__(self):
+        self._counts = {} # {(sid, kind): occurrences}
+        self._lock = threading.Lock()
+
+    def warn(self, key, message, *args):
+        """Log a warning the first time *key* = (sid, kind) occurs, count it afterwards."""
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        if count == 1:
+            _logger.warning(message + " (logged once per SID; see type_warnings.counts())", *args)
+
+    def counts(self):
+        """
+        Return the occurrences of each warning.
+
+        Returns:
+            {(sid, kind): count}, kind being "unhandled", "unrecognized", "union"
+            or "tag" (sid is None for one-off conversions).
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        """Clear the counters, so that each warning is logged again once."""
+        with self._lock:
+            self._counts.clear()
+
+
+# Warnings of converters compiled without a TypeWarnings
+_default_warnings = TypeWarnings()
+
+
+def _passthrough(leaf):
+    return leaf
+
+
+def _unhandled(dtype, sid, type_warnings):
+    """Return a converter for a known but unhandled type (value kept as-is)."""
+    key = (sid, "unhandled")
+    warn = type_warnings.warn
+    def convert(leaf):
+        warn(key, "Data type %s not yet handled (sid=%s); returning value as-is.", dtype, sid)
+        return leaf
+    return convert
+
+
+def _unrecognized(dtype, sid, type_warnings, decimal_as_str=False):
+    """Return a converter for an unrecognized type (value kept as-is)."""
+    key = (sid, "unrecognized")
+    warn = type_warnings.warn
+    def convert(leaf):
+        # RFC 7951: Decimal values must be strings in JSON to maintain precision
+        if decimal_as_str and isinstance(leaf, Decimal):
+            if TRACE:
+                _logger.debug("Converting Decimal to string for JSON compatibility (value=%r)", leaf)
+            return str(leaf)
+        warn(key, "Unrecognized type: %s (sid=%s); returning value as-is.", dtype, sid)
+        return leaf
+    return convert
+
+
+def _boolean(leaf):
+    return bool(leaf)
+
+
+def _binary_to_cbor(leaf):
+    return base64.b64decode(leaf)
+
+
+def _binary_from_cbor(leaf):
+    return base64.b64encode(leaf).decode()
+
+
+def _bits_from_cbor(leaf):
+    # For bits type, convert bytes to hex string when decoding
+    return leaf.hex() if isinstance(leaf, bytes) else leaf
+
+
+# Encoding
+# ------------------------------------------------------------------------------
+
+def compile_encoder(dtype, sids, sid=None, type_warnings=None):
+    """
+    Compile the converter from model (Python/JSON) representation to CBOR for a YANG type.
+
+    Args:
+        dtype: YANG data type definition (name, enumeration dict or union list).
+        sids: Mapping of identifier to SID, used for identityref values.
+        sid: SID of the leaf the converter is compiled for (rate-limits its warnings).
+        type_warnings: TypeWarnings of the model (default: a module-wide one).
+
+    Returns:
+        Callable taking a leaf value and returning its CBOR-compatible form.
+    """
+
+    if type_warnings is None:
+        type_warnings = _default_warnings
+
+    if type(dtype) is str:
+        if dtype in ("string", "inet:uri"):
+            return str
+        if dtype in INTEGER_TYPES:
+            return int
+        if dtype == "decimal64":
+            return float
+        if dtype == "binary":
+            return _binary_to_cbor
+        if dtype == "boolean":
+            return _boolean
+        if dtype == "identityref": # 'module:identity' -> sid
+            return sids.__getitem__
+        if dtype == "bits":
+            return _passthrough
+        if dtype in UNHANDLED_TYPES:
+            return _unhandled(dtype, sid, type_warnings)
+        return _unrecognized(dtype, sid, type_warnings)
+
+    if type(dtype) is dict: # enumeration ({"value":"name"})
+        values = enum_table(dtype).values
+        return lambda leaf: values[leaf if type(leaf) is str else str(leaf)]
+
+    if type(dtype) is list: # union
+        return _compile_union_encoder(dtype, sids, sid, type_warnings)
+
+    return _unrecognized(dtype, sid, type_warnings)
+
+
+def _compile_union_encoder(dtype, sids, sid, type_warnings):
+    """
+    Compile a union encoder trying each member type in order.
+
+    Member types with a cheap membership test (identityref, enumeration) are
+    skipped without raising; the others are tried and skipped on error.
+    """
+
+    matchers = []
+    for sub_dtype in dtype:
+        convert = compile_encoder(sub_dtype, sids, sid, type_warnings)
+        accepts = None
+        tag = None
+        if type(sub_dtype) is dict:
+            names = frozenset(sub_dtype.values())
+            accepts = lambda leaf, names=names: str(leaf) in names
+            tag = ENUMERATION_CBOR_TAG_VALUE
+        elif type(sub_dtype) is str:
+            tag = _UNION_TAGS.get(sub_dtype)
+            if sub_dtype == "identityref":
+                accepts = sids.__contains__
+        matchers.append((sub_dtype, accepts, convert, tag))
+
+    key = (sid, "union")
+    warn = type_warnings.warn
+
+    def encode_union(leaf):
+        for sub_dtype, accepts, convert, tag in matchers:
+            try:
+                if accepts is not None and not accepts(leaf):
+                    continue
+                val = convert(leaf)
+            except Exception:
+                continue
+            if TRACE:
+                _logger.debug("Matched union subtype %s", sub_dtype)
+            return cbor.CBORTag(tag, val) if tag is not None else val
+
+        warn(key, "No matching subtype found for union %s (sid=%s, value=%r); returning value as-is.",
+             dtype, sid, leaf)
+        return leaf # fallback
+
+    return encode_union
+
+
+# Decoding
+# ------------------------------------------------------------------------------
+
+def compile_decoder(dtype, ids, use_native_types=True, sid=None, type_warnings=None):
+    """
+    Compile the converter from CBOR to model (Python/JSON) representation for a YANG type.
+
+    Args:
+        dtype: YANG data type definition (name, enumeration dict or union list).
+        ids: Mapping of SID to identifier, used for identityref values.
+        use_native_types: If False, preserve JSON-compatible representations
+            (e.g. int64/decimal64 as strings, RFC 7951).
+        sid: SID of the leaf the converter is compiled for (rate-limits its warnings).
+        type_warnings: TypeWarnings of the model (default: a module-wide one).
+
+    Returns:
+        Callable taking a CBOR leaf value and returning its model form.
+    """
+
+    if type_warnings is None:
+        type_warnings = _default_warnings
+    convert = _compile_untagged_decoder(dtype, ids, use_native_types, sid, type_warnings)
+    decode_tag = _compile_tag_decoder(dtype, ids, sid, type_warnings)
+    CBORTag = cbor.CBORTag
+
+    def decode(leaf):
+        if type(leaf) is CBORTag:
+            return decode_tag(leaf)
+        return convert(leaf)
+
+    return decode
+
+
+def _compile_untagged_decoder(dtype, ids, use_native_types, sid, type_warnings):
+    """Compile the decoder for untagged CBOR values of a YANG type."""
+
+    if type(dtype) is str:
+        if dtype in ("string", "inet:uri"):
+            return str
+        if dtype in INTEGER_TYPES:
+            # RFC 7951: int64/uint64 must be strings in JSON to avoid precision loss,
+            # but CBOR uses native integers. Smaller types are safe as JSON numbers.
+            if dtype in WIDE_INTEGER_TYPES and not use_native_types:
+                return str
+            return int
+        if dtype == "decimal64":
+            # RFC 7951: decimal64 must be a string in JSON to avoid precision loss
+            return float if use_native_types else str
+        if dtype == "binary":
+            return _binary_from_cbor
+        if dtype == "boolean":
+            return _boolean
+        if dtype == "identityref": # sid -> 'module:identity'
+            return ids.__getitem__
+        if dtype == "bits":
+            return _bits_from_cbor
+        if dtype in UNHANDLED_TYPES:
+            return _unhandled(dtype, sid, type_warnings)
+        return _unrecognized(dtype, sid, type_warnings, decimal_as_str=not use_native_types)
+
+    if type(dtype) is dict: # enumeration ({"value":"name"})
+        # Accept both integer and textual enum values
+        table = dict(dtype)
+        table.update(enum_table(dtype).names)
+        return table.__getitem__
+
+    if type(dtype) is list: # union
+        members = [_compile_untagged_decoder(sub_dtype, ids, use_native_types, sid, type_warnings)
+                   for sub_dtype in dtype]
+        key = (sid, "union")
+        warn = type_warnings.warn
+
+        def decode_union(leaf):
+            for convert in members:
+                try:
+                    return convert(leaf)
+                except Exception:
+                    continue
+            warn(key, "No matching subtype found for union %s (sid=%s, value=%r); returning value as-is.",
+                 dtype, sid, leaf)
+            return leaf # fallback
+
+        return decode_union
+
+    return _unrecognized(dtype, sid, type_warnings, decimal_as_str=not use_native_types)
+
+
+def _compile_tag_decoder(dtype, ids, sid, type_warnings):
+    """Compile the decoder for RFC 9254 tagged CBOR values of a YANG type."""
+
+    # Enumeration: the type itself, or the first enumeration member of a union
+    enum_dtype = None
+    if type(dtype) is dict:
+        enum_dtype = dtype
+    elif type(dtype) is list:
+        enum_dtype = next((sub for sub in dtype if type(sub) is dict), None)
+    enum_names = None
+    if enum_dtype is not None:
+        enum_names = dict(enum_dtype)
+        enum_names.update(enum_table(enum_dtype).names)
+    key = (sid, "tag")
+    warn = type_warnings.warn
+
+    def decode_tag(leaf):
+        if leaf.tag == BITS_CBOR_TAG_VALUE:
+            return str(leaf.value)
+        if leaf.tag == ENUMERATION_CBOR_TAG_VALUE and enum_names is not None:
+            return enum_names[leaf.value]
+        if leaf.tag == IDENTITYREF_CBOR_TAG_VALUE:
+            return ids[leaf.value]
+        if leaf.tag in (INSTANCE_IDENTIFIER_CBOR_TAG_VALUE, SID_CBOR_TAG_VALUE):
+            if TRACE:
+                _logger.debug("Decoding CBOR tag %d value (%s) without handling", leaf.tag, leaf.value)
+            return leaf.value # ?
+        warn(key, "Unexpected CBOR tag %d during decoding (sid=%s); returning value as-is.", leaf.tag, sid)
+        return leaf.value
+
+    return decode_tag
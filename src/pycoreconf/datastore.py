@@ -1,8 +1,9 @@
+import copy
 import json
-import cbor2 as cbor
 import re
-import copy
+import functools
 import logging
+from collections import OrderedDict
 
 try:
     from typing import TYPE_CHECKING
@@ -12,13 +13,62 @@ except Exception:
 if TYPE_CHECKING:
     from .model import CORECONFModel
 
+from .sid import SchemaTree
+from .converters import enum_table
+from . import converters
+from .mapped import MappedNode, plain
+from .transaction import Transaction
+from .diff import JournalEntry, instance_id, diff_trees, encode_ipatch
+from .cbor_cache import SubtreeCache
+from .validation import ConfigValidationError, Validator, format_issues
+from .instrumentation import (instrumented, measure_get, measure_set,
+                              measure_predicates, measure_to_cbor)
+
 _logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+
+class _CompiledXPath:
+    """
+    XPath resolved against the model, with list key values left unbound.
+
+    Attributes:
+        target_sid: SID of the addressed node.
+        chain: Schema ancestry of the target, as (sid, key_sids) tuples from the root.
+        key_slots: (segment_position, key_name, converter) for each list key, in order.
+        parent_key_count: Number of key values of the lists enclosing the target.
+    """
+
+    __slots__ = ("target_sid", "chain", "key_slots", "parent_key_count")
+
+    def __init__(self, target_sid, chain, key_slots):
+        self.target_sid = target_sid
+        self.chain = chain
+        self.key_slots = key_slots
+        self.parent_key_count = sum(len(k_sids) for _, k_sids in chain[:-1] if k_sids)
+
+    def bind(self, segments):
+        """Return the SID-typed key values taken from parsed XPath segments."""
+        keys = []
+        for position, key_name, convert in self.key_slots:
+            key_value = segments[position][1][key_name]
+            keys.append(convert(key_value) if convert is not None else key_value)
+        return tuple(keys)
+
+
 class CORECONFDatastore:
     """
     High-level interface to navigate and modify CORECONF data using XPath-like paths.
     Usage: ds["/measurements/measurement[type='solar-radiation'][id='0']/value"]
     """
+
+    # Max. number of compiled XPaths (and XPath templates) kept in the LRU caches
+    xpath_cache_size = 1024
+
+    # Max. number of changed nodes tracked for validate(touched_only=True);
+    # beyond it, tracking stops and the next validation checks everything
+    touched_limit = 4096
     
     def __init__(self, model: "CORECONFModel", data: dict):
         """
@@ -31,16 +81,52 @@ class CORECONFDatastore:
 
         self.model = model
 
+        # Schema tree for path resolution (built from the SID tables for bare models)
+        self.schema = getattr(model, "schema", None)
+        if self.schema is None:
+            self.schema = SchemaTree(model.sids, model.types, model.key_mapping)
+
+        # Enumeration tables by leaf SID (built on demand for bare models)
+        self._enums = getattr(model, "enums", None)
+        if self._enums is None:
+            self._enums = {}
+
         # Normalize: wrap absolute SID keys into their ancestor chain using delta encoding.
         # A device may respond with {100063: [...]} (absolute SID of a nested node),
         # but the datastore expects a rooted delta tree, e.g. {100062: {1: [...]}}.
         self.data = self._normalize_absolute_sids(data)
 
+        # True if subtrees are left unresolved in a CBOR buffer (see create_datastore_from_file())
+        self._mapped = any(type(value) is MappedNode for value in self.data.values())
+
+        # Per list-instance key indexes: {(list_sid, parent_keys): (entries, {keys: entry})}
+        self._list_indexes = {}
+
+        # Encoded bytes of unchanged subtrees, reused by to_cbor()
+        self._cbor_cache = SubtreeCache()
+
+        # Mutations recorded since start_journal() (or the last journal.clear()); None: not recording
+        self.journal = None
+
+        # Nodes changed since the last validate(): {(target_sid, keys): compiled xpath},
+        # None if more than touched_limit nodes changed
+        self._touched = {}
+
+        # LRU caches: {xpath: (compiled, keys)} and {xpath shape: compiled}
+        self._xpath_cache = OrderedDict()
+        self._xpath_templates = OrderedDict()
+
         _logger.debug("Datastore initialized (keys=%d)", len(self.data))
     
     # Core API - Access & Mutation
     # --------------------------------------------------------------------------
 
+    @property
+    def instrumentation(self):
+        """Instrumentation of the model (see CORECONFModel.enable_instrumentation()), or None."""
+        return getattr(self.model, "instrumentation", None)
+
+    @instrumented("get", measure_get)
     def __getitem__(self, xpath):
         """
         Get value at XPath.
@@ -48,78 +134,39 @@ class CORECONFDatastore:
         Returns values with YANG identifiers instead of SIDs, or None if not found.
         """
 
-        _logger.debug("Datastore get: %s", xpath)
+        trace = converters.TRACE
+        if trace:
+            _logger.debug("Datastore get: %s", xpath)
 
         # Resolve the path — return None if the path does not exist in the model
         try:
-            target_sid, keys = self._resolve_xpath(xpath)
+            compiled, keys = self._compile_xpath(xpath)
         except (KeyError, ValueError):
-            _logger.debug("Datastore get: path resolution failed (%s)", xpath)
+            if trace:
+                _logger.debug("Datastore get: path resolution failed (%s)", xpath)
             return None
-        target_path = self.model.ids.get(target_sid, '')
-        
-        # Check if this is a leaf (has type info in model)
-        is_leaf = target_path in self.model.types
-        
-        # If it's a leaf and we're accessing it directly, get parent value and extract leaf
-        if is_leaf and keys:
-            # This is a leaf within a list entry
-            # Get the parent container instead
-            parent_path = '/'.join(target_path.split('/')[:-1])
-            parent_sid = self.model.sids.get(parent_path)
-            
-            if parent_sid:
-                result = self.model._execute_sid_query(self.data, sid=parent_sid, keys=keys)
-                if result is None:
-                    _logger.debug("Datastore get: no data found for SID (xpath=%s, sid=%s)", xpath, target_sid)
-                    return None
+        target_sid = compiled.target_sid
 
-                value = result[parent_sid]
-                
-                if '/' in parent_path:
-                    parent_parent_path = '/'.join(parent_path.split('/')[:-1]) + '/'
-                else:
-                    parent_parent_path = '/'
-                
-                value_copy = copy.deepcopy(value)
-                wrapped = {parent_sid: value_copy}
-                self.model._sid_to_identifier_tree(wrapped, sid_delta=0, path=parent_parent_path)
-                
-                node_identifier = parent_path.split('/')[-1]
-                entry = wrapped.get(node_identifier, value_copy)
-                
-                # Extract the leaf from the entry
-                leaf_key = target_path.split('/')[-1]
-                if isinstance(entry, dict) and leaf_key in entry:
-                    return entry[leaf_key]
-                else:
-                    return None
-        
-        # Default path resolution for container queries
-        result = self.model._execute_sid_query(self.data, sid=target_sid, keys=keys)
-        
-        if result is None:
+        located = self._locate(compiled.chain, keys)
+        if located is None:
+            if trace:
+                _logger.debug("Datastore get: no data found for SID (xpath=%s, sid=%s)", xpath, target_sid)
             return None  # when used in test, this allows checking for non-existence without raising an exception
 
-        # Unwrap the {sid: value} dict
-        value = result[target_sid]
-        
-        if '/' in target_path:
-            parent_path = '/'.join(target_path.split('/')[:-1]) + '/'
+        holder, slot = located
+        if isinstance(holder, list):
+            value = slot
+        elif slot in holder:
+            value = holder[slot]
         else:
-            parent_path = '/'
-        
-        # Make a deep copy before conversion to avoid modifying self.data
-        value_copy = copy.deepcopy(value)
-        
-        # Create wrapped structure and convert
-        wrapped = {target_sid: value_copy}
-        self.model._sid_to_identifier_tree(wrapped, sid_delta=0, path=parent_path)
-        
-        # Extract converted value
-        node_identifier = target_path.split('/')[-1]
-        return wrapped.get(node_identifier, wrapped.get(target_sid, value_copy))
+            return None
+
+        if self._mapped:
+            value = plain(value)
+
+        return self._from_sid_value(target_sid, value)
     
+    @instrumented("set", measure_set)
     def __setitem__(self, xpath, value):
         """
         Set value at XPath.
@@ -131,230 +178,155 @@ class CORECONFDatastore:
             - Creates the list entry if needed
         """
 
-        _logger.debug("Datastore set: %s = %r", xpath, value)
-        
-        segments = self._parse_xpath(xpath)
-        
-        try:
-            target_sid, keys = self._resolve_xpath(xpath)
-        except KeyError:
-            # Path resolution failed - will be handled below if creation is needed
-            target_sid = None
-            keys = None
-        
-        target_path = self.model.ids.get(target_sid, '')
-        
-        # If value is a dict/list, convert from YANG to CBOR format first
-        if isinstance(value, (dict, list)):
-            value_copy = copy.deepcopy(value)
-            
-            wrapper = {}
-            current = wrapper
-            path_parts = [p for p in target_path.strip('/').split('/') if p]
-            
-            for part in path_parts[:-1]:
-                current[part] = {}
-                current = current[part]
-            current[path_parts[-1]] = value_copy
-            
-            cbor_data = self.model.encode_json(json.dumps(wrapper))
-            cbor_dict = cbor.loads(cbor_data)
-            
-            current = cbor_dict
-            for part in path_parts[:-1]:
-                part_path = '/' + '/'.join(path_parts[:path_parts.index(part)+1])
-                if part_path in self.model.sids:
-                    part_sid = self.model.sids[part_path]
-                    parent_sid = self.model.sids.get('/' + '/'.join(path_parts[:path_parts.index(part)]))
-                    if parent_sid:
-                        delta_key = part_sid - parent_sid
-                        current = current[delta_key]
-                    else:
-                        current = current[part_sid]
-            
-            final_path = '/' + '/'.join(path_parts)
-            final_sid = self.model.sids[final_path]
-            parent_sid = self.model.sids.get('/' + '/'.join(path_parts[:-1]))
-            if parent_sid:
-                delta_key = final_sid - parent_sid
-                cbor_value = current[delta_key]
-            else:
-                cbor_value = current[final_sid]
-        else:
-            cbor_value = value
-        
-        result = self.model._execute_sid_query(self.data, sid=target_sid, keys=keys, value=cbor_value)
-        
-        if result is None:
-            _logger.debug("Datastore set: path not found, materializing structure (%s)", xpath)
-            # Materialize missing path parts in JSON (containers + list entries).
-            # This allows creation from an empty datastore and nested list predicates.
-            current_json = json.loads(self.to_json())
-            qualified_parts = [p for p in target_path.strip('/').split('/') if p] if target_path else []
-
-            def _to_typed_predicates(predicates):
-                typed = {}
-                for key_name, key_value in predicates.items():
-                    try:
-                        typed[key_name] = int(key_value)
-                    except ValueError:
-                        typed[key_name] = key_value
-                return typed
-
-            def _match_dict_key(node, short_name, preferred_name):
-                if short_name in node:
-                    return short_name
-                if preferred_name in node:
-                    return preferred_name
-                for existing_key in node.keys():
-                    if isinstance(existing_key, str) and existing_key.endswith(":" + short_name):
-                        return existing_key
-                return None
-
-            nav = current_json
-            for idx, (seg_name, seg_preds) in enumerate(segments):
-                is_last = idx == len(segments) - 1
-                preferred_name = qualified_parts[idx] if idx < len(qualified_parts) else seg_name
-
-                if seg_preds:
-                    if not isinstance(nav, dict):
-                        raise KeyError(f"Path not found or keys don't match: {xpath}")
-
-                    list_key = _match_dict_key(nav, seg_name, preferred_name)
-                    if list_key is None:
-                        nav[preferred_name] = []
-                        list_key = preferred_name
-
-                    if not isinstance(nav[list_key], list):
-                        raise KeyError(f"Path not found or keys don't match: {xpath}")
-
-                    typed_preds = _to_typed_predicates(seg_preds)
-                    target_entry = None
-                    for entry in nav[list_key]:
-                        if isinstance(entry, dict) and all(entry.get(k) == v for k, v in typed_preds.items()):
-                            target_entry = entry
-                            break
-
-                    if target_entry is None:
-                        target_entry = dict(typed_preds)
-                        nav[list_key].append(target_entry)
-
-                    if is_last:
-                        if isinstance(value, dict):
-                            target_entry.update(value)
-                    nav = target_entry
-                    continue
-
-                if not isinstance(nav, dict):
-                    raise KeyError(f"Path not found or keys don't match: {xpath}")
-
-                child_key = _match_dict_key(nav, seg_name, preferred_name)
-                if is_last:
-                    final_key = child_key if child_key is not None else preferred_name
-                    nav[final_key] = value if not isinstance(value, (dict, list)) else copy.deepcopy(value)
-                else:
-                    if child_key is None:
-                        nav[preferred_name] = {}
-                        child_key = preferred_name
-                    elif not isinstance(nav[child_key], dict):
-                        raise KeyError(f"Path not found or keys don't match: {xpath}")
-                    nav = nav[child_key]
-
-            json_str = json.dumps(current_json)
-            cbor_data = self.model.encode_json(json_str)
-            self.data = cbor.loads(cbor_data)
-            return
+        if converters.TRACE:
+            _logger.debug("Datastore set: %s = %r", xpath, value)
+
+        compiled, keys = self._compile_xpath(xpath)
+
+        # Convert the YANG value to its CBOR form relative to the target node
+        cbor_value = self._to_sid_value(compiled.target_sid, value)
+
+        changes = self._write(compiled, keys, cbor_value, xpath)
+        self._record(compiled, keys, "set", cbor_value, changes)
 
+    @instrumented("delete")
     def __delitem__(self, xpath):
         """
         Delete value at XPath.
         Example: del ds["/measurements/measurement[type='solar-radiation'][id='1']"]
                  del ds["/measurements/measurement[type='solar-radiation'][id='1']/precision"]
+                 del ds["/measurements"]
+
+        Raises KeyError if the path does not exist in the datastore.
         """
 
-        _logger.debug("Datastore delete: %s", xpath)
+        trace = converters.TRACE
+        if trace:
+            _logger.debug("Datastore delete: %s", xpath)
 
-        segments = self._parse_xpath(xpath)
-        
-        # Check if this is a list item deletion (has predicates)
-        list_seg_idx = None
-        for i in range(len(segments) - 1, -1, -1):
-            if segments[i][1]:  # Has predicates - is a list item
-                list_seg_idx = i
-                break
-        
-        if list_seg_idx is None:
-            raise KeyError(f"Can only delete list items or their leaves: {xpath}")
-        
-        # Get the list item segment
-        list_item_name, list_item_preds = segments[list_seg_idx]
-        list_container_parts = [s[0] for s in segments[:list_seg_idx]]
-        
-        # Export current JSON
-        current_json = json.loads(self.to_json())
-        
-        # Navigate to the list container
-        nav = current_json
-        for part in list_container_parts:
-            if part in nav:
-                nav = nav[part]
-            else:
-                found = False
-                for key in nav.keys():
-                    if key.endswith(":" + part):
-                        nav = nav[key]
-                        found = True
-                        break
-                if not found:
-                    raise KeyError(f"Container {part} not found: {xpath}")
-        
-        # Get the list itself
-        if list_item_name in nav:
-            measurement_list = nav[list_item_name]
-        else:
-            found = False
-            for key in nav.keys():
-                if key.endswith(":" + list_item_name):
-                    measurement_list = nav[key]
-                    found = True
-                    break
-            if not found:
-                raise KeyError(f"List {list_item_name} not found: {xpath}")
-        
-        if not isinstance(measurement_list, list):
-            raise ValueError(f"Expected list at {list_item_name}")
-        
-        # If deleting a leaf within an entry, just remove that field
-        if list_seg_idx < len(segments) - 1:
-            # Find the entry matching the predicates and remove the leaf
-            leaf_parts = [s[0] for s in segments[list_seg_idx+1:]]
-            leaf_name = leaf_parts[-1]
-            
-            for entry in measurement_list:
-                if isinstance(entry, dict) and all(
-                    entry.get(k) == (int(v) if v.isdigit() else v)
-                    for k, v in list_item_preds.items()
-                ):
-                    if leaf_name in entry:
-                        del entry[leaf_name]
-                    break
+        compiled, keys = self._compile_xpath(xpath)
+        self._remove(compiled, keys, xpath)
+        self._record(compiled, keys, "delete", None)
+
+        if trace:
+            _logger.debug("Datastore delete completed: %s", xpath)
+
+    def transaction(self):
+        """
+        Return a transaction batching edits to the datastore.
+
+        Sets, deletes and merges are queued (paths are resolved and values
+        converted when queued) and applied together on commit, either all or
+        none: on error, every change already applied is reverted. Used as a
+        context manager, the transaction commits when the block exits normally
+        and is discarded if the block raises.
+
+        Example:
+            with ds.transaction() as tx:
+                tx["/measurements/measurement[type='solar-radiation'][id='0']/value"] = 42
+                del tx["/measurements/measurement[type='solar-radiation'][id='1']"]
+                tx.merge("/measurements", {"measurement": [{"type": "solar-radiation", "id": 2}]})
+        """
+        return Transaction(self)
+
+    def diff(self, other):
+        """
+        Return the changes turning this datastore's content into another's.
+
+        The SID trees are compared structurally: list entries are matched by
+        their key values, and identical subtrees are skipped without being walked.
+
+        Args:
+            other: CORECONFDatastore of the same model.
+
+        Returns:
+            List of (instance-identifier, value) pairs; the instance-identifier is
+            the node's SID, or [sid, key, ...] under list entries, and the value is
+            the SID-keyed CBOR value of the node, or None for a removed node.
+            Pass it to to_ipatch() for the CORECONF payload.
+
+        Example:
+            changes = ds.diff(updated)
+            payload = ds.to_ipatch(changes)
+        """
+        changes = diff_trees(self.schema, self.data, other.data)
+        _logger.debug("Datastore diff: %d change(s)", len(changes))
+        return changes
+
+    def start_journal(self):
+        """
+        Start recording mutations in ds.journal (see to_ipatch()).
+
+        Sets, deletes and merges (including those of transactions) are appended
+        as JournalEntry(iid, op, value). Recording is off by default: the journal
+        grows with every write until it is cleared (ds.journal.clear()) or
+        recording is stopped (ds.journal = None).
+
+        Returns:
+            The journal (a list), empty if recording was not already on.
+        """
+        if self.journal is None:
+            self.journal = []
+        return self.journal
+
+    def to_ipatch(self, changes=None):
+        """
+        Encode changes as a CORECONF iPATCH payload.
+
+        Args:
+            changes: (instance-identifier, value) pairs as returned by diff();
+                     defaults to the mutations recorded in the journal.
+
+        Returns:
+            CBOR sequence of {instance-identifier: value} maps (null value: delete).
+
+        Raises:
+            ValueError: If no changes are given and the journal is not recording (see start_journal()).
+        """
+        if changes is None:
+            if self.journal is None:
+                raise ValueError("No journal to encode; call start_journal() before the edits, or pass changes")
+            changes = [(entry.iid, entry.value) for entry in self.journal]
+        return encode_ipatch(changes)
+
+    def validate(self, touched_only=False):
+        """
+        Validate the datastore content against the model's SID tables.
+
+        Checks node SIDs, structure, leaf types and list keys (presence and
+        uniqueness); see CORECONFModel.validate().
+
+        Args:
+            touched_only: If True, only validate the nodes changed since the
+                last validate() call: the innermost list entry enclosing each
+                changed node (and the key uniqueness of its list), or the node's
+                subtree outside lists. If more than touched_limit nodes
+                changed, the whole datastore is validated.
+
+        Raises:
+            ConfigValidationError: If validation fails; its errors attribute
+                lists every ValidationIssue(path, message) found.
+
+        Example:
+            ds["/measurements/measurement[type='solar-radiation'][id='0']/value"] = 42
+            ds.validate(touched_only=True)
+        """
+        get_validator = getattr(self.model, "_get_validator", None)
+        validator = get_validator() if get_validator else Validator(self.schema, self.model.sids)
+
+        if touched_only and self._touched is not None:
+            issues = []
+            for (_, keys), compiled in self._touched.items():
+                issues.extend(self._validate_touched(validator, compiled, keys))
+            _logger.debug("Datastore validate: %d touched node(s)", len(self._touched))
         else:
-            # Delete the entire list entry
-            # Find and remove the entry matching all predicates
-            for i, entry in enumerate(measurement_list):
-                if isinstance(entry, dict) and all(
-                    entry.get(k) == (int(v) if v.isdigit() else v)
-                    for k, v in list_item_preds.items()
-                ):
-                    del measurement_list[i]
-                    break
-        
-        # Re-export and reload
-        json_str = json.dumps(current_json)
-        cbor_data = self.model.encode_json(json_str)
-        self.data = cbor.loads(cbor_data)
-        _logger.debug("Datastore delete completed: %s", xpath)
+            issues = validator.check_sid_tree(plain(self.data) if self._mapped else self.data)
+        self._touched = {}
+
+        if issues:
+            raise ConfigValidationError(f"Datastore validation failed: {format_issues(issues)}", issues)
 
+    @instrumented("predicates", measure_predicates)
     def predicates(self, xpath):
         """
         Return list-key predicates for entries under a list XPath.
@@ -367,73 +339,73 @@ class CORECONFDatastore:
         as a single-item list.
         """
         try:
-            target_sid, keys = self._resolve_xpath(xpath)
+            compiled, keys = self._compile_xpath(xpath)
         except (KeyError, ValueError):
             return None
+        target_sid = compiled.target_sid
 
-        key_sids = self.model.key_mapping.get(str(target_sid))
+        key_sids = self.schema.nodes[target_sid].key_sids
         if not key_sids:
             return None
 
         def _format_predicates_from_values(values):
             parts = []
             for key_sid, raw_value in zip(key_sids, values):
-                key_path = self.model.ids.get(key_sid, f"unknown_key_{key_sid}")
-                key_leaf_name = key_path.split("/")[-1].split(":")[-1]
-                key_dtype = self.model.types.get(key_path)
+                key_node = self.schema.nodes.get(key_sid)
+                key_leaf_name = key_node.name if key_node else f"unknown_key_{key_sid}"
+                key_dtype = key_node.type if key_node else None
 
                 key_value = raw_value
                 if key_dtype == "identityref":
                     key_value = self._format_identity_for_xpath(raw_value)
                 elif isinstance(key_dtype, dict): # enum
-                    key_value = self._format_enum_for_xpath(raw_value, key_dtype)
+                    key_value = self._format_enum_for_xpath(raw_value, self._enum_table(key_node))
 
                 parts.append(f"[{key_leaf_name}='{key_value}']")
             return "".join(parts)
 
+        chain = compiled.chain
+        parent_key_count = compiled.parent_key_count
+
         # Predicates already present in the XPath: return a single canonical filter.
-        if keys:
-            return [_format_predicates_from_values(keys)]
+        if len(keys) > parent_key_count:
+            return [_format_predicates_from_values(keys[parent_key_count:])]
 
-        child = self.model._execute_sid_query(self.data, sid=target_sid, keys=[])
-        if child is None:
+        located = self._locate(chain, keys)
+        if located is None:
             return []
 
-        entries = child.get(target_sid, [])
+        holder, slot = located
+        entries = self._child(holder, slot)
         if not isinstance(entries, list):
             return []
 
-        answer = []
-        for entry in entries:
-            if not isinstance(entry, dict):
-                continue
-
-            values = []
-            complete = True
-            for key_sid in key_sids:
-                key_delta = key_sid - target_sid
-                if key_delta not in entry:
-                    complete = False
-                    break
-                values.append(entry[key_delta])
-
-            if complete:
-                answer.append(_format_predicates_from_values(values))
+        # Key tuples of the list instance, in entry order (enclosing keys first)
+        parent_keys = tuple(keys)
+        index = self._list_index(target_sid, key_sids, parent_keys, entries)
 
-        return answer
+        return [_format_predicates_from_values(entry_keys[len(parent_keys):]) for entry_keys in index]
 
     # Core API - Serialization
     # --------------------------------------------------------------------------
 
+    @instrumented("to_cbor", measure_to_cbor)
     def to_cbor(self):
-        """Export modified data back to CBOR."""
-        _logger.debug("Exporting to CBOR (bytes=%d)", len(self.data))
-        return cbor.dumps(self.data)
+        """
+        Export modified data back to CBOR.
+
+        Only the subtrees and list entries changed since the last export are
+        re-encoded; unresolved mapped subtrees are copied verbatim.
+        """
+        _logger.debug("Exporting to CBOR (keys=%d)", len(self.data))
+        return self._cbor_cache.encode(self.data)
 
     def to_json(self):
         """Export data as JSON string."""
         _logger.debug("Exporting to JSON")
-        return self.model.decode_to_json(self.to_cbor())
+        data = plain(self.data) if self._mapped else self.data
+        config = self.model._sid_to_identifier_tree(data, use_native_types=False)
+        return json.dumps(config)
 
     def __str__(self):
         """Return a human-friendly JSON representation for print(ds)."""
@@ -467,39 +439,556 @@ class CORECONFDatastore:
 
         result = {}
         for key, value in flat_data.items():
-            if not isinstance(key, int):
+            node = self.schema.nodes.get(key) if isinstance(key, int) else None
+            if node is None or node.parent is None or node.parent.kind == "root":
+                # Unknown key or already a root-level node (delta from 0).
                 result[key] = value
                 continue
 
-            path = self.model.ids.get(key)
-            if not path:
-                result[key] = value
+            # Walk up the ancestor chain, wrapping with delta keys.
+            current_val = value
+            while node.parent.kind != "root":
+                current_val = {node.sid - node.parent.sid: current_val}
+                node = node.parent
+            current_sid = node.sid
+
+            result[current_sid] = deep_merge(result[current_sid], current_val) if current_sid in result else current_val
+
+        return result
+
+    ## SID Tree Navigation
+    # --------------------------------------------------------------------------
+
+    def _is_descendant(self, sid, ancestor_sid):
+        """Return True if sid is ancestor_sid or one of its schema descendants."""
+        node = self.schema.nodes.get(sid)
+        while node is not None:
+            if node.sid == ancestor_sid:
+                return True
+            node = node.parent
+        return False
+
+    def _schema_chain(self, sid):
+        """
+        Return the schema ancestry of a SID, from the root node down to itself.
+
+        Args:
+            sid: Target SID.
+
+        Returns:
+            List of (sid, key_sids) tuples; key_sids is None for non-list nodes.
+
+        Raises:
+            KeyError: If *sid* is not found in the model.
+        """
+        node = self.schema.nodes.get(sid)
+        if node is None or node.kind == "identity":
+            raise KeyError(f"SID {sid} not found in model")
+
+        return [(n.sid, n.key_sids) for n in node.ancestry()]
+
+    def _locate(self, chain, keys, create=False, undo=None):
+        """
+        Walk the delta-SID tree along a schema chain.
+
+        List entries are found through the per-list key index (see _list_index()).
+
+        Args:
+            chain: Schema ancestry as returned by _schema_chain().
+            keys: SID-typed key values for the lists along the chain (outermost first).
+            create: If True, create missing containers and list entries on the way.
+            undo: Optional undo log recording the created nodes (see Transaction).
+
+        Returns:
+            (holder, slot) locating the target node. For a list entry, holder is
+            the list and slot the entry itself; otherwise holder is the parent dict
+            and slot the delta SID (which may not exist yet).
+            Returns None if the path does not exist and *create* is False.
+
+        Raises:
+            ValueError: If not enough keys are provided for a list on the path.
+            KeyError: If the data does not match the schema shape.
+        """
+        node = self.data
+        parent_sid = 0
+        keys = tuple(keys)
+        consumed = 0
+
+        last = len(chain) - 1
+        for i, (sid, key_sids) in enumerate(chain):
+            delta = sid - parent_sid
+
+            # The target itself, unless it is a list entry addressed by keys
+            if i == last and (key_sids is None or consumed == len(keys)):
+                return node, delta
+
+            child = node.get(delta)
+            if type(child) is MappedNode:
+                child = node[delta] = child.resolve()
+
+            if key_sids is None:
+                # Container
+                if child is None:
+                    if not create:
+                        return None
+                    if undo is not None:
+                        undo.save_slot(node, delta)
+                    child = node[delta] = {}
+                elif not isinstance(child, dict):
+                    raise KeyError(f"Expected container at SID {sid}")
+                node = child
+                parent_sid = sid
                 continue
 
-            parts = path.lstrip('/').split('/')
-            if len(parts) <= 1:
-                # Already a root-level node; key is absolute (delta from 0).
-                result[key] = value
+            # List: consume this level's keys and find the matching entry
+            if len(key_sids) > len(keys) - consumed:
+                raise ValueError("Not enough keys provided for list with key: " + str(sid))
+
+            parent_keys = keys[:consumed]
+            consumed += len(key_sids)
+            entry_keys = keys[:consumed]
+
+            if child is None:
+                if not create:
+                    return None
+                if undo is not None:
+                    undo.save_slot(node, delta)
+                child = node[delta] = []
+            elif not isinstance(child, list):
+                raise KeyError(f"Expected list at SID {sid}")
+
+            index = self._list_index(sid, key_sids, parent_keys, child)
+            entry = index.get(entry_keys)
+            if entry is None:
+                if not create:
+                    return None
+                entry = self._new_entry(sid, key_sids, entry_keys[len(parent_keys):])
+                if undo is not None:
+                    undo.save_entries(child)
+                child.append(entry)
+                index[entry_keys] = entry
+
+            if i == last:
+                return child, entry
+
+            node = entry
+            parent_sid = sid
+
+        return None
+
+    def _child(self, node, delta):
+        """Return node[delta] (or None), resolving a mapped subtree in place on first access."""
+        child = node.get(delta)
+        if type(child) is MappedNode:
+            child = node[delta] = child.resolve()
+        return child
+
+    ## Writes
+    # --------------------------------------------------------------------------
+
+    def _write(self, compiled, keys, cbor_value, xpath, located=None, undo=None, stale=None):
+        """
+        Write a converted (SID-keyed) value at a compiled XPath (see __setitem__).
+
+        Args:
+            located: (holder, slot) of the target, if already known.
+            undo: Optional undo log recording every change (see Transaction).
+            stale: Optional list collecting (sid, keys) of replaced subtrees whose
+                   list indexes are invalidated later, instead of immediately.
+
+        Returns:
+            For a list entry (whose leaves are merged into the entry), the
+            (instance-identifier, value) pairs of the changed children, as diff()
+            would report them, or the whole entry if it held only its keys
+            (e.g. just created). None for other targets (replaced as a whole).
+
+        Raises:
+            TypeError: If a list entry is written with a non-dict value.
+        """
+        target_sid = compiled.target_sid
+        chain = compiled.chain
+
+        # Walk the SID tree, creating missing containers and list entries
+        if located is None:
+            located = self._locate(chain, keys, create=True, undo=undo)
+        holder, slot = located
+        self._mark_dirty(chain, keys)
+
+        if isinstance(holder, list):
+            # Target is a list entry: merge the given leaves into it
+            if not isinstance(cbor_value, dict):
+                raise TypeError(f"List entry value must be a dict: {xpath}")
+
+            key_sids = chain[-1][1]
+            key_deltas = [k_sid - target_sid for k_sid in key_sids]
+            if all(delta in key_deltas and cbor_value.get(delta, value) == value for delta, value in slot.items()):
+                changes = [(instance_id(target_sid, keys), slot)] # keys only: write the whole entry
+            else:
+                changes = [(instance_id(target_sid + delta, keys), value)
+                           for delta, value in cbor_value.items() if slot.get(delta, _MISSING) != value]
+
+            if undo is not None:
+                for delta in cbor_value:
+                    undo.save_slot(slot, delta)
+            slot.update(cbor_value)
+
+            if any(delta in cbor_value for delta in key_deltas):
+                self._invalidate_index(target_sid, keys[:len(keys) - len(key_sids)])
+            return changes
+        else:
+            if undo is not None:
+                undo.save_slot(holder, slot)
+            holder[slot] = cbor_value
+            self._invalidate_after_write(chain, keys, cbor_value, stale)
+
+    def _remove(self, compiled, keys, xpath, undo=None, stale=None):
+        """
+        Remove the node at a compiled XPath (see __delitem__; undo and stale as in _write()).
+
+        Raises:
+            KeyError: If the path does not exist in the datastore.
+        """
+        target_sid = compiled.target_sid
+        chain = compiled.chain
+        located = self._locate(chain, keys)
+
+        if located is None:
+            raise KeyError(f"Path not found: {xpath}")
+
+        holder, slot = located
+        self._mark_dirty(chain, keys)
+        if isinstance(holder, list):
+            key_sids = chain[-1][1]
+            cached = self._list_indexes.get((target_sid, tuple(keys[:len(keys) - len(key_sids)])))
+            if cached is not None:
+                cached[1].pop(tuple(keys), None)
+            if undo is not None:
+                undo.save_entries(holder)
+            self._remove_entry(holder, slot)
+            if stale is not None:
+                stale.append((target_sid, keys))
+            else:
+                self._invalidate_subtree_indexes(target_sid, keys)
+        else:
+            if slot not in holder:
+                raise KeyError(f"Path not found: {xpath}")
+            if undo is not None:
+                undo.save_slot(holder, slot)
+            removed = holder.pop(slot)
+            self._invalidate_after_write(chain, keys, removed, stale)
+
+    def _merge(self, compiled, keys, cbor_value, xpath, undo):
+        """
+        Merge a converted (SID-keyed) value into the node at a compiled XPath.
+
+        Containers and list entries are merged recursively, list entries being
+        matched by key values (unmatched entries are appended); leaves, leaf-lists
+        and keyless lists are replaced. Missing targets are created as by _write().
+
+        Args:
+            undo: Undo log recording every change (see Transaction).
+
+        Returns:
+            (instance-identifier, value) pairs of the nodes created or replaced,
+            as diff() would report them: a target or list entry that did not
+            exist is one change, otherwise the merge is reported per node.
+
+        Raises:
+            TypeError: If a list entry is merged with a non-dict value.
+        """
+        target_sid = compiled.target_sid
+        chain = compiled.chain
+        existing = self._locate(chain, keys)
+        created = existing is None or (not isinstance(existing[0], list) and existing[1] not in existing[0])
+
+        holder, slot = self._locate(chain, keys, create=True, undo=undo)
+        self._mark_dirty(chain, keys, deep=True)
+        changes = []
+
+        if isinstance(holder, list):
+            if not isinstance(cbor_value, dict):
+                raise TypeError(f"List entry value must be a dict: {xpath}")
+            self._merge_children(slot, cbor_value, target_sid, keys, undo, changes)
+            merged = slot
+
+            key_sids = chain[-1][1]
+            self._invalidate_index(target_sid, keys[:len(keys) - len(key_sids)])
+            self._invalidate_subtree_indexes(target_sid, keys)
+        else:
+            self._merge_slot(holder, slot, cbor_value, target_sid, keys, undo, changes)
+            merged = holder[slot]
+            self._invalidate_after_write(chain, keys, cbor_value)
+
+        if created:
+            return [(instance_id(target_sid, keys), merged)]
+        return changes
+
+    def _merge_slot(self, holder, slot, value, sid, keys, undo, changes):
+        """Merge a SID-keyed value into holder[slot] (the node of *sid*), appending the changes made."""
+        current = holder.get(slot)
+        if type(current) is MappedNode:
+            current = holder[slot] = current.resolve()
+
+        if type(current) is dict and type(value) is dict:
+            self._merge_children(current, value, sid, keys, undo, changes)
+            return
+
+        if type(current) is list and type(value) is list:
+            key_sids = self.schema.nodes[sid].key_sids
+            if key_sids:
+                self._merge_entries(current, value, sid, key_sids, keys, undo, changes)
+                return
+
+        if slot in holder and current == value:
+            return # unchanged (e.g. the keys of a matched entry)
+
+        undo.save_slot(holder, slot)
+        holder[slot] = value
+        changes.append((instance_id(sid, keys), value))
+
+    def _merge_children(self, node, value, sid, keys, undo, changes):
+        """Merge the delta-SID children of *value* into *node* (the node of *sid*)."""
+        for delta, child in value.items():
+            self._merge_slot(node, delta, child, sid + delta, keys, undo, changes)
+
+    def _merge_entries(self, entries, new_entries, list_sid, key_sids, keys, undo, changes):
+        """Merge list entries by key values; entries without a match are appended."""
+        key_deltas = [k_sid - list_sid for k_sid in key_sids]
+
+        existing = {}
+        for entry in entries:
+            if type(entry) is dict and all(d in entry for d in key_deltas):
+                existing.setdefault(tuple(entry[d] for d in key_deltas), entry)
+
+        for new_entry in new_entries:
+            entry_keys = None
+            if type(new_entry) is dict and all(d in new_entry for d in key_deltas):
+                entry_keys = tuple(new_entry[d] for d in key_deltas)
+            entry = existing.get(entry_keys) if entry_keys is not None else None
+
+            if entry is not None:
+                self._merge_children(entry, new_entry, list_sid, keys + entry_keys, undo, changes)
                 continue
 
-            # Walk up the ancestor chain, wrapping with delta keys.
-            current_sid = key
-            current_val = value
-            while True:
-                p = self.model.ids.get(current_sid, '')
-                p_parts = p.lstrip('/').split('/')
-                if len(p_parts) <= 1:
-                    break
-                parent_path = '/' + '/'.join(p_parts[:-1])
-                parent_sid = self.model.sids.get(parent_path)
-                if parent_sid is None:
+            undo.save_entries(entries)
+            entries.append(new_entry)
+            if entry_keys is not None:
+                existing[entry_keys] = new_entry
+                changes.append((instance_id(list_sid, keys + entry_keys), new_entry))
+            else:
+                # An entry without all its keys has no instance-identifier: report the list
+                changes.append((instance_id(list_sid, keys), entries))
+
+    def _mark_dirty(self, chain, keys, deep=False):
+        """
+        Report a change at a node to the CBOR cache (before the tree is changed).
+
+        The top-level subtree and the first-level list entry holding the node
+        are marked dirty. With deep=True (in-place changes below the node), all
+        the list entries of the subtree are, unless the node is within an entry.
+        """
+        if not self._cbor_cache:
+            return
+
+        entry = None
+        for sid, key_sids in chain:
+            if key_sids is None:
+                continue
+            if len(keys) >= len(key_sids):
+                cached = self._list_indexes.get((sid, ()))
+                entry = cached[1].get(tuple(keys[:len(key_sids)])) if cached is not None else None
+                deep = deep or entry is None # unknown entry: drop them all
+            break
+
+        self._cbor_cache.mark_dirty(chain[0][0], entry, entries=deep and entry is None)
+
+    def _record(self, compiled, keys, op, value, changes=None, entries=None):
+        """
+        Append a mutation to the journal (if enabled) and mark its target for validate().
+
+        Args:
+            changes: (instance-identifier, value) pairs made by the mutation, if
+                     not its value at its target (see _journal_entries()).
+            entries: Journal entries of the mutation, if made beforehand.
+        """
+        touched = self._touched
+        if touched is not None:
+            if len(touched) < self.touched_limit:
+                touched[(compiled.target_sid, keys)] = compiled
+            else:
+                self._touched = None # too many: the next validate() checks everything
+        if self.journal is not None:
+            if entries is None:
+                entries = self._journal_entries(compiled, keys, op, value, changes)
+            self.journal.extend(entries)
+
+    def _journal_entries(self, compiled, keys, op, value, changes=None):
+        """
+        Return the journal entries of a mutation.
+
+        Merges and list entry writes are journaled as the (instance-identifier,
+        value) changes they made (see _merge() and _write()), so that
+        to_ipatch() does not replace their target.
+        Values are also in the tree: they are copied so that later in-place
+        edits do not rewrite history.
+        """
+        if changes is None:
+            changes = [(instance_id(compiled.target_sid, keys), value)]
+        return [JournalEntry(iid, op, copy.deepcopy(change)) for iid, change in changes]
+
+    def _validate_touched(self, validator, compiled, keys):
+        """Return the validation issues of the scope of a changed node (see validate())."""
+        chain = compiled.chain
+
+        # Innermost list entry enclosing (or being) the target: (chain index, key count)
+        scope = None
+        count = 0
+        for i, (sid, key_sids) in enumerate(chain):
+            if key_sids:
+                count += len(key_sids)
+                if count > len(keys):
                     break
-                current_val = {current_sid - parent_sid: current_val}
-                current_sid = parent_sid
+                scope = (i, count)
+
+        if scope is None:
+            located = self._locate(chain, keys)
+            if located is None or located[1] not in located[0]:
+                return [] # removed
+            holder, slot = located
+            return validator.check_sid_tree(plain(holder[slot]), compiled.target_sid, self._create_xpath(compiled.target_sid, keys))
+
+        i, count = scope
+        list_sid, key_sids = chain[i]
+        path = self._create_xpath(list_sid, keys[:count])
+
+        if compiled.target_sid in key_sids:
+            # A key changed: the entry may have moved, check the whole list instance
+            holder, slot = self._locate(chain[:i + 1], keys[:count - len(key_sids)]) or ({}, None)
+            entries = holder.get(slot)
+            if entries is None:
+                return []
+            return validator.check_sid_tree(plain(entries), list_sid, self._create_xpath(list_sid, keys[:count - len(key_sids)]))
+
+        located = self._locate(chain[:i + 1], keys[:count])
+        if located is None:
+            return [] # removed
+        entries, entry = located
+        return validator.check_sid_entry(plain(entry), list_sid, path) + validator.check_unique_keys(entries, list_sid, path)
+
+    ## List Indexes
+    # --------------------------------------------------------------------------
 
-            result[current_sid] = deep_merge(result[current_sid], current_val) if current_sid in result else current_val
+    def _list_index(self, list_sid, key_sids, parent_keys, entries):
+        """
+        Return the key index of a list instance, building it on first use.
 
-        return result
+        A list instance is identified by its SID and the key values of the
+        enclosing list entries (parent_keys). The index maps the full key tuple
+        (parent keys followed by the entry's own keys) to the entry dict.
+
+        The cached index is reused only while it still refers to the same list
+        object with the same number of entries; otherwise it is rebuilt.
+        """
+        cached = self._list_indexes.get((list_sid, parent_keys))
+        if cached is not None and cached[0] is entries and len(cached[1]) == len(entries):
+            return cached[1]
+
+        key_deltas = [k_sid - list_sid for k_sid in key_sids]
+        index = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                entry_keys = parent_keys + tuple(entry[k_delta] for k_delta in key_deltas)
+            except KeyError:
+                continue # incomplete entry, cannot be addressed by keys
+            index.setdefault(entry_keys, entry)
+
+        self._list_indexes[(list_sid, parent_keys)] = (entries, index)
+        return index
+
+    def _invalidate_index(self, list_sid, parent_keys):
+        """Drop the key index of a single list instance."""
+        self._list_indexes.pop((list_sid, tuple(parent_keys)), None)
+
+    def _invalidate_subtree_indexes(self, sid, keys):
+        """Drop the key indexes of all list instances at or below a node."""
+        self._invalidate_subtrees([(sid, keys)])
+
+    def _invalidate_subtrees(self, subtrees):
+        """Drop the key indexes of all list instances at or below any of the (sid, keys) nodes, in one pass."""
+        if not self._list_indexes or not subtrees:
+            return
+
+        subtrees = [(sid, tuple(keys)) for sid, keys in subtrees]
+        stale = [
+            (list_sid, parent_keys) for list_sid, parent_keys in self._list_indexes
+            if any(parent_keys[:len(keys)] == keys and self._is_descendant(list_sid, sid)
+                   for sid, keys in subtrees)
+        ]
+        for index_key in stale:
+            del self._list_indexes[index_key]
+
+    def _new_entry(self, list_sid, key_sids, key_values):
+        """Create a list entry holding only its key leaves."""
+        return {k_sid - list_sid: k_value for k_sid, k_value in zip(key_sids, key_values)}
+
+    def _remove_entry(self, entries, entry):
+        """Remove a list entry by identity."""
+        for position, candidate in enumerate(entries):
+            if candidate is entry:
+                del entries[position]
+                return
+
+    def _invalidate_after_write(self, chain, keys, value, stale=None):
+        """
+        Invalidate the list indexes affected by writing or removing a non-entry node.
+
+        Changing a key leaf invalidates the enclosing list instance; replacing or
+        removing a subtree invalidates the list instances below it (or adds the
+        subtree to *stale*, if given).
+        """
+        target_sid = chain[-1][0]
+
+        if len(chain) > 1 and chain[-2][1] is not None and target_sid in chain[-2][1]:
+            list_sid, key_sids = chain[-2]
+            self._invalidate_index(list_sid, keys[:len(keys) - len(key_sids)])
+        elif isinstance(value, (dict, list, MappedNode)):
+            if stale is not None:
+                stale.append((target_sid, keys))
+            else:
+                self._invalidate_subtree_indexes(target_sid, keys)
+
+    def _from_sid_value(self, sid, value):
+        """
+        Convert a CBOR value at a target SID back to its YANG (identifier-keyed) form.
+
+        The datastore content is never modified; subtrees are converted into new trees.
+        """
+        node = self.schema.nodes[sid]
+
+        if isinstance(value, (dict, list)):
+            return self.model._sid_to_identifier_tree(value, sid_delta=sid, path=node.identifier)
+
+        if node.type is None:
+            return value
+        return self.model._decode_leaf(sid, value)
+
+    def _to_sid_value(self, sid, value):
+        """
+        Convert a YANG (identifier-keyed) value to its CBOR form for a target SID.
+
+        Containers and list entries are converted to delta-SID subtrees relative
+        to the target; leaves are converted according to their YANG type.
+        """
+        node = self.schema.nodes[sid]
+
+        if isinstance(value, (dict, list)):
+            return self.model._identifier_to_sid_tree(value, path=node.identifier + "/", parent_sid=sid)
+
+        if node.type is None:
+            return value
+        return self.model._encode_leaf(sid, value)
 
     ## Identityref & Enum Handling
     # --------------------------------------------------------------------------
@@ -528,19 +1017,7 @@ class CORECONFDatastore:
         # If unqualified identity name is provided, resolve only when unambiguous.
         normalized = identity_value.lstrip("/")
         if ":" not in normalized:
-            matches = []
-            for candidate_path, candidate_sid in self.model.sids.items():
-                if not isinstance(candidate_path, str):
-                    continue
-                candidate = candidate_path.lstrip("/")
-
-                # Only consider top-level qualified names, e.g. module:identity.
-                if "/" in candidate or ":" not in candidate:
-                    continue
-
-                candidate_short = candidate.split(":", 1)[1]
-                if candidate_short == normalized:
-                    matches.append(candidate_sid)
+            matches = self.schema.identities.get(normalized, [])
 
             if len(matches) == 1:
                 return matches[0]
@@ -575,7 +1052,14 @@ class CORECONFDatastore:
 
         return full_identity
 
-    def _resolve_enum_to_int(self, enum_type, enum_value):
+    def _enum_table(self, node):
+        """Return the EnumTable (names by value, values by name) of an enumeration leaf."""
+        table = self._enums.get(node.sid)
+        if table is None:
+            table = self._enums[node.sid] = enum_table(node.type)
+        return table
+
+    def _resolve_enum_to_int(self, enum_table, enum_value):
         """
         Resolve enum predicate value to its integer representation.
 
@@ -585,40 +1069,43 @@ class CORECONFDatastore:
         - enum integer (e.g. 1)
         """
         if isinstance(enum_value, int):
-            if str(enum_value) in enum_type:
+            if enum_value in enum_table.names:
                 return enum_value
             raise ValueError(f"Enum value out of range: {enum_value}")
 
         if not isinstance(enum_value, str):
             raise ValueError(f"Enum value must be str or int, got: {type(enum_value).__name__}")
 
-        if enum_value in enum_type:
-            return int(enum_value)
-
-        matches = [int(k) for k, v in enum_type.items() if v == enum_value]
-        if len(matches) == 1:
-            return matches[0]
-        if len(matches) > 1:
-            raise ValueError(f"Ambiguous enum name: {enum_value}")
-
         try:
             as_int = int(enum_value)
-            if str(as_int) in enum_type:
-                return as_int
         except ValueError:
-            pass
+            as_int = None
+
+        # Exact integer form first, then names, then any integer spelling
+        if as_int is not None and str(as_int) == enum_value and as_int in enum_table.names:
+            return as_int
+
+        value = enum_table.values.get(enum_value)
+        if value is not None:
+            return value
+
+        if as_int is not None and as_int in enum_table.names:
+            return as_int
 
         raise ValueError(f"Enum value not found: {enum_value}")
 
-    def _format_enum_for_xpath(self, raw_value, enum_type):
+    def _format_enum_for_xpath(self, raw_value, enum_table):
         """
         Format enum key value for XPath predicates.
 
         Converts integer enum values to their symbolic names when available.
         """
-        key = str(raw_value)
-        if key in enum_type:
-            return enum_type[key]
+        if isinstance(raw_value, str) and raw_value.isdigit():
+            raw_value = int(raw_value)
+        if isinstance(raw_value, int):
+            name = enum_table.names.get(raw_value)
+            if name is not None:
+                return name
         return raw_value
   
     ## XPath Resolution
@@ -677,90 +1164,115 @@ class CORECONFDatastore:
         Returns:
             (target_sid, list_of_key_values)
         """
+        compiled, keys = self._compile_xpath(xpath)
+        return compiled.target_sid, list(keys)
+
+    def _compile_xpath(self, xpath):
+        """
+        Resolve XPath to its compiled form and bound key values, using the caches.
+
+        Full XPath strings are cached with their bound keys, so repeated accesses
+        skip parsing entirely. XPaths that only differ by their predicate values
+        share the same compiled template.
+
+        Args:
+            xpath: XPath string
+
+        Returns:
+            (_CompiledXPath, tuple_of_key_values)
+        """
+        cached = self._xpath_cache.get(xpath)
+        if cached is not None:
+            self._xpath_cache.move_to_end(xpath)
+            return cached
+
+        result = self._compile_uncached(xpath)
+        self._cache_put(self._xpath_cache, xpath, result)
+        return result
+
+    @instrumented("resolve_xpath")
+    def _compile_uncached(self, xpath):
+        """Parse an XPath and bind its keys to the compiled template of its shape."""
         segments = self._parse_xpath(xpath)
+        shape = tuple((segment_name, tuple(predicates)) for segment_name, predicates in segments)
+
+        compiled = self._xpath_templates.get(shape)
+        if compiled is None:
+            compiled = self._compile_segments(segments)
+            self._cache_put(self._xpath_templates, shape, compiled)
+        else:
+            self._xpath_templates.move_to_end(shape)
+
+        return compiled, compiled.bind(segments)
+
+    def _cache_put(self, cache, key, value):
+        """Insert into a bounded LRU cache, evicting the least recently used item."""
+        cache[key] = value
+        if len(cache) > self.xpath_cache_size:
+            cache.popitem(last=False)
+
+    def _compile_segments(self, segments):
+        """
+        Resolve parsed XPath segments against the model.
+
+        Args:
+            segments: Output of _parse_xpath().
+
+        Returns:
+            _CompiledXPath for the target node.
+        """
+        node = self.schema.root
+        key_slots = []
         
-        yang_path = ""
-        key_values = []
-        
-        for segment_name, predicates in segments:
-            # Build YANG path progressively
-            if not yang_path:
-                # Root element
-                test_path = "/" + segment_name
-                if test_path in self.model.sids:
-                    yang_path = test_path
-                else:
-                    # Try with module prefix
-                    for sid_path in self.model.sids.keys():
-                        if sid_path.endswith(":" + segment_name):
-                            yang_path = sid_path
-                            break
-                    if not yang_path:
-                        raise KeyError(f"Root element not found: {segment_name}")
-            else:
-                # Child element
-                test_path = yang_path + "/" + segment_name
-                if test_path in self.model.sids:
-                    yang_path = test_path
-                else:
-                    # Try with module prefix
-                    found = False
-                    for sid_path in self.model.sids.keys():
-                        if sid_path.startswith(yang_path + "/") and (
-                            sid_path.endswith(":" + segment_name) or 
-                            sid_path == yang_path + "/" + segment_name
-                        ):
-                            yang_path = sid_path
-                            found = True
-                            break
-                    if not found:
-                        raise KeyError(f"Path element not found: {segment_name} (current: {yang_path})")
+        for position, (segment_name, predicates) in enumerate(segments):
+            # Step down the schema tree (qualified or local name)
+            child = node.child(segment_name)
+            if child is None:
+                if node is self.schema.root:
+                    raise KeyError(f"Root element not found: {segment_name}")
+                raise KeyError(f"Path element not found: {segment_name} (current: {node.identifier})")
+            node = child
             
             # Handle predicates (list keys)
             if predicates:
-                current_sid = self.model.sids[yang_path]
-                
                 # Check if this is a list node
-                if str(current_sid) not in self.model.key_mapping:
+                if node.key_sids is None:
                     raise ValueError(f"Predicates specified for non-list element: {segment_name}")
                 
-                expected_keys = self.model.key_mapping[str(current_sid)]
-                
-                # Resolve predicate names to SIDs and extract values in correct order
-                for key_sid in expected_keys:
-                    # Find the YANG path for this key SID
-                    key_path = self.model.ids.get(key_sid)
-                    if not key_path:
+                # Resolve predicate names to SIDs, in key order
+                for key_sid in node.key_sids:
+                    key_node = self.schema.nodes.get(key_sid)
+                    if key_node is None:
                         raise ValueError(f"Key SID not found in model: {key_sid}")
                     
-                    # Extract leaf name (last part after /)
-                    key_name = key_path.rstrip('/').split('/')[-1].split(':')[-1]
-                    
-                    if key_name not in predicates:
-                        raise ValueError(f"Missing key predicate: {key_name}")
-                    
-                    # Get the value and convert type if needed
-                    key_value = predicates[key_name]
-                    
-                    # Try to convert to appropriate type
-                    # Check the data type from the model
-                    if key_path in self.model.types:
-                        dtype = self.model.types[key_path]
-                        if isinstance(dtype, str):
-                            if 'int' in dtype:
-                                key_value = int(key_value)
-                            elif dtype == 'identityref':
-                                # Convert identity name to SID.
-                                # Unqualified values are accepted when unambiguous.
-                                key_value = self._resolve_identity_to_sid(key_value)
-                        elif isinstance(dtype, dict):
-                            # Enumeration key: accept symbolic names and numeric forms.
-                            key_value = self._resolve_enum_to_int(dtype, key_value)
-                    
-                    key_values.append(key_value)
+                    if key_node.name not in predicates:
+                        raise ValueError(f"Missing key predicate: {key_node.name}")
+
+                    key_slots.append((position, key_node.name, self._key_converter(key_node)))
+
+        if node is self.schema.root:
+            raise KeyError("Empty XPath")
         
-        target_sid = self.model.sids[yang_path]
-        return target_sid, key_values
+        chain = tuple((n.sid, n.key_sids) for n in node.ancestry())
+        return _CompiledXPath(node.sid, chain, tuple(key_slots))
+
+    def _key_converter(self, key_node):
+        """
+        Return the callable converting a textual predicate value to its SID-typed
+        form for a key leaf, or None if the value is kept as-is.
+        """
+        dtype = key_node.type
+        if isinstance(dtype, str):
+            if 'int' in dtype:
+                return int
+            elif dtype == 'identityref':
+                # Convert identity name to SID.
+                # Unqualified values are accepted when unambiguous.
+                return self._resolve_identity_to_sid
+        elif isinstance(dtype, dict):
+            # Enumeration key: accept symbolic names and numeric forms.
+            return functools.partial(self._resolve_enum_to_int, self._enum_table(key_node))
+        return None
 
     def _create_xpath(self, sid, keys=None):
         """
@@ -787,45 +1299,38 @@ class CORECONFDatastore:
             xpath = datastore._create_xpath(1234, keys=['solar-radiation', '0'])
             # → "/measurements/measurement[type='solar-radiation'][id='0']/value"
         """
-        yang_path = self.model.ids.get(sid)
-        if yang_path is None:
+        node = self.schema.nodes.get(sid)
+        if node is None or node.kind == "identity":
             raise KeyError(f"SID {sid} not found in model")
 
-        segments = [s for s in yang_path.split('/') if s]
         xpath_parts = []
-        current_path = ""
         key_index = 0
         keys = keys or []
 
-        for segment in segments:
-            # Strip module prefix: "ietf-foo:container" → "container"
-            local_name = segment.split(':')[-1]
-            current_path = current_path + "/" + segment
-
-            seg_sid = self.model.sids.get(current_path)
+        for seg_node in node.ancestry():
+            # Local name, without module prefix: "ietf-foo:container" → "container"
+            local_name = seg_node.name
 
             # If this segment is a list node, inject key predicates
-            if seg_sid is not None and str(seg_sid) in self.model.key_mapping:
-                key_sids = self.model.key_mapping[str(seg_sid)]
+            if seg_node.key_sids is not None:
                 predicates = []
-                for key_sid in key_sids:
+                for key_sid in seg_node.key_sids:
                     if key_index < len(keys):
-                        key_path = self.model.ids.get(key_sid)
-                        key_name = key_path.rstrip('/').split('/')[-1].split(':')[-1]
+                        key_node = self.schema.nodes.get(key_sid)
                         key_val = keys[key_index]
                         key_index += 1
                         # Identityref: numeric SID → resolve to "module:name"
-                        key_type = self.model.types.get(key_path)
+                        key_type = key_node.type
                         if isinstance(key_val, int):
                             if key_type == 'identityref':
                                 resolved = self.model.ids.get(key_val)
                                 if resolved:
                                     key_val = resolved
                             elif isinstance(key_type, dict):  # enum: {"0": "name", ...}
-                                resolved = key_type.get(str(key_val))
+                                resolved = self._enum_table(key_node).names.get(key_val)
                                 if resolved:
                                     key_val = resolved
-                        predicates.append(f"{key_name}='{key_val}'")
+                        predicates.append(f"{key_node.name}='{key_val}'")
                 if predicates:
                     xpath_parts.append(local_name + "".join(f"[{p}]" for p in predicates))
                 else:
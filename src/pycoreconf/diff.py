@@ -0,0 +1,152 @@
+# Change journal entries, structural diff of SID trees and iPATCH payloads
+
+from collections import namedtuple
+import io
+import cbor2 as cbor
+import logging
+
+from .mapped import MappedNode, encode_mapped
+
+_logger = logging.getLogger(__name__)
+
+# Datastore mutation: instance-identifier, operation ("set", "delete" or "merge"), SID-keyed value
+JournalEntry = namedtuple("JournalEntry", ["iid", "op", "value"])
+
+_MISSING = object()
+
+
+def instance_id(sid, keys=()):
+    """
+    Return the CORECONF instance-identifier of a node.
+
+    Args:
+        sid: SID of the node.
+        keys: Key values of the enclosing list entries (and of the entry itself,
+              for a list entry), outermost first.
+
+    Returns:
+        The SID for nodes outside lists, otherwise [sid, key, ...].
+    """
+    return [sid, *keys] if keys else sid
+
+
+def diff_trees(schema, old, new):
+    """
+    Compare two SID-keyed trees of the same model.
+
+    List entries are matched by their key values. Identical subtrees (same
+    object, equal values or, for unresolved mapped nodes, equal encodings) are
+    skipped without being walked.
+
+    Args:
+        schema: SchemaTree of the model.
+        old: SID-keyed tree to change.
+        new: SID-keyed tree to reach.
+
+    Returns:
+        List of (instance-identifier, value) changes turning *old* into *new*;
+        value is the SID-keyed value of the node (relative to its SID), or None
+        for a removed node.
+    """
+    changes = []
+    _diff_nodes(schema, old, new, 0, (), changes)
+    return changes
+
+
+def _same(a, b):
+    """Return True if two values are known to be identical without walking them."""
+    if a is b:
+        return True
+    if type(a) is MappedNode or type(b) is MappedNode:
+        return type(a) is type(b) and a.raw() == b.raw()
+    return a == b
+
+
+def _diff_nodes(schema, old, new, parent_sid, keys, changes):
+    """Append the changes between two maps (children of *parent_sid*) to *changes*."""
+    for delta, old_value in old.items():
+        if delta not in new:
+            changes.append((instance_id(parent_sid + delta, keys), None))
+
+    for delta, new_value in new.items():
+        sid = parent_sid + delta
+        old_value = old.get(delta, _MISSING)
+
+        if old_value is _MISSING:
+            changes.append((instance_id(sid, keys), new_value))
+        elif not _same(old_value, new_value):
+            _diff_values(schema, old_value, new_value, sid, keys, changes)
+
+
+def _diff_values(schema, old, new, sid, keys, changes):
+    """Append the changes between two different values of the node *sid*."""
+    if type(old) is MappedNode:
+        old = old.resolve()
+    if type(new) is MappedNode:
+        new = new.resolve()
+
+    if type(old) is dict and type(new) is dict:
+        _diff_nodes(schema, old, new, sid, keys, changes)
+        return
+
+    if type(old) is list and type(new) is list:
+        node = schema.nodes.get(sid)
+        if node is not None and node.key_sids:
+            _diff_entries(schema, old, new, sid, node.key_sids, keys, changes)
+            return
+
+    changes.append((instance_id(sid, keys), new))
+
+
+def _entry_index(entries, key_deltas):
+    """Index list entries by key value tuple (entries without all their keys are skipped)."""
+    index = {}
+    for entry in entries:
+        if type(entry) is dict and all(d in entry for d in key_deltas):
+            index.setdefault(tuple(entry[d] for d in key_deltas), entry)
+    return index
+
+
+def _diff_entries(schema, old, new, list_sid, key_sids, keys, changes):
+    """Append the changes between two instances of a keyed list, matching entries by keys."""
+    key_deltas = [k_sid - list_sid for k_sid in key_sids]
+    old_index = _entry_index(old, key_deltas)
+    new_index = _entry_index(new, key_deltas)
+
+    for entry_keys in old_index:
+        if entry_keys not in new_index:
+            changes.append((instance_id(list_sid, keys + entry_keys), None))
+
+    for entry_keys, new_entry in new_index.items():
+        old_entry = old_index.get(entry_keys)
+        if old_entry is None:
+            changes.append((instance_id(list_sid, keys + entry_keys), new_entry))
+        elif not _same(old_entry, new_entry):
+            _diff_nodes(schema, old_entry, new_entry, list_sid, keys + entry_keys, changes)
+
+
+def encode_ipatch(changes):
+    """
+    Encode changes as a CORECONF iPATCH payload.
+
+    The payload is a CBOR sequence of single-entry maps {instance-identifier: value},
+    with null values for removed nodes (application/yang-instances+cbor-seq).
+
+    Args:
+        changes: Iterable of (instance-identifier, value) pairs.
+
+    Returns:
+        CBOR-encoded bytes.
+    """
+    fp = io.BytesIO()
+    encoder = cbor.CBOREncoder(fp, default=encode_mapped)
+    count = 0
+    for iid, value in changes:
+        encoder.encode_length(5, 1) # map
+        encoder.encode(iid)
+        encoder.encode(value)
+        count += 1
+
+    _logger.debug("Encoded iPATCH payload (changes=%d, bytes=%d)", count, fp.tell())
+
+    return fp.getvalue()
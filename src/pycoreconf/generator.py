@@ -0,0 +1,303 @@
+# Synthetic identifier-keyed configs generated from the SID tables of a model
+
+import base64
+import json
+import logging
+import random
+
+import cbor2 as cbor
+
+from .converters import INTEGER_TYPES, UNHANDLED_TYPES
+from .validation import _INTEGER_RANGES
+
+_logger = logging.getLogger(__name__)
+
+# Output formats of WorkloadGenerator.write()
+FORMATS = ("json", "cbor", "cbor-seq")
+
+# Generated integer leaves stay within +/- this magnitude (keys count up from 0)
+_MAX_MAGNITUDE = 2**31
+
+
+class WorkloadGenerator:
+    """
+    Generator of synthetic configs for a CORECONFModel.
+
+    Configs are built by walking the model's schema tree: containers get all
+    their children, lists get list_size entries with unique key values, and
+    leaves a value of their type (integers within the type's range, names of
+    enumerations, identities of the leaf's module, base64 binary, ...). Output
+    is deterministic for a given model and seed.
+
+    Leaves of types the SID tables cannot produce meaningfully (empty, leafref,
+    instance-identifier) are left out. The SID tables do not describe choices,
+    identity bases or YANG constraints (must, when, patterns), so configs are
+    type-correct against the SID tables (see CORECONFModel.validate()) but may
+    not satisfy the full YANG model.
+
+    Args:
+        model: CORECONFModel (or ModelSID) to generate configs for.
+        seed: Seed of the pseudo-random values.
+        list_size: Number of entries generated in every list instance.
+
+    Example:
+        - gen = WorkloadGenerator(ccm, seed=42)
+        - config = gen.config(target_size=64 * 1024)  # ~64 KiB once encoded
+        - with open("load.cborseq", "wb") as f:
+              gen.write(f, count=100, fmt="cbor-seq", target_size=4096)
+    """
+
+    def __init__(self, model, seed=0, list_size=2):
+        self.model = model
+        self.seed = seed
+        self.list_size = list_size
+        self._rng = random.Random(seed)
+
+        # Identities by module, for identityref leaves (all identities as fallback)
+        self._identities = {}
+        self._all_identities = []
+        for sid, node in model.schema.nodes.items():
+            if node.kind == "identity":
+                self._identities.setdefault(node.module, []).append(node.identifier)
+                self._all_identities.append(node.identifier)
+
+        # Next key index of each list instance: {id(entries): index}
+        self._key_counters = {}
+
+    # Public API
+    # --------------------------------------------------------------------------
+
+    def config(self, target_size=None):
+        """
+        Generate one identifier-keyed config.
+
+        Args:
+            target_size: Approximate size of the encoded CBOR payload, in bytes.
+                         Entries are added to the outermost lists (round-robin)
+                         until it is reached, or until their key values run out.
+                         Default: list_size entries per list.
+
+        Returns:
+            Identifier-keyed dict, as accepted by encode().
+        """
+
+        self._key_counters = {}
+        config = self._container(self.model.schema.root)
+        if target_size is not None:
+            self._grow(config, target_size)
+        return config
+
+    def configs(self, count, target_size=None):
+        """Yield *count* configs, each generated from its own seed derived from the generator's."""
+        for i in range(count):
+            self._rng = random.Random(f"{self.seed}/{i}")
+            yield self.config(target_size)
+
+    def write(self, fp, count=1, fmt="cbor-seq", target_size=None):
+        """
+        Generate configs and write them to a file-like object, one at a time.
+
+        Args:
+            fp: File-like object (text for "json", binary otherwise).
+            count: Number of configs to write ("cbor" writes exactly one).
+            fmt: "json" (one RFC 7951 document per line), "cbor" (a single
+                 CORECONF payload) or "cbor-seq" (a CBOR sequence, RFC 8742).
+            target_size: Approximate encoded size of each config (see config()).
+
+        Returns:
+            Number of configs written.
+
+        Raises:
+            ValueError: If fmt is unknown, or count is not 1 for "cbor".
+        """
+
+        if fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {FORMATS}, not {fmt!r}")
+        if fmt == "cbor" and count != 1:
+            raise ValueError("'cbor' holds a single config; use 'cbor-seq' for several")
+
+        configs = self.configs(count, target_size)
+        if fmt == "json":
+            for config in configs:
+                fp.write(json.dumps(config))
+                fp.write("\n")
+        elif fmt == "cbor":
+            self.model.encode_stream(next(configs), fp)
+        else:
+            self.model.write_sequence(fp, configs)
+
+        _logger.debug("Wrote %d generated config(s) (format=%s)", count, fmt)
+
+        return count
+
+    # Tree generation
+    # --------------------------------------------------------------------------
+
+    def _container(self, node):
+        """Return the members of a container (or list entry) node."""
+        members = {}
+        for child in node.children.values():
+            name = _member_name(child)
+            if child.kind == "list":
+                entries = []
+                for _ in range(self.list_size):
+                    entry = self._entry(child, entries)
+                    if entry is None:
+                        break
+                    entries.append(entry)
+                members[name] = entries
+            elif child.kind == "leaf":
+                if _generated(child.type):
+                    members[name] = self._leaf(child)
+            else:
+                members[name] = self._container(child)
+        return members
+
+    def _entry(self, node, entries):
+        """Return a new entry of a list instance, or None if its key values are exhausted."""
+        index = self._key_counters.get(id(entries), 0)
+        self._key_counters[id(entries)] = index + 1
+
+        key_nodes = [self.model.schema.nodes[k_sid] for k_sid in node.key_sids]
+        key_values = self._key_values(key_nodes, index)
+        if key_values is None:
+            return None
+
+        entry = self._container(node)
+        for key_node, value in zip(key_nodes, key_values):
+            entry[_member_name(key_node)] = value
+        return entry
+
+    def _key_values(self, key_nodes, index):
+        """
+        Return the key values of the index-th entry of a list (None if out of range).
+
+        The index is spread over the keys in mixed radix, the first key with an
+        unbounded value set (e.g. a string) taking the most significant digit
+        (other unbounded keys keep their first value), so that every index maps
+        to a distinct key tuple.
+        """
+        domains = [self._key_domain(key_node) for key_node in key_nodes]
+        unbounded = next((i for i, domain in enumerate(domains) if domain is None), None)
+
+        digits = [0] * len(domains)
+        for i in reversed(range(len(domains))):
+            if domains[i] is None:
+                continue
+            digits[i] = index % len(domains[i])
+            index //= len(domains[i])
+
+        if unbounded is not None:
+            digits[unbounded] = index
+        elif index:
+            return None # all key tuples used
+
+        return [
+            domain[digit] if domain is not None else self._unbounded_key(key_node, digit)
+            for key_node, domain, digit in zip(key_nodes, domains, digits)
+        ]
+
+    def _key_domain(self, key_node):
+        """Return the sequence of possible values of a key leaf, or None if unbounded."""
+        dtype = key_node.type
+        if type(dtype) is list:
+            dtype = dtype[0] # union: values of the first member type
+        if type(dtype) is dict:
+            return list(dtype.values())
+        if dtype == "identityref":
+            return self._identities.get(key_node.module) or self._all_identities
+        if dtype == "boolean":
+            return [False, True]
+        if dtype in INTEGER_TYPES:
+            low, high = _INTEGER_RANGES[dtype]
+            if high - low < _MAX_MAGNITUDE:
+                return range(max(low, 0), high + 1)
+        return None
+
+    @staticmethod
+    def _unbounded_key(key_node, index):
+        dtype = key_node.type
+        if type(dtype) is list:
+            dtype = dtype[0]
+        if dtype in INTEGER_TYPES:
+            return max(_INTEGER_RANGES[dtype][0], 0) + index
+        if dtype == "decimal64":
+            return float(index)
+        return f"{key_node.name}-{index}"
+
+    def _leaf(self, node):
+        return self._value(node.type, node)
+
+    def _value(self, dtype, node):
+        """Return a random value of a YANG type, in identifier-tree (JSON) form."""
+        rng = self._rng
+        if type(dtype) is dict: # enumeration
+            return rng.choice(list(dtype.values()))
+        if type(dtype) is list: # union
+            members = [member for member in dtype if _generated(member)]
+            return self._value(rng.choice(members), node)
+
+        if dtype in INTEGER_TYPES:
+            low, high = _INTEGER_RANGES[dtype]
+            return rng.randint(max(low, -_MAX_MAGNITUDE), min(high, _MAX_MAGNITUDE))
+        if dtype == "decimal64":
+            return round(rng.uniform(-1000, 1000), 2)
+        if dtype == "boolean":
+            return rng.random() < 0.5
+        if dtype == "binary":
+            return base64.b64encode(bytes(rng.getrandbits(8) for _ in range(rng.randint(1, 16)))).decode()
+        if dtype == "identityref":
+            return rng.choice(self._identities.get(node.module) or self._all_identities)
+        if dtype == "bits":
+            return ""
+        if dtype == "yang:date-and-time":
+            return (f"20{rng.randint(0, 99):02d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                    f"T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}Z")
+        return f"{node.name}-{rng.randrange(10**6)}" # string and other string-based typedefs
+
+    # Size targeting
+    # --------------------------------------------------------------------------
+
+    def _grow(self, config, target_size):
+        """Add entries to the outermost lists of a config until its encoding reaches target_size."""
+        model = self.model
+        size = len(model.encode(config))
+
+        # Outermost list instances: (list node, entries, identifier path)
+        lists = []
+        stack = [(model.schema.root, config)]
+        while stack:
+            node, members = stack.pop()
+            for child in node.children.values():
+                value = members.get(_member_name(child))
+                if child.kind == "list" and value is not None:
+                    lists.append((child, value))
+                elif child.kind == "container" and type(value) is dict:
+                    stack.append((child, value))
+
+        while size < target_size and lists:
+            for item in list(lists):
+                node, entries = item
+                entry = self._entry(node, entries)
+                if entry is None:
+                    lists.remove(item) # key values exhausted
+                    continue
+                entries.append(entry)
+                sid_entry = model._identifier_to_sid_tree(entry, node.identifier + "/", node.sid)
+                size += len(cbor.dumps(sid_entry))
+                if size >= target_size:
+                    break
+
+        _logger.debug("Generated config of ~%d bytes (target=%d)", size, target_size)
+
+
+def _member_name(node):
+    """Return the identifier-tree member name of a node (module-qualified at the top and across modules)."""
+    return node.identifier.rpartition("/")[2]
+
+
+def _generated(dtype):
+    """Return True if leaves of this type are generated."""
+    if type(dtype) is list:
+        return any(_generated(member) for member in dtype)
+    return type(dtype) is dict or dtype not in UNHANDLED_TYPES
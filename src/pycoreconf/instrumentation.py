@@ -0,0 +1,202 @@
+# Optional per-operation counters and timings for models and datastores
+
+import functools
+import inspect
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Counters kept for every operation
+COUNTERS = ("calls", "errors", "seconds", "nodes", "leaves", "bytes_in", "bytes_out")
+
+# Number of models with instrumentation enabled; instrumented methods only
+# look their instrumentation up while it is non-zero (models dropped without
+# disable_instrumentation() keep it raised, which only costs the lookup)
+_enabled = 0
+_attach_lock = threading.Lock()
+
+
+class Instrumentation:
+    """
+    Call counts, wall time, tree sizes and payload sizes of public operations.
+
+    Attached to a model with CORECONFModel.enable_instrumentation(); the
+    model's operations (encode, decode) and those of its datastores (get, set,
+    delete, predicates, to_cbor, resolve_xpath on XPath cache misses) then
+    record one event per call. While no model has instrumentation attached,
+    an operation costs one flag check.
+
+    Per event, nodes and leaves count the dict/list nodes and leaf values of
+    the converted tree (the config for encode and set, the result for decode
+    and get). Counting walks the tree once more; pass count_nodes=False to skip it.
+
+    Callbacks are called after every event as callback(op, seconds, metrics),
+    with metrics = {"nodes", "leaves", "bytes_in", "bytes_out", "error"}, e.g. to
+    feed a Prometheus histogram or a StatsD timer. Exceptions raised by a
+    callback are logged and ignored.
+
+    Example:
+        - inst = ccm.enable_instrumentation()
+        - inst.add_callback(lambda op, seconds, metrics: histogram.labels(op).observe(seconds))
+        - inst.snapshot()["encode"]["calls"]
+    """
+
+    def __init__(self, count_nodes=True, callbacks=()):
+        self.count_nodes = count_nodes
+        self._callbacks = list(callbacks)
+        self._ops = {}  # {op: [calls, errors, seconds, nodes, leaves, bytes_in, bytes_out]}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        """Register callback(op, seconds, metrics), called after every recorded event."""
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def record(self, op, seconds, nodes=0, leaves=0, bytes_in=0, bytes_out=0, error=False):
+        """Record one call of an operation."""
+        with self._lock:
+            counters = self._ops.get(op)
+            if counters is None:
+                counters = self._ops[op] = [0, 0, 0.0, 0, 0, 0, 0]
+            counters[0] += 1
+            counters[1] += error
+            counters[2] += seconds
+            counters[3] += nodes
+            counters[4] += leaves
+            counters[5] += bytes_in
+            counters[6] += bytes_out
+
+        if self._callbacks:
+            metrics = {"nodes": nodes, "leaves": leaves, "bytes_in": bytes_in,
+                       "bytes_out": bytes_out, "error": error}
+            for callback in list(self._callbacks):
+                try:
+                    callback(op, seconds, metrics)
+                except Exception:
+                    _logger.exception("Instrumentation callback failed (op=%s)", op)
+
+    def snapshot(self):
+        """
+        Return the counters recorded so far.
+
+        Returns:
+            {op: {"calls", "errors", "seconds", "nodes", "leaves", "bytes_in", "bytes_out"}}
+        """
+        with self._lock:
+            return {op: dict(zip(COUNTERS, counters)) for op, counters in self._ops.items()}
+
+    def reset(self):
+        """Clear the recorded counters (callbacks are kept)."""
+        with self._lock:
+            self._ops.clear()
+
+
+def attach(model, inst):
+    """Set (or, with inst=None, clear) the instrumentation of a model."""
+    global _enabled
+    with _attach_lock:
+        if model.__dict__.get("instrumentation") is not None:
+            _enabled -= 1
+        if inst is not None:
+            _enabled += 1
+        model.instrumentation = inst
+
+
+def count_tree(value):
+    """Return (nodes, leaves) of a tree: dict/list nodes, and other values."""
+    nodes = leaves = 0
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if type(value) is dict:
+            nodes += 1
+            stack.extend(value.values())
+        elif type(value) is list:
+            nodes += 1
+            stack.extend(value)
+        else:
+            leaves += 1
+    return nodes, leaves
+
+
+def instrumented(op, measure=None):
+    """
+    Decorate a model or datastore method to record its calls as *op*.
+
+    The instrumentation is looked up as self.instrumentation (None when
+    disabled), and only while some model has instrumentation enabled (see
+    attach()).
+
+    Args:
+        op: Operation name used in snapshots and callbacks.
+        measure: Optional measure(instrumentation, arguments, result) returning
+                 (nodes, leaves, bytes_in, bytes_out) of a successful call,
+                 arguments being the call's arguments by parameter name
+                 (positional and keyword calls alike).
+    """
+
+    def decorate(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not _enabled:
+                return method(self, *args, **kwargs)
+            inst = self.instrumentation
+            if inst is None:
+                return method(self, *args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception:
+                inst.record(op, time.perf_counter() - start, error=True)
+                raise
+            seconds = time.perf_counter() - start
+
+            if measure is not None:
+                arguments = signature.bind(self, *args, **kwargs).arguments
+                inst.record(op, seconds, *measure(inst, arguments, result))
+            else:
+                inst.record(op, seconds)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+# Measures of the instrumented operations
+# ------------------------------------------------------------------------------
+
+def _counts(inst, tree):
+    return count_tree(tree) if inst.count_nodes and tree is not None else (0, 0)
+
+
+def measure_encode(inst, arguments, result):
+    return (*_counts(inst, arguments["config"]), 0, len(result))
+
+
+def measure_decode(inst, arguments, result):
+    return (*_counts(inst, result), len(arguments["data"]), 0)
+
+
+def measure_get(inst, arguments, result):
+    return (*_counts(inst, result), 0, 0)
+
+
+def measure_set(inst, arguments, result):
+    return (*_counts(inst, arguments["value"]), 0, 0)
+
+
+def measure_predicates(inst, arguments, result):
+    # One node per list entry found
+    return (len(result) if result else 0, 0, 0, 0)
+
+
+def measure_to_cbor(inst, arguments, result):
+    return (0, 0, 0, len(result))
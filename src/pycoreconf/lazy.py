@@ -0,0 +1,282 @@
+# Lazy views over CORECONF (CBOR) payloads
+
+import collections.abc
+import io
+import cbor2 as cbor
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# CBOR major types
+_MAJOR_UINT = 0
+_MAJOR_NEGINT = 1
+_MAJOR_ARRAY = 4
+_MAJOR_MAP = 5
+
+_BREAK = 0xff
+
+
+def _read_head(buf, pos):
+    """
+    Read the head of the CBOR data item starting at *pos*.
+
+    Returns:
+        Tuple of (major_type, argument, position after the head); argument is
+        None for indefinite lengths.
+
+    Raises:
+        CBORDecodeError: On a truncated or malformed head.
+    """
+
+    try:
+        initial = buf[pos]
+        major = initial >> 5
+        info = initial & 0x1f
+        pos += 1
+
+        if info < 24:
+            return major, info, pos
+        if info == 24:
+            return major, buf[pos], pos + 1
+        if info in (25, 26, 27):
+            size = 1 << (info - 24)
+            if pos + size > len(buf):
+                raise IndexError
+            return major, int.from_bytes(buf[pos:pos + size], "big"), pos + size
+        if info == 31:
+            return major, None, pos
+    except IndexError:
+        raise cbor.CBORDecodeEOF(f"Premature end of CBOR data at offset {pos}") from None
+
+    raise cbor.CBORDecodeError(f"Invalid CBOR additional information {info} at offset {pos - 1}")
+
+
+class _Payload:
+    """
+    CBOR payload shared by all the views created over it.
+
+    Container heads and map keys are read from the buffer directly; data items
+    are decoded (or skipped) at a given offset with the cbor2 decoder.
+    """
+
+    __slots__ = ("model", "buf", "native", "_fp", "_decoder")
+
+    def __init__(self, model, data, use_native_types=True):
+        self.model = model
+        self.buf = data
+        self.native = use_native_types
+        self._fp = io.BytesIO(data) # shares (does not copy) bytes input
+        self._decoder = cbor.CBORDecoder(self._fp)
+
+    def decode_at(self, pos):
+        """Decode the data item at *pos*; return (value, offset past the item)."""
+        self._fp.seek(pos)
+        value = self._decoder.decode()
+        return value, self._fp.tell()
+
+    def skip(self, pos):
+        """Return the offset just past the data item at *pos*."""
+        return self.decode_at(pos)[1]
+
+    def view(self, pos, sid, path):
+        """Return a lazy view for a container/list item, or the converted value of a leaf."""
+        major = self.buf[pos] >> 5
+        if major == _MAJOR_MAP:
+            return LazyMap(self, pos, sid, path)
+        if major == _MAJOR_ARRAY:
+            return LazyList(self, pos, sid, path)
+
+        leaf, _ = self.decode_at(pos)
+        return self.model._decode_leaf(sid, leaf, self.native)
+
+
+class _LazyContainer:
+    """
+    Incremental scanner over the elements of a CBOR array or map.
+
+    Elements are indexed only as far as needed to answer an access; a map value
+    is skipped only when scanning past it.
+    """
+
+    __slots__ = ()
+
+    _major = None
+
+    def _open(self):
+        major, count, pos = _read_head(self._payload.buf, self._start)
+        if major != self._major:
+            raise cbor.CBORDecodeError(
+                f"Expected CBOR major type {self._major} at offset {self._start}, got {major}"
+            )
+        self._left = count      # elements left to index (None: indefinite length)
+        self._next = pos        # offset of the next element
+        self._pending = False   # True if self._next is a data item still to be skipped
+
+    def _advance(self):
+        """Return the offset of the next element, or None once all elements are indexed."""
+        if self._pending:
+            self._next = self._payload.skip(self._next)
+            self._pending = False
+
+        if self._left is None:
+            if self._payload.buf[self._next] == _BREAK:
+                self._left = 0
+                return None
+        elif self._left == 0:
+            return None
+        else:
+            self._left -= 1
+
+        return self._next
+
+    def materialize(self):
+        """Decode and convert the whole subtree into plain dicts/lists."""
+        data, _ = self._payload.decode_at(self._start)
+        return self._payload.model._sid_to_identifier_tree(
+            data, sid_delta=self._sid, path=self._path, use_native_types=self._payload.native
+        )
+
+
+class LazyMap(_LazyContainer, collections.abc.Mapping):
+    """
+    Read-only identifier-keyed view over a CBOR map of a CORECONF payload.
+
+    Map entries are indexed on first access; only the subtrees and leaves that
+    are accessed are decoded and converted.
+
+    Example:
+        - view = ccm.decode_lazy(cbor_data)
+        - view["ietf-schc:schc"]["rule"][0]["rule-id-value"]
+        - view.materialize()  # full identifier-keyed dict
+    """
+
+    __slots__ = ("_payload", "_start", "_sid", "_path", "_index", "_cache",
+                 "_left", "_next", "_pending")
+
+    _major = _MAJOR_MAP
+
+    def __init__(self, payload, start=0, sid=0, path="/"):
+        self._payload = payload
+        self._start = start
+        self._sid = sid
+        self._path = path
+        self._index = None # {name: (sid, identifier, value offset)}
+        self._cache = {}
+
+    def _scan(self, name=None):
+        """Index map entries until *name* is found (or all entries if None)."""
+        if self._index is None:
+            self._index = {}
+            self._open()
+
+        index = self._index
+        buf = self._payload.buf
+        ids = self._payload.model.ids
+
+        while name is None or name not in index:
+            pos = self._advance()
+            if pos is None:
+                break
+
+            key_major, delta, value_pos = _read_head(buf, pos)
+            if key_major == _MAJOR_NEGINT:
+                delta = -1 - delta
+            elif key_major != _MAJOR_UINT:
+                raise cbor.CBORDecodeError(f"Expected a delta-SID map key at offset {pos}")
+
+            sid = delta + self._sid
+            identifier = ids[sid]
+            index[identifier[len(self._path):].lstrip("/")] = (sid, identifier, value_pos)
+
+            self._next = value_pos
+            self._pending = True
+
+        return index
+
+    def __getitem__(self, name):
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+        sid, identifier, pos = self._scan(name)[name]
+        value = self._payload.view(pos, sid, identifier)
+        self._cache[name] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._scan())
+
+    def __len__(self):
+        return len(self._scan())
+
+    def __contains__(self, name):
+        return name in self._scan(name)
+
+    def __repr__(self):
+        return f"<LazyMap {self._path!r} at offset {self._start}>"
+
+
+class LazyList(_LazyContainer, collections.abc.Sequence):
+    """
+    Read-only view over a CBOR array (YANG list or leaf-list) of a CORECONF payload.
+
+    Element offsets are indexed as far as needed; elements are decoded on access.
+    """
+
+    __slots__ = ("_payload", "_start", "_sid", "_path", "_index", "_cache",
+                 "_left", "_next", "_pending")
+
+    _major = _MAJOR_ARRAY
+
+    def __init__(self, payload, start, sid, path):
+        self._payload = payload
+        self._start = start
+        self._sid = sid
+        self._path = path
+        self._index = None # [element offset]
+        self._cache = {}
+
+    def _scan(self, count=None):
+        """Index array elements until *count* are known (or all elements if None)."""
+        if self._index is None:
+            self._index = []
+            self._open()
+
+        index = self._index
+        while count is None or len(index) < count:
+            pos = self._advance()
+            if pos is None:
+                break
+            index.append(pos)
+            self._pending = True
+
+        return index
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        index = self._scan() if i < 0 else self._scan(i + 1)
+        if i < 0:
+            i += len(index)
+        if not 0 <= i < len(index):
+            raise IndexError("list index out of range")
+
+        try:
+            return self._cache[i]
+        except KeyError:
+            pass
+        value = self._payload.view(index[i], self._sid, self._path)
+        self._cache[i] = value
+        return value
+
+    def __len__(self):
+        return len(self._scan())
+
+    def __eq__(self, other):
+        if not isinstance(other, collections.abc.Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"<LazyList {self._path!r} at offset {self._start}>"
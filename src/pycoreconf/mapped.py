@@ -0,0 +1,166 @@
+# Copy-on-write SID trees backed by a (memory-mapped) CBOR buffer
+
+import io
+import mmap
+import cbor2 as cbor
+import logging
+
+from .lazy import _read_head, _MAJOR_UINT, _MAJOR_NEGINT, _MAJOR_ARRAY, _MAJOR_MAP, _BREAK
+
+_MAJOR_TEXT = 3
+
+_logger = logging.getLogger(__name__)
+
+
+class _MappedBuffer:
+    """CBOR buffer (mmap or bytes) shared by all the nodes mapped from it."""
+
+    __slots__ = ("buf", "_fp", "_decoder")
+
+    def __init__(self, buf):
+        self.buf = buf
+        self._fp = buf if isinstance(buf, mmap.mmap) else io.BytesIO(buf)
+        self._decoder = cbor.CBORDecoder(self._fp)
+
+    def decode_at(self, pos):
+        """Decode the data item at *pos*; return (value, offset past the item)."""
+        self._fp.seek(pos)
+        value = self._decoder.decode()
+        return value, self._fp.tell()
+
+
+class MappedNode:
+    """
+    Unresolved container (map or array) of a SID tree, left in the CBOR buffer.
+
+    Nodes are resolved one level at a time (see resolve()) when the datastore
+    walks through them; untouched subtrees are never decoded into Python objects
+    and are copied back verbatim by to_cbor().
+    """
+
+    __slots__ = ("source", "start", "end")
+
+    def __init__(self, source, start, end):
+        self.source = source
+        self.start = start
+        self.end = end
+
+    def raw(self):
+        """Return the encoded bytes of the subtree."""
+        return self.source.buf[self.start:self.end]
+
+    def decode(self):
+        """Decode the whole subtree into plain dicts/lists."""
+        return self.source.decode_at(self.start)[0]
+
+    def resolve(self):
+        """
+        Decode one level of the subtree.
+
+        Returns:
+            dict (map) or list (array) whose leaves are decoded and whose nested
+            containers are MappedNode objects. Array elements that are maps (list
+            entries) are resolved as well, so that their key leaves are available.
+        """
+        return _resolve(self.source, self.start, self.end)[0]
+
+    def __repr__(self):
+        return f"<MappedNode bytes {self.start}-{self.end}>"
+
+
+def _resolve(source, start, end=None):
+    """
+    Decode one level of the container at *start* (see MappedNode.resolve()).
+
+    Args:
+        end: End offset of the container, if known.
+
+    Returns:
+        Tuple of (dict or list, end offset).
+    """
+
+    buf = source.buf
+    major, count, pos = _read_head(buf, start)
+    if major != _MAJOR_MAP and major != _MAJOR_ARRAY:
+        raise cbor.CBORDecodeError(f"Expected a CBOR map or array at offset {start}")
+
+    result = {} if major == _MAJOR_MAP else []
+    n = 0
+    while (buf[pos] != _BREAK) if count is None else (n < count):
+        n += 1
+        # The last item of a definite-length container ends with it
+        item_end = end if n == count else None
+
+        if major == _MAJOR_MAP:
+            key, pos = _read_item(source, pos)
+            result[key], pos = _read_item(source, pos, item_end)
+        elif buf[pos] >> 5 == _MAJOR_MAP:
+            value, pos = _resolve(source, pos, item_end)
+            result.append(value)
+        else:
+            value, pos = _read_item(source, pos, item_end)
+            result.append(value)
+
+    if count is None:
+        pos += 1 # break marker
+
+    return result, pos
+
+
+def _read_item(source, pos, end=None):
+    """
+    Return (leaf value or MappedNode, end offset) for the data item at *pos*.
+
+    Args:
+        end: End offset of the item, if known (saves skipping over a container).
+    """
+
+    buf = source.buf
+    major, arg, head_end = _read_head(buf, pos)
+
+    # Integers (map keys, most leaves) and text strings are read without the decoder
+    if major == _MAJOR_UINT:
+        return arg, head_end
+    if major == _MAJOR_NEGINT:
+        return -1 - arg, head_end
+    if major == _MAJOR_TEXT and arg is not None:
+        item_end = head_end + arg
+        return str(buf[head_end:item_end], "utf-8"), item_end
+
+    if major == _MAJOR_MAP or major == _MAJOR_ARRAY:
+        if end is None:
+            end = source.decode_at(pos)[1]
+        return MappedNode(source, pos, end), end
+
+    return source.decode_at(pos)
+
+
+def map_tree(buf):
+    """
+    Return the top level of a SID tree mapped from a CBOR buffer.
+
+    Args:
+        buf: mmap.mmap or bytes holding one CBOR map.
+
+    Returns:
+        dict whose nested containers are MappedNode objects.
+    """
+    return _resolve(_MappedBuffer(buf), 0, len(buf))[0]
+
+
+def plain(value):
+    """Return value with every MappedNode replaced by its decoded subtree."""
+    if type(value) is MappedNode:
+        return value.decode()
+    if type(value) is dict:
+        return {k: plain(v) for k, v in value.items()}
+    if type(value) is list:
+        return [plain(v) for v in value]
+    return value
+
+
+def encode_mapped(encoder, value):
+    """cbor2 default hook: copy the encoded bytes of unresolved nodes verbatim."""
+    if type(value) is not MappedNode:
+        raise cbor.CBOREncodeTypeError(f"Cannot serialize type {type(value).__name__}")
+    encoder.write(value.raw())
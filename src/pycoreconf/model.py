@@ -2,8 +2,20 @@
 
 from .sid import ModelSID
 from .datastore import CORECONFDatastore
+from .converters import TypeWarnings, compile_encoder, compile_decoder
+from . import converters
+from .lazy import LazyMap, _Payload
+from .projection import Projection
+from .mapped import map_tree
+from .batch import make_pool, run_batch
+from .validation import ConfigValidationError, Validator, format_issues
+from .instrumentation import Instrumentation, attach, instrumented, measure_encode, measure_decode
+from . import sequence
+from collections import OrderedDict
 import json
-import base64
+import mmap as _mmap
+import os
+import threading
 import cbor2 as cbor
 import logging
 import warnings
@@ -11,37 +23,15 @@ import warnings
 _logger = logging.getLogger(__name__)
 
 
-class ConfigValidationError(Exception):
-    """Raised when config validation fails; wraps the original exception."""
-    pass
-
-
-class _ValueWrapper:
-    """Wrapper class to encapsulate objects through the SID tree iteration."""
-
-    def __init__(self, value):
-        self.value = value
-
-def _unwrap_values(obj):
-    """Unwrap ValueWrapper objects after iterative SID tree transformation."""
-
-    internal_stack = [obj]
-
-    while internal_stack:
-        current_object = internal_stack.pop()
-
-        if type(current_object) == dict:
-            keys = list(current_object.keys())
-            for key in keys:
-                current_object[key] = current_object[key].value
-                internal_stack.append(current_object[key])
-        
-        elif type(current_object) == list:
-            for i in range(len(current_object)):
-                current_object[i] = current_object[i].value
-                internal_stack.append(current_object[i])
-
-    return obj
+def _mtimes(paths):
+    """Return ((path, modification time or None), ...) for file paths."""
+    stamps = []
+    for path in paths:
+        try:
+            stamps.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            stamps.append((path, None))
+    return tuple(stamps)
 
 
 class CORECONFModel(ModelSID):
@@ -51,26 +41,147 @@ class CORECONFModel(ModelSID):
     Args:
         sid_files: Path or list of paths to .sid files (generated with --sid-extension).
         model_description_file: Path to YANG model description JSON (required for validation).
+        cache_dir: Directory for compiled model snapshots, reused across processes
+            (default: $PYCORECONF_CACHE_DIR if set, otherwise no snapshot cache).
 
     Example:
         - ccm = CORECONFModel(sid_files=["module-1.sid", "module-2.sid"])
         - ccm = CORECONFModel("module.sid", model_description_file="description.json")
+        - ccm = CORECONFModel.get(["module-1.sid", "module-2.sid"])  # shared instance
     """
 
+    # Shared model registry: {(sid_files, model_description_file): CORECONFModel}
+    _registry = {}
+    _registry_lock = threading.Lock()
+    _registry_stats = {"hits": 0, "reused_bytes": 0, "interned_bytes": 0}
+
+    # Batches smaller than this are converted in-process by encode_many()/decode_many()
+    batch_parallel_threshold = 512
+
+    # Counters and timings of the model's operations, None when disabled (see enable_instrumentation())
+    instrumentation = None
+
     def __init__(self, 
                  sid_files: list[str] | str, 
-                 model_description_file: str = None):
+                 model_description_file: str = None,
+                 cache_dir: str = None):
         
         self.model_description_file = model_description_file
         self.yang_ietf_modules_paths = ["."]
         # Handle both single string and list of strings
         if isinstance(sid_files, str):
             sid_files = [sid_files]
-        super().__init__(sid_files)
+        super().__init__(sid_files, cache_dir=cache_dir)
+
+        # Warnings about leaf values kept as-is, logged once per SID by the converters
+        self.type_warnings = TypeWarnings()
+
+        # Per-SID leaf converters: {sid: callable}
+        self._encoders, self._decoders, self._json_decoders = self._compile_converters()
+
+        # Compiled projections: {tuple_of_xpaths: Projection}
+        self._projections = OrderedDict()
+
+        # Native validator, compiled on first use (see validate())
+        self._validator = None
+
+        # Parsed yangson DataModel and the (path, mtime) of its source files (see _get_data_model())
+        self._data_model = None
+        self._data_model_files = ()
+        self._data_model_lock = threading.Lock()
+
+        # Set on models handed out by CORECONFModel.get()
+        self._shared = False
+        self._table_bytes = 0
+
+    # Shared Models
+    # --------------------------------------------------------------------------
+
+    @classmethod
+    def get(cls,
+            sid_files: list[str] | str,
+            model_description_file: str = None,
+            cache_dir: str = None) -> "CORECONFModel":
+        """
+        Return the process-wide shared model for a list of SID files.
+
+        Models are created once per unique (ordered) list of SID files and
+        description file, with identifier strings and type descriptors interned
+        across all shared models. Shared models must be treated as read-only:
+        they are used concurrently by every caller.
+
+        Args:
+            sid_files: Path or list of paths to .sid files.
+            model_description_file: Path to YANG model description JSON.
+            cache_dir: Directory for compiled model snapshots (see CORECONFModel).
+
+        Returns:
+            Shared CORECONFModel instance.
+
+        Example:
+            - ccm = CORECONFModel.get(["module-1.sid", "module-2.sid"])
+        """
+
+        if isinstance(sid_files, str):
+            sid_files = [sid_files]
+        key = (
+            tuple(os.path.abspath(f) for f in sid_files),
+            os.path.abspath(model_description_file) if model_description_file else None,
+        )
+
+        with cls._registry_lock:
+            model = cls._registry.get(key)
+            if model is not None:
+                cls._registry_stats["hits"] += 1
+                cls._registry_stats["reused_bytes"] += model._table_bytes
+                return model
+
+            model = cls(list(key[0]), model_description_file, cache_dir=cache_dir)
+            model._table_bytes = model._table_size()
+            cls._registry_stats["interned_bytes"] += model._intern_tables()
+            model._shared = True
+            cls._registry[key] = model
+
+        _logger.info("Registered shared model for %d SID file(s)", len(sid_files))
+
+        return model
+
+    def _intern_tables(self) -> int:
+        """Intern the SID tables (see ModelSID._intern_tables()) and recompile the converters against them."""
+        saved = super()._intern_tables()
+
+        # The converters hold the tables they were compiled from (identityref
+        # lookups, enumerations): recompile them so that the old tables are released
+        self._encoders, self._decoders, self._json_decoders = self._compile_converters()
+        self._validator = None
+
+        return saved
+
+    @classmethod
+    def shared_stats(cls) -> dict:
+        """
+        Report on the shared model registry.
+
+        Returns:
+            Dictionary with:
+                - models: number of shared models
+                - hits: number of get() calls served by an existing model
+                - reused_bytes: SID table bytes not duplicated thanks to those hits
+                - interned_bytes: bytes released by interning across models
+                - saved_bytes: total approximate memory saved (reused + interned)
+        """
+
+        with cls._registry_lock:
+            stats = dict(cls._registry_stats)
+            stats["models"] = len(cls._registry)
+
+        stats["saved_bytes"] = stats["reused_bytes"] + stats["interned_bytes"]
+        return stats
 
     # Core API - Encoding
     # --------------------------------------------------------------------------
 
+    @instrumented("encode", measure_encode)
     def encode(self, config: dict) -> bytes:
         """
         Encode a Python dictionary config to CORECONF (CBOR).
@@ -87,11 +198,8 @@ class CORECONFModel(ModelSID):
 
         _logger.debug("Encoding config (keys=%d)", len(config))
 
-        # "deepcopy" to not modify the input
-        config_cpy = json.loads(json.dumps(config))
-
-        # Transform to CORECONF
-        sid_tree = self._identifier_to_sid_tree(config_cpy)
+        # Transform to CORECONF (the input is not modified)
+        sid_tree = self._identifier_to_sid_tree(config)
         cbor_data = cbor.dumps(sid_tree)
 
         _logger.debug("Encoding complete (bytes=%d)", len(cbor_data))
@@ -116,10 +224,117 @@ class CORECONFModel(ModelSID):
 
         return self.encode(config)
 
+    def encode_stream(self, config: dict, fp) -> None:
+        """
+        Encode a Python dictionary config to CORECONF (CBOR), writing to a file-like object.
+
+        Delta-SID map keys and converted leaves are written as the config is walked,
+        without building the intermediate SID-keyed tree. The output is identical to
+        encode().
+
+        Args:
+            config: Python dictionary with YANG identifier keys.
+            fp: Binary file-like object with a write() method (file, BytesIO, socket.makefile()).
+
+        Example:
+            - with open("config.cbor", "wb") as f:
+                  ccm.encode_stream(config, f)
+        """
+
+        _logger.debug("Streaming encode of config (keys=%d)", len(config))
+
+        encoder = cbor.CBOREncoder(fp)
+        sids = self.sids
+        encoders = self._encoders
+
+        # Each stack entry: (value, path, parent SID, delta-SID map key or None)
+        stack = [(config, "/", 0, None)]
+
+        while stack:
+            current_value, current_path, current_parent, key = stack.pop()
+
+            if key is not None:
+                encoder.encode_int(key)
+
+            if type(current_value) is dict:
+                encoder.encode_length(5, len(current_value)) # map
+                children = []
+                for child_key, child in current_value.items():
+                    qualified_path = current_path + child_key
+                    child_sid_value = sids[qualified_path]
+                    children.append((child, qualified_path + "/", child_sid_value, child_sid_value - current_parent))
+                stack.extend(reversed(children))
+
+            elif type(current_value) is list:
+                encoder.encode_length(4, len(current_value)) # array
+                stack.extend((child, current_path, current_parent, None) for child in reversed(current_value))
+
+            else:
+                encoder.encode(encoders[current_parent](current_value))
+
+    def encode_many(self,
+                    configs,
+                    workers: int = None,
+                    chunksize: int = None,
+                    errors: str = "raise",
+                    pool=None) -> list:
+        """
+        Encode a batch of Python dictionary configs to CORECONF (CBOR).
+
+        Batches smaller than batch_parallel_threshold are encoded in-process;
+        larger ones are split into chunks and encoded by a pool of worker
+        processes, each loading the model once. Results keep the input order.
+
+        Args:
+            configs: Iterable of Python dictionaries with YANG identifier keys.
+            workers: Number of worker processes (default: CPU count; 1 disables the pool).
+            chunksize: Configs per pool task (default: about four chunks per worker).
+            errors: "raise" (default) to raise on the first failed config, or
+                    "capture" to return a BatchItemError in place of its result.
+            pool: Optional pool from process_pool(), reused across calls (always used if given).
+
+        Returns:
+            List of CBOR-encoded bytes, in input order.
+
+        Raises:
+            BatchItemError: If a config fails to encode and errors="raise".
+
+        Example:
+            - payloads = ccm.encode_many(configs)
+            - with ccm.process_pool() as pool:
+                  payloads = ccm.encode_many(configs, pool=pool, errors="capture")
+        """
+
+        return run_batch(self, "encode", configs, {}, workers, chunksize, errors, pool)
+
+    def write_sequence(self, fp, configs) -> list:
+        """
+        Encode configs to a CBOR sequence (RFC 8742), writing each one as it is encoded.
+
+        Configs are consumed one at a time from the iterable (e.g. a generator),
+        so only one encoded payload is held in memory at a time.
+
+        Args:
+            fp: Binary file-like object with a write() method.
+            configs: Iterable of Python dictionaries with YANG identifier keys.
+
+        Returns:
+            List of (offset, size) of the written payloads, usable to resume
+            reading with iter_decode(fp, offset=...); offsets start at fp.tell()
+            for seekable streams, 0 otherwise.
+
+        Example:
+            - with open("configs.cborseq", "wb") as f:
+                  index = ccm.write_sequence(f, configs)
+        """
+
+        return sequence.write_sequence(fp, (self.encode(config) for config in configs))
+
     # Core API - Decoding
     # --------------------------------------------------------------------------
 
-    def decode(self, data: bytes, as_rfc7951: bool = False) -> dict:
+    @instrumented("decode", measure_decode)
+    def decode(self, data: bytes, as_rfc7951: bool = False, select: list[str] = None) -> dict:
         """
         Decode CORECONF (CBOR) data to a Python dictionary.
 
@@ -127,6 +342,8 @@ class CORECONFModel(ModelSID):
             data: CBOR-encoded bytes.
             as_rfc7951: If False (default), returns Python native types (int, float, bool).
                         If True, returns RFC 7951-compliant types (e.g., int64 as string).
+            select: Optional XPath or list of XPaths; only the matching subtrees
+                    (with the keys of their enclosing list entries) are decoded.
 
         Returns:
             Python dictionary with YANG identifier keys.
@@ -134,17 +351,129 @@ class CORECONFModel(ModelSID):
         Example:
             - cfg = ccm.decode(cbor_data)                   # native types
             - cfg = ccm.decode(cbor_data, as_rfc7951=True)  # RFC 7951-compliant
+            - cfg = ccm.decode(cbor_data, select=["/schc/rule[rule-id-value='5'][rule-id-length='3']"])
         """
 
         _logger.debug("Decoding CBOR data (bytes=%d)", len(data))
 
         data = cbor.loads(data)
+        if select is not None:
+            data = self._get_projection(select).apply(data)
         config = self._sid_to_identifier_tree(data, use_native_types=(not as_rfc7951))
 
         _logger.debug("Decoding complete (as_rfc7951=%s, keys=%d)", as_rfc7951, len(config))
 
         return config
 
+    def decode_lazy(self, data: bytes, as_rfc7951: bool = False) -> LazyMap:
+        """
+        Return a lazy, read-only identifier-keyed view over CORECONF (CBOR) data.
+
+        The payload is not parsed upfront: maps and arrays are indexed on first
+        access, and only the accessed subtrees and leaves are decoded and converted.
+        Use .materialize() on the view (or any of its subtrees) to get plain dicts.
+
+        Args:
+            data: CBOR-encoded bytes (shared with the view, not copied), bytearray or memoryview.
+            as_rfc7951: If True, leaves are converted to RFC 7951-compliant types.
+
+        Returns:
+            LazyMap over the top-level CORECONF map.
+
+        Example:
+            - view = ccm.decode_lazy(cbor_data)
+            - msg = view["example-1:greeting"]["message"]
+        """
+
+        _logger.debug("Creating lazy view over CBOR data (bytes=%d)", len(data))
+
+        return LazyMap(_Payload(self, data, use_native_types=(not as_rfc7951)))
+
+    def decode_many(self,
+                    payloads,
+                    as_rfc7951: bool = False,
+                    select: list[str] = None,
+                    workers: int = None,
+                    chunksize: int = None,
+                    errors: str = "raise",
+                    pool=None) -> list:
+        """
+        Decode a batch of CORECONF (CBOR) payloads to Python dictionaries.
+
+        Same batching and error handling as encode_many().
+
+        Args:
+            payloads: Iterable of CBOR-encoded bytes.
+            as_rfc7951: If True, returns RFC 7951-compliant types (see decode()).
+            select: Optional XPath or list of XPaths to decode (see decode()).
+            workers: Number of worker processes (default: CPU count; 1 disables the pool).
+            chunksize: Payloads per pool task (default: about four chunks per worker).
+            errors: "raise" (default) or "capture" (see encode_many()).
+            pool: Optional pool from process_pool(), reused across calls.
+
+        Returns:
+            List of Python dictionaries, in input order.
+
+        Raises:
+            BatchItemError: If a payload fails to decode and errors="raise".
+
+        Example:
+            - configs = ccm.decode_many(payloads, errors="capture")
+        """
+
+        kwargs = {"as_rfc7951": as_rfc7951, "select": select}
+
+        return run_batch(self, "decode", payloads, kwargs, workers, chunksize, errors, pool)
+
+    def iter_decode(self,
+                    source,
+                    as_rfc7951: bool = False,
+                    select: list[str] = None,
+                    as_datastore: bool = False,
+                    with_offsets: bool = False,
+                    offset: int = None):
+        """
+        Decode a CBOR sequence (RFC 8742) of CORECONF payloads incrementally.
+
+        Payloads are read from the source one at a time, so memory use is bounded
+        by the largest payload rather than the whole sequence.
+
+        Args:
+            source: Binary file-like object (file, pipe, mmap) or bytes.
+            as_rfc7951: If True, returns RFC 7951-compliant types (see decode()).
+            select: Optional XPath or list of XPaths to decode (see decode()).
+            as_datastore: If True, yields CORECONFDatastore objects instead of dicts.
+            with_offsets: If True, yields SequenceItem(offset, size, value) tuples.
+            offset: Optional stream position to resume reading at (seekable sources only).
+
+        Yields:
+            Identifier-keyed dicts (or datastores), optionally wrapped in SequenceItem.
+            Offsets are stream positions for seekable sources; resume after an
+            item with offset=item.offset + item.size.
+
+        Raises:
+            CBORDecodeError: If a payload is malformed or the sequence is truncated.
+
+        Example:
+            - with open("configs.cborseq", "rb") as f:
+                  for config in ccm.iter_decode(f):
+                      ...
+        """
+
+        projection = self._get_projection(select) if select is not None else None
+
+        for item in sequence.read_sequence(source, offset):
+            data = item.value
+            if projection is not None:
+                data = projection.apply(data)
+
+            if as_datastore:
+                value = CORECONFDatastore(self, data)
+            else:
+                value = self._sid_to_identifier_tree(data, use_native_types=(not as_rfc7951))
+
+            yield item._replace(value=value) if with_offsets else value
+
     def decode_to_json(self, data: bytes) -> str:
         """
         Decode CORECONF (CBOR) data to a JSON string (RFC 7951-compliant).
@@ -164,6 +493,61 @@ class CORECONFModel(ModelSID):
         # Return JSON-formatted string
         return json.dumps(config)
 
+    def process_pool(self, workers: int = None):
+        """
+        Create a process pool for encode_many()/decode_many().
+
+        Each worker process builds its own copy of the model once, at startup
+        (from the snapshot cache when cache_dir is set). Reuse the pool across
+        batches to avoid paying that cost per call; shut it down when done.
+
+        Args:
+            workers: Number of worker processes (default: CPU count).
+
+        Returns:
+            concurrent.futures.ProcessPoolExecutor
+
+        Example:
+            - with ccm.process_pool(4) as pool:
+                  payloads = ccm.encode_many(configs, pool=pool)
+        """
+
+        return make_pool(self, workers)
+
+    # Instrumentation
+    # --------------------------------------------------------------------------
+
+    def enable_instrumentation(self, count_nodes: bool = True, callbacks=()) -> Instrumentation:
+        """
+        Record calls, wall time, tree and payload sizes of the model's operations.
+
+        Covers encode() and decode() (and the batch/stream methods built on
+        them; items converted in worker processes are not recorded) and the
+        get, set, delete, predicates and to_cbor operations of the model's
+        datastores. When disabled (the default), an operation costs one flag
+        check.
+
+        Args:
+            count_nodes: Count the nodes and leaves of converted trees (one extra walk per call).
+            callbacks: Callables called as callback(op, seconds, metrics) after every operation.
+
+        Returns:
+            Instrumentation, also available as ccm.instrumentation.
+
+        Example:
+            - inst = ccm.enable_instrumentation()
+            - ccm.encode(config)
+            - inst.snapshot()["encode"]  # {"calls": 1, "seconds": ..., "bytes_out": ..., ...}
+        """
+
+        inst = Instrumentation(count_nodes, callbacks)
+        attach(self, inst)
+        return inst
+
+    def disable_instrumentation(self):
+        """Stop recording operations (see enable_instrumentation())."""
+        attach(self, None)
+
     # Datastores
     # --------------------------------------------------------------------------
 
@@ -187,19 +571,19 @@ class CORECONFModel(ModelSID):
         if data is None:
             data = {}
 
-        # "deepcopy" to not modify the input
-        data_cpy = json.loads(json.dumps(data))
-
-        sid_tree = self._identifier_to_sid_tree(data_cpy)
+        # Build a new SID tree (the input is not modified)
+        sid_tree = self._identifier_to_sid_tree(data)
 
         return CORECONFDatastore(self, sid_tree)
 
-    def create_datastore_from_cbor(self, cbor_data: bytes):
+    def create_datastore_from_cbor(self, cbor_data: bytes, select: list[str] = None):
         """
         Load CBOR data into a high-level datastore interface.
 
         Args:
             cbor_data: CBOR-encoded bytes (already in CORECONF/SID-keyed format)
+            select: Optional XPath or list of XPaths; only the matching subtrees
+                    (with the keys of their enclosing list entries) are loaded.
 
         Returns:
             CORECONFDatastore instance for easy navigation and modification
@@ -210,9 +594,50 @@ class CORECONFModel(ModelSID):
         """
 
         sid_tree = cbor.loads(cbor_data)
+        if select is not None:
+            sid_tree = self._get_projection(select).apply(sid_tree)
 
         return CORECONFDatastore(self, sid_tree)
 
+    def create_datastore_from_file(self, path: str, mmap: bool = True):
+        """
+        Load a CBOR file into a high-level datastore interface.
+
+        With mmap=True, the file is memory-mapped and the SID tree is resolved
+        lazily: each container is decoded one level at a time, when a path
+        through it is accessed. Subtrees that are only read are decoded on the
+        fly and never stored as Python objects. Writes resolve the path to the
+        written node (copy-on-write); the file itself is never modified.
+        to_cbor() copies the untouched subtrees verbatim from the mapping.
+
+        The mapping stays open while the datastore is in use: to write the
+        result back to the same path, write to a new file and os.replace() it
+        (truncating a mapped file invalidates the mapping).
+
+        Args:
+            path: Path to a file holding CORECONF (SID-keyed) CBOR data.
+            mmap: If False, the file is read and decoded upfront (as create_datastore_from_cbor()).
+
+        Returns:
+            CORECONFDatastore instance for easy navigation and modification
+
+        Example:
+            ds = model.create_datastore_from_file("snapshot.cbor")
+            ds["/schc/rule[rule-id-value='5'][rule-id-length='3']/rule-nature"] = "nature-management"
+            cbor_data = ds.to_cbor()
+        """
+
+        with open(path, "rb") as f:
+            if not mmap:
+                return self.create_datastore_from_cbor(f.read())
+            if os.fstat(f.fileno()).st_size == 0:
+                return CORECONFDatastore(self, {})
+            buf = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+
+        _logger.debug("Mapped datastore file '%s' (bytes=%d)", path, len(buf))
+
+        return CORECONFDatastore(self, map_tree(buf))
+
     def create_datastore_from_json(self, json_config: str):
         """
         Load JSON data into a high-level datastore interface.
@@ -235,10 +660,49 @@ class CORECONFModel(ModelSID):
     # Validation
     # --------------------------------------------------------------------------
 
+    def validate(self, config) -> None:
+        """
+        Validate a config against the model's SID tables (no YANG description needed).
+
+        Checks node names/SIDs, structure, leaf types (integer ranges by width,
+        enumerations, identities, ...) and list keys (presence and uniqueness).
+        Typedefs not known to the SID tables (e.g. yang:date-and-time) are not
+        checked; use validate_json() for full YANG validation (must, when, ...).
+
+        Args:
+            config: Identifier-keyed dict (as accepted by encode()), JSON string
+                    or path to a .json file, or SID-keyed dict (as returned by
+                    cbor2.loads() on a CORECONF payload).
+
+        Raises:
+            ConfigValidationError: If validation fails; its errors attribute
+                lists every ValidationIssue(path, message) found.
+
+        Example:
+            - ccm.validate({"example:greeting": {"message": "Hello!"}})
+            - ccm.validate(cbor2.loads(cbor_data))
+        """
+
+        if isinstance(config, str):
+            config = self._load_json_input(config)
+
+        validator = self._get_validator()
+        if type(config) is dict and config and all(type(key) is int for key in config):
+            issues = validator.check_sid_tree(config)
+        else:
+            issues = validator.check_identifier_tree(config)
+
+        if issues:
+            raise ConfigValidationError(f"Config validation failed: {format_issues(issues)}", issues)
+        _logger.info("Config validation passed")
+
     def validate_json(self, json_config: str) -> None:
         """
         Validate a JSON config string or file against the YANG data model.
 
+        The YANG modules are parsed once and the resulting yangson DataModel is
+        reused by later calls (see validate_many()).
+
         Args:
             json_config: JSON string or path to file to validate.
 
@@ -251,28 +715,37 @@ class CORECONFModel(ModelSID):
             - ccm.validate_json('{"example:greeting/message":"Hello!"}')
         """
 
-        if self.model_description_file is None:
-            raise RuntimeError("Model not configured for validation: missing model_description_file.")
+        dm = self._get_data_model()
+        self._validate_yang(self._load_json_input(json_config), dm)
 
-        try:
-            from yangson import DataModel
-        except ImportError:
-            raise ImportError("Validation requires 'yangson' package.")
+    def validate_many(self, configs, errors: str = "raise") -> list:
+        """
+        Validate a batch of configs against the YANG data model.
 
-        config = self._load_json_input(json_config)
+        Every config is validated in-process against the one cached yangson
+        DataModel (see validate_json()).
 
-        dm = DataModel.from_file(
-            self.model_description_file,
-            self.yang_ietf_modules_paths
-        )
-        data = dm.from_raw(config)
+        Args:
+            configs: Iterable of JSON strings, .json file paths or Python dictionaries.
+            errors: "raise" (default) to raise on the first invalid config, or
+                    "capture" to return a BatchItemError in its place.
 
-        try:
-            data.validate()
-            _logger.info("Config validation passed")
-        except Exception as e:
-            # Add context and preserve the original exception chain
-            raise ConfigValidationError(f"Config validation failed: {e}") from e
+        Returns:
+            List with None for each valid config (or a BatchItemError wrapping its
+            ConfigValidationError, if errors="capture"), in input order.
+
+        Raises:
+            RuntimeError: If model_description_file is not set.
+            ImportError: If yangson package is not installed.
+            BatchItemError: If a config is invalid and errors="raise".
+
+        Example:
+            - results = ccm.validate_many(json_configs, errors="capture")
+            - invalid = [r.index for r in results if r is not None]
+        """
+
+        self._get_data_model() # fail early if validation is not available
+        return run_batch(self, "_validate_yang", configs, {}, workers=1, errors=errors)
 
     def add_modules_path(self, path: str | list[str]) -> None:
         """
@@ -284,8 +757,14 @@ class CORECONFModel(ModelSID):
         Example:
             - model.add_modules_path("./yang_modules")
             - model.add_modules_path(["./modules", "/usr/share/yang"])
+
+        Raises:
+            RuntimeError: If the model is shared (see CORECONFModel.get()).
         """
 
+        if self._shared:
+            raise RuntimeError("Cannot modify a shared model; create a CORECONFModel instance instead.")
+
         if type(path) is str:
             self.yang_ietf_modules_paths.append(path)
         elif type(path) is list:
@@ -293,6 +772,8 @@ class CORECONFModel(ModelSID):
         else:
             raise TypeError("Can only add path string or list of paths.")
 
+        self._data_model = None # re-parsed with the new search path on next use
+
     # Internals
     # --------------------------------------------------------------------------
 
@@ -307,11 +788,142 @@ class CORECONFModel(ModelSID):
             _logger.debug("Handling JSON input as content (length=%d)", len(json_input))
             return json.loads(json_input)
 
+    def _get_data_model(self):
+        """
+        Return the yangson DataModel of model_description_file (cached).
+
+        The modules are parsed on first use and the model is reused until
+        add_modules_path() is called or the modification time of the description
+        file or of a loaded YANG module file changes.
+
+        Raises:
+            RuntimeError: If model_description_file is not set.
+            ImportError: If yangson package is not installed.
+        """
+
+        if self.model_description_file is None:
+            raise RuntimeError("Model not configured for validation: missing model_description_file.")
+
+        try:
+            from yangson import DataModel
+        except ImportError:
+            raise ImportError("Validation requires 'yangson' package.")
+
+        with self._data_model_lock:
+            dm = self._data_model
+            if dm is not None and _mtimes(path for path, _ in self._data_model_files) == self._data_model_files:
+                return dm
+
+            _logger.debug("Parsing YANG data model (paths=%s)", self.yang_ietf_modules_paths)
+            dm = DataModel.from_file(
+                self.model_description_file,
+                self.yang_ietf_modules_paths
+            )
+
+            # Files the model was built from: the description and every module and submodule
+            paths = [self.model_description_file]
+            paths.extend(module.path for module in dm.schema_data.modules.values() if module.path)
+
+            self._data_model_files = _mtimes(paths)
+            self._data_model = dm
+            return dm
+
+    def _validate_yang(self, config, dm=None):
+        """
+        Validate a config (JSON string, .json path or dict) with the yangson DataModel.
+
+        Raises:
+            ConfigValidationError: If validation fails.
+        """
+
+        if isinstance(config, str):
+            config = self._load_json_input(config)
+        if dm is None:
+            dm = self._get_data_model()
+
+        data = dm.from_raw(config)
+
+        try:
+            data.validate()
+            _logger.info("Config validation passed")
+        except Exception as e:
+            # Add context and preserve the original exception chain
+            raise ConfigValidationError(f"Config validation failed: {e}") from e
+
+    def _get_validator(self):
+        """Return the native Validator of the model (compiled on first use)."""
+        if self._validator is None:
+            self._validator = Validator(self.schema, self.sids)
+        return self._validator
+
+    def _get_projection(self, select):
+        """
+        Return the compiled Projection for an XPath or list of XPaths (cached).
+
+        Raises:
+            KeyError: If an XPath element is not found in the model.
+            ValueError: If an XPath has invalid predicates.
+        """
+
+        if isinstance(select, str):
+            select = [select]
+        select = tuple(select)
+
+        projection = self._projections.get(select)
+        if projection is None:
+            resolver = CORECONFDatastore(self, {})
+            projection = Projection.from_xpaths(resolver._compile_xpath, select)
+            self._projections[select] = projection
+            if len(self._projections) > CORECONFDatastore.xpath_cache_size:
+                self._projections.popitem(last=False)
+        else:
+            self._projections.move_to_end(select)
+
+        return projection
+
+    def _compile_converters(self):
+        """
+        Compile the leaf converters of every typed SID in the model.
+
+        Returns:
+            Tuple of (encoders: dict, decoders: dict, json_decoders: dict), each
+            mapping a leaf SID to a callable; json_decoders produce RFC 7951
+            representations.
+        """
+
+        encoders = {}
+        decoders = {}
+        json_decoders = {}
+        type_warnings = self.type_warnings
+
+        for sid, node in self.schema.nodes.items():
+            if node.type is None:
+                continue
+            encoders[sid] = compile_encoder(node.type, self.sids, sid, type_warnings)
+            decoders[sid] = compile_decoder(node.type, self.ids, True, sid, type_warnings)
+            json_decoders[sid] = compile_decoder(node.type, self.ids, False, sid, type_warnings)
+
+        _logger.debug("Compiled leaf converters for %d typed SIDs", len(encoders))
+
+        return encoders, decoders, json_decoders
+
+    def _encode_leaf(self, sid, leaf):
+        """Convert a leaf value to its CBOR representation using the SID's compiled encoder."""
+        return self._encoders[sid](leaf)
+
+    def _decode_leaf(self, sid, leaf, use_native_types=True):
+        """Convert a CBOR leaf value to its model representation using the SID's compiled decoder."""
+        decoders = self._decoders if use_native_types else self._json_decoders
+        return decoders[sid](leaf)
+
     def _convert_leaf_value(self, leaf, dtype, to_cbor, use_native_types=True):
         """
         Convert a leaf value between model (Python/JSON) and CBOR representations
         according to its YANG data type.
 
+        Compiles a one-off converter for *dtype*; tree conversions use the
+        per-SID converters compiled at load time instead.
+
         Args:
             leaf: The input leaf value.
             dtype: The YANG data type definition for the value.
@@ -324,117 +936,9 @@ class CORECONFModel(ModelSID):
             The converted value.
         """
 
-        # XXX: Refactor and/or split (encoding/decoding) this function.
-
-        BITS_CBOR_TAG_VALUE = 43
-        ENUMERATION_CBOR_TAG_VALUE = 44
-        IDENTITYREF_CBOR_TAG_VALUE = 45
-        INSTANCE_IDENTIFIER_CBOR_TAG_VALUE = 46
-        SID_CBOR_TAG_VALUE =  47
-
-        if isinstance(leaf, cbor.CBORTag):
-            # Decoding (i.e. not to_cbor):
-            if leaf.tag == BITS_CBOR_TAG_VALUE:
-                return str(leaf.value)
-            if leaf.tag == ENUMERATION_CBOR_TAG_VALUE:
-                return dtype[str(leaf.value)]
-            if leaf.tag == IDENTITYREF_CBOR_TAG_VALUE:
-                return self.ids[leaf.value]
-            if leaf.tag == INSTANCE_IDENTIFIER_CBOR_TAG_VALUE:
-                _logger.debug("Decoding CBOR tag %d value (%d) without handling", leaf.tag, leaf.value)
-                return leaf.value # ?
-            if leaf.tag == SID_CBOR_TAG_VALUE:
-                _logger.debug("Decoding CBOR tag %d value (%d) without handling", leaf.tag, leaf.value)
-                return leaf.value # ?
-            else:
-                _logger.warning("Unexpected CBOR tag %d during decoding; returning value as-is.", leaf.tag)
-                return leaf.value
-
-        elif type(dtype) is str:
-            if dtype == "string":
-                return str(leaf)
-            elif dtype in ["int8", "int16", "int32", "int64",
-                            "uint8", "uint16", "uint32", "uint64"]:
-                # RFC 7951: int64/uint64 must be strings in JSON to avoid precision loss,
-                # but CBOR uses native integers. Smaller types are safe as JSON numbers.
-                if not to_cbor and dtype in ["int64", "uint64"] and not use_native_types:
-                    return str(leaf)
-                else:
-                    return int(leaf)
-            elif dtype == "decimal64":
-                # RFC 7951: decimal64 must be a string in JSON to avoid precision loss,
-                # but CBOR can use a float or string representation
-                if not to_cbor and not use_native_types:
-                    return str(leaf)
-                else:
-                    return float(leaf)
-            elif dtype == "binary":
-                if to_cbor:
-                    dec = base64.b64decode(leaf)
-                    return dec
-                else:
-                    enc = base64.b64encode(leaf)
-                    return enc.decode()
-            elif dtype == "boolean":
-                # ret = True if obj == "true" else False
-                _logger.debug("Handling boolean type as bool(leaf)")
-                return bool(leaf)
-            elif dtype == "inet:uri":
-                return str(leaf)
-            elif dtype == "identityref": # sid <-> 'module:identity'
-                return self.sids[leaf] if to_cbor else self.ids[leaf]
-            elif dtype == "bits":
-                _logger.debug("Handling bits type as hex string")
-                # For bits type, convert bytes to hex string when decoding
-                if not to_cbor and isinstance(leaf, bytes):
-                    return leaf.hex()
-                else:
-                    return leaf
-            elif dtype in ["empty", "leafref", "instance-identifier"]: # just return obj
-                _logger.warning("Data type %s not yet handled; returning value as-is.", dtype)
-                return leaf
-
-        elif type(dtype) is dict: # enumeration ({"value":"name"})
-            if to_cbor: # inverse dict, w value as int
-                dtype = {v: int(k) for k, v in dtype.items()}
-            return dtype[str(leaf)]
-
-        elif type(dtype) is list: # union
-            _logger.debug("Resolving union type (to_cbor=%s, value=%r, candidates=%s)", to_cbor, leaf, dtype)
-            for sub_dtype in dtype:
-                try:
-                    val = self._convert_leaf_value(leaf, sub_dtype, to_cbor, use_native_types)
-                    _logger.debug("Matched union subtype %s", sub_dtype)
-
-                    # Special cases - RFC 9254 Section 6.12
-                    if to_cbor:
-                        if sub_dtype == "identityref":
-                            return cbor.CBORTag(IDENTITYREF_CBOR_TAG_VALUE, val)
-                        elif sub_dtype == "bits":
-                            return cbor.CBORTag(BITS_CBOR_TAG_VALUE, val)
-                        elif sub_dtype == "instance-identifier":
-                            return cbor.CBORTag(INSTANCE_IDENTIFIER_CBOR_TAG_VALUE, val)
-                        elif isinstance(sub_dtype, dict): # enumeration
-                            return cbor.CBORTag(ENUMERATION_CBOR_TAG_VALUE, val)
-
-                    return val
-
-                except Exception:
-                    continue
-
-            _logger.warning("No matching subtype found for union %s (value=%s); returning value as-is.", dtype, leaf)
-            return leaf # fallback
-
-        # RFC 7951: Fallback for Decimal objects (e.g., from unrecognized typedefs)
-        # Decimal values must be strings in JSON to maintain precision
-        if not to_cbor and not use_native_types:
-            from decimal import Decimal
-            if isinstance(leaf, Decimal):
-                _logger.debug("Converting Decimal to string for JSON compatibility (value=%r)", leaf)
-                return str(leaf)
-
-        _logger.warning("Unrecognized type: %s; returning value as-is.", dtype)
-        return leaf # fallback
+        if to_cbor:
+            return compile_encoder(dtype, self.sids, type_warnings=self.type_warnings)(leaf)
+        return compile_decoder(dtype, self.ids, use_native_types, type_warnings=self.type_warnings)(leaf)
 
     ## Tree Transformation (Encoding)
     # --------------------------------------------------------------------------
@@ -443,6 +947,8 @@ class CORECONFModel(ModelSID):
         """
         Convert an identifier-keyed tree into a SID-keyed tree (iterative).
 
+        The input is not modified; the SID-keyed tree is built in a single pass.
+
         Args:
             obj: Current identifier-based tree.
             path: Current identifier path.
@@ -452,38 +958,42 @@ class CORECONFModel(ModelSID):
             SID-keyed tree.
         """
 
-        _logger.debug("Using iterative identifier-tree to SID-tree conversion")
+        if converters.TRACE:
+            _logger.debug("Using iterative identifier-tree to SID-tree conversion")
 
-        stack = [(_ValueWrapper(obj), path, parent_sid)]
+        sids = self.sids
+        encoders = self._encoders
 
-        while stack:
-            current_object, current_path, current_parent = stack.pop()
-            current_value  = current_object.value
+        # Each stack entry holds a source value and the (container, slot) to fill
+        result = [None]
+        stack = [(obj, result, 0, path, parent_sid)]
 
-            # current_value is a dict here, iterate through key/value pairs and add values to the stack
-            if type(current_value) == dict:
-                keys = list(current_value.keys())
+        while stack:
+            current_value, target, slot, current_path, current_parent = stack.pop()
 
-                for key in keys:
+            # current_value is a dict here, reserve the SID keys (in order) and add values to the stack
+            if type(current_value) is dict:
+                node = {}
+                for key, child in current_value.items():
                     qualified_path = current_path + key
-                    child_sid_value = self.sids[qualified_path]
-                    sid_diff  = child_sid_value - current_parent
-                    current_value[sid_diff] = _ValueWrapper(current_value.pop(key))
-                    stack.append((current_value[sid_diff], qualified_path+"/", child_sid_value))
-            
-            # current_value is a list type, append each of the object in current_value to the stack
-            elif type(current_value) == list:
-                for i in range(len(current_value)):
-                    current_value[i] = _ValueWrapper(current_value[i])
-                    stack.append((current_value[i], current_path, current_parent))
-            
+                    child_sid_value = sids[qualified_path]
+                    sid_diff = child_sid_value - current_parent
+                    node[sid_diff] = None
+                    stack.append((child, node, sid_diff, qualified_path + "/", child_sid_value))
+                target[slot] = node
+
+            # current_value is a list type, reserve the entries and add them to the stack
+            elif type(current_value) is list:
+                node = [None] * len(current_value)
+                for i, child in enumerate(current_value):
+                    stack.append((child, node, i, current_path, current_parent))
+                target[slot] = node
+
             # current_value is a leaf here, transform their datatype
             else:
-                dtype = self.types[current_path[:-1]]
-                current_object.value = self._convert_leaf_value(current_object.value, dtype, to_cbor=True)
-        
-        # Unwrap the ValueClass objects before returning
-        return(_unwrap_values(obj))
+                target[slot] = encoders[current_parent](current_value)
+
+        return result[0]
 
     def _identifier_to_sid_tree_recursive(self, obj, path="/", parent_sid=0):
         """
@@ -518,10 +1028,8 @@ class CORECONFModel(ModelSID):
 
         # Leaves:
         else:
-            # get leaf data type according to model
-            # and cast to correct data type.
-            dtype = self.types[path[:-1]]
-            return self._convert_leaf_value(obj, dtype, to_cbor=True)
+            # cast to correct data type according to model
+            return self._encoders[parent_sid](obj)
 
     ## Tree Transformation (Decoding)
     # --------------------------------------------------------------------------
@@ -530,6 +1038,8 @@ class CORECONFModel(ModelSID):
         """
         Convert a SID-keyed tree into an identifier-keyed tree (iterative).
 
+        The input is not modified; the identifier-keyed tree is built in a single pass.
+
         Args:
             obj: Current SID-based tree.
             sid_delta: SID offset from parent.
@@ -541,40 +1051,43 @@ class CORECONFModel(ModelSID):
             Identifier-keyed tree.
         """
 
-        _logger.debug("Using iterative SID-tree to identifier-tree conversion")
+        if converters.TRACE:
+            _logger.debug("Using iterative SID-tree to identifier-tree conversion")
+
+        ids = self.ids
+        decoders = self._decoders if use_native_types else self._json_decoders
 
-        stack = [(_ValueWrapper(obj), sid_delta, path)]
+        # Each stack entry holds a source value and the (container, slot) to fill
+        result = [None]
+        stack = [(obj, result, 0, sid_delta, path)]
 
         while stack:
-            current_object, current_delta, current_path = stack.pop()
-            current_value = current_object.value
+            current_value, target, slot, current_delta, current_path = stack.pop()
 
-            # current_value is a dict here, iterate through key/value pairs and add values to the stack
+            # current_value is a dict here, reserve the identifier keys (in order) and add values to the stack
             if type(current_value) is dict:
-                keys = list(current_value.keys())
-                for key in keys:
-                    # get full identifier path
-                    
+                node = {}
+                for key, child in current_value.items():
+                    # get full SID value and look for the original identifier
                     sid = key + current_delta
-                    # look for the original identifiers
-                    identifier = self.ids[sid]
+                    identifier = ids[sid]
                     node_identifier = identifier[len(current_path):].lstrip("/")
-                    current_value[node_identifier] = _ValueWrapper(current_value.pop(key))
-                    stack.append((current_value[node_identifier], sid, identifier))
-        
-            # current_value is a list type, append each of the object in currentValue to the stack
+                    node[node_identifier] = None
+                    stack.append((child, node, node_identifier, sid, identifier))
+                target[slot] = node
+
+            # current_value is a list type, reserve the entries and add them to the stack
             elif type(current_value) is list:
-                for i in range(len(current_value)):
-                    current_value[i] = _ValueWrapper(current_value[i])
-                    stack.append((current_value[i], current_delta, current_path))
+                node = [None] * len(current_value)
+                for i, child in enumerate(current_value):
+                    stack.append((child, node, i, current_delta, current_path))
+                target[slot] = node
 
-            # current_value is a leaf here, transform their datatype before adding to the current_object
+            # current_value is a leaf here, transform their datatype
             else:
-                dtype = self.types[current_path]
-                current_object.value = self._convert_leaf_value(current_object.value, dtype, to_cbor=False, use_native_types=use_native_types)
+                target[slot] = decoders[current_delta](current_value)
 
-        # Unwrap the ValueClass objects before returning
-        return(_unwrap_values(obj))
+        return result[0]
 
     def _sid_to_identifier_tree_recursive(self, obj, sid_delta=0, path="/", use_native_types=True):
         """
@@ -612,10 +1125,8 @@ class CORECONFModel(ModelSID):
 
         # Leaves:
         else:
-            # get leaf data type according to model
-            # and cast to correct data type.
-            dtype = self.types[path]
-            return self._convert_leaf_value(obj, dtype, to_cbor=False, use_native_types=use_native_types)
+            # cast to correct data type according to model
+            return self._decode_leaf(sid_delta, obj, use_native_types)
 
     ## Query
     # --------------------------------------------------------------------------
@@ -660,9 +1171,9 @@ class CORECONFModel(ModelSID):
                     identifier = self.ids[p_sid]
                     
                     # Check if this SID is a list key marker
-                    if str(p_sid) in self.key_mapping:
+                    key_sids = self.list_keys.get(p_sid)
+                    if key_sids is not None:
                         # This is a list node, try to match keys
-                        key_sids = self.key_mapping[str(p_sid)]
                         child_object = node[key]
 
                         # child_object is directly a list of dictionaries
@@ -726,14 +1237,16 @@ class CORECONFModel(ModelSID):
 
             return None
 
-        _logger.debug(
-            "Executing SID query (sid=%s, keys=%s, update=%s, depth=%s)",
-            sid, keys, value is not None, depth
-        )
+        trace = converters.TRACE
+        if trace:
+            _logger.debug(
+                "Executing SID query (sid=%s, keys=%s, update=%s, depth=%s)",
+                sid, keys, value is not None, depth
+            )
 
         result = _walk(obj, delta, path, keys)
 
-        if result is None:
+        if trace and result is None:
             _logger.debug("SID query returned no result (sid=%s, keys=%s)", sid, keys)
 
         return result
@@ -755,8 +1268,7 @@ class CORECONFModel(ModelSID):
 
         # Work with a python dict
         if isinstance(config, dict):
-            # "deepcopy"
-            cfg_dict = json.loads(json.dumps(config))
+            cfg_dict = config
         else:
             if config[-5:] == ".json":
                 # Load the JSON file
@@ -821,14 +1333,6 @@ class CORECONFModel(ModelSID):
         if self.model_description_file is None:
             return  # no validation configured
 
-        try:
-            from yangson import DataModel
-        except ImportError:
-            raise ImportError("Validation requires 'yangson' package.")
-
-        dm = DataModel.from_file(
-            self.model_description_file,
-            self.yang_ietf_modules_paths
-        )
+        dm = self._get_data_model()
         data = dm.from_raw(config)
         data.validate()
@@ -0,0 +1,158 @@
+# Projection (selective decoding) of SID-keyed trees
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class Projection:
+    """
+    Selection of subtrees of a SID-keyed tree, compiled from XPaths.
+
+    Each node selects either a whole subtree (full) or some of its children.
+    List nodes select entries by key values (None: any entry).
+
+    Attributes:
+        full: True if the whole subtree is selected.
+        key_sids: Tuple of list key SIDs (None if not a list).
+        children: Child selections by SID.
+        entries: List entry selections by key value tuple (None: any entry).
+
+    Example:
+        - projection = Projection.from_xpaths(ds._compile_xpath, ["/schc/rule[rule-id-value='5'][rule-id-length='3']"])
+        - subset = projection.apply(sid_tree)
+    """
+
+    __slots__ = ("full", "key_sids", "children", "entries")
+
+    def __init__(self, key_sids=None):
+        self.full = False
+        self.key_sids = key_sids
+        self.children = {}
+        self.entries = {}
+
+    @classmethod
+    def from_xpaths(cls, resolve, xpaths):
+        """
+        Compile a projection from XPaths.
+
+        Args:
+            resolve: Callable returning (_CompiledXPath, key_values) for an XPath.
+            xpaths: Iterable of XPath strings selecting the subtrees to keep.
+
+        Returns:
+            Root Projection.
+        """
+
+        root = cls()
+
+        for xpath in xpaths:
+            compiled, keys = resolve(xpath)
+
+            # Group the bound key values by XPath segment (one segment per chain level)
+            keys_by_position = {}
+            for (position, _, _), value in zip(compiled.key_slots, keys):
+                keys_by_position.setdefault(position, []).append(value)
+
+            node = root
+            last = len(compiled.chain) - 1
+            for position, (sid, key_sids) in enumerate(compiled.chain):
+                node = node.children.setdefault(sid, cls(key_sids))
+
+                if position in keys_by_position:
+                    node = node.entries.setdefault(tuple(keys_by_position[position]), cls())
+                elif key_sids is not None and position < last:
+                    node = node.entries.setdefault(None, cls())
+            node.full = True
+
+        root._spread()
+
+        _logger.debug("Compiled projection from %d XPath(s)", len(xpaths))
+
+        return root
+
+    def _merge(self, other):
+        """Add the selections of another projection to this one."""
+        self.full = self.full or other.full
+        for sid, child in other.children.items():
+            self.children.setdefault(sid, Projection(child.key_sids))._merge(child)
+        for keys, entry in other.entries.items():
+            self.entries.setdefault(keys, Projection())._merge(entry)
+
+    def _spread(self):
+        """Merge any-entry selections into the selections of specific entries."""
+        any_entry = self.entries.get(None)
+        if any_entry is not None:
+            for keys, entry in self.entries.items():
+                if keys is not None:
+                    entry._merge(any_entry)
+        for entry in self.entries.values():
+            entry._spread()
+        for child in self.children.values():
+            child._spread()
+
+    def apply(self, data, parent_sid=0):
+        """
+        Return the selected part of a SID-keyed map.
+
+        Unselected siblings are skipped by SID without being visited; selected
+        subtrees are shared with the input, not copied.
+
+        Args:
+            data: SID-keyed map (delta-SID keys relative to parent_sid).
+            parent_sid: SID of the node holding data (0 for the top level).
+
+        Returns:
+            New SID-keyed map holding only the selected subtrees.
+        """
+
+        result = {}
+
+        for sid, child in self.children.items():
+            delta = sid - parent_sid
+            if delta not in data:
+                continue
+            value = data[delta]
+
+            if child.full:
+                result[delta] = value
+            elif child.key_sids is not None:
+                if type(value) is list:
+                    entries = child._apply_entries(value, sid)
+                    if entries:
+                        result[delta] = entries
+            elif type(value) is dict:
+                subtree = child.apply(value, sid)
+                if subtree:
+                    result[delta] = subtree
+
+        return result
+
+    def _apply_entries(self, entries, list_sid):
+        """Return the selected entries of a list, keeping their key leaves."""
+        key_deltas = [key_sid - list_sid for key_sid in self.key_sids]
+        any_entry = self.entries.get(None)
+        result = []
+
+        for entry in entries:
+            if type(entry) is not dict:
+                continue
+
+            try:
+                selection = self.entries.get(tuple(entry.get(d) for d in key_deltas), any_entry)
+            except TypeError: # unhashable key value
+                selection = any_entry
+            if selection is None:
+                continue
+
+            if selection.full:
+                result.append(entry)
+                continue
+
+            subtree = selection.apply(entry, list_sid)
+            if subtree:
+                projected = {d: entry[d] for d in key_deltas if d in entry}
+                projected.update(subtree)
+                result.append(projected)
+
+        return result
@@ -0,0 +1,117 @@
+# CBOR sequences (RFC 8742): data items concatenated back to back
+
+from collections import namedtuple
+import io
+import cbor2 as cbor
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Item of a CBOR sequence: byte offset of the item in the stream, encoded size, value
+SequenceItem = namedtuple("SequenceItem", ["offset", "size", "value"])
+
+
+class _CountingReader:
+    """Wrap a non-seekable binary stream (pipe, socket) to count the bytes read."""
+
+    __slots__ = ("_fp", "pos")
+
+    def __init__(self, fp, pos=0):
+        self._fp = fp
+        self.pos = pos
+
+    def read(self, size=-1):
+        data = self._fp.read(size)
+        self.pos += len(data)
+        return data
+
+    def tell(self):
+        return self.pos
+
+
+def _position(fp):
+    """Return the current position of a stream, or None if it is not seekable."""
+    try:
+        return fp.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def read_sequence(source, offset=None):
+    """
+    Read the data items of a CBOR sequence one at a time.
+
+    Only one data item is held in memory at a time. Offsets are stream
+    positions (fp.tell()) for seekable sources; for non-seekable streams they
+    count the bytes read from the position the stream was at.
+
+    Args:
+        source: Binary file-like object (file, pipe, socket.makefile(), mmap) or bytes.
+        offset: Optional position to start reading at (seekable sources only),
+                e.g. offset + size of the last item processed.
+
+    Yields:
+        SequenceItem(offset, size, value) with value the decoded (SID-keyed) item.
+
+    Raises:
+        CBORDecodeError: If a data item is malformed or truncated.
+        ValueError: If an offset is given for a non-seekable source.
+    """
+
+    fp = io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source
+
+    if offset is not None:
+        try:
+            fp.seek(offset)
+        except (AttributeError, OSError) as e:
+            raise ValueError("Cannot resume at an offset on a non-seekable stream") from e
+
+    pos = _position(fp)
+    if pos is None:
+        fp = _CountingReader(fp)
+        pos = 0
+
+    decoder = cbor.CBORDecoder(fp)
+    count = 0
+
+    while True:
+        try:
+            value = decoder.decode()
+        except cbor.CBORDecodeEOF:
+            end = fp.tell()
+            if end == pos:
+                break # clean end of the sequence, between two items
+            raise cbor.CBORDecodeEOF(f"Truncated CBOR sequence item at offset {pos}") from None
+
+        end = fp.tell()
+        yield SequenceItem(pos, end - pos, value)
+        count += 1
+        pos = end
+
+    _logger.debug("Read %d CBOR sequence item(s)", count)
+
+
+def write_sequence(fp, items):
+    """
+    Write encoded data items back to back as a CBOR sequence.
+
+    Args:
+        fp: Binary file-like object with a write() method.
+        items: Iterable of CBOR-encoded bytes.
+
+    Returns:
+        List of (offset, size) of the written items; offsets start at fp.tell()
+        for seekable streams, 0 otherwise.
+    """
+
+    pos = _position(fp) or 0
+    index = []
+
+    for data in items:
+        fp.write(data)
+        index.append((pos, len(data)))
+        pos += len(data)
+
+    _logger.debug("Wrote %d CBOR sequence item(s) (bytes=%d)", len(index), pos)
+
+    return index
@@ -1,9 +1,185 @@
 import json
 import warnings
 import logging
+import hashlib
+import marshal
+import os
+import tempfile
+import sys
+from ._version import __version__
+from .converters import enum_table
 
 _logger = logging.getLogger(__name__)
 
+# Bump when the layout of the snapshot tables changes
+SNAPSHOT_FORMAT = 1
+
+# Environment variable enabling the model snapshot cache when no cache_dir is given
+CACHE_DIR_ENV = "PYCORECONF_CACHE_DIR"
+
+
+# Process-wide canonical type descriptors: {json_key: descriptor}
+_shared_types = {}
+
+
+def normalize_key_mapping(key_mapping: dict) -> dict:
+    """
+    Return an int-keyed copy of a key mapping, with tuple key lists.
+
+    Accepts both the raw SID file form ({"list_sid": [key_sid, ...]}) and
+    already normalized mappings.
+    """
+    return {int(list_sid): tuple(int(k) for k in key_sids) for list_sid, key_sids in key_mapping.items()}
+
+
+def _deep_sizeof(obj, seen=None) -> int:
+    """Return the approximate memory size of a tree of dicts, lists, tuples and scalars."""
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return size
+
+
+class SchemaNode:
+    """
+    Node of the schema tree built from SID tables.
+
+    Attributes:
+        sid: SID value (0 for the root).
+        identifier: Full YANG identifier path (e.g. "/module:container/list").
+        name: Local name, without module prefix.
+        qname: Module-qualified name ("module:name").
+        module: Name of the module defining the node.
+        kind: "root", "container", "list", "leaf" or "identity".
+        parent: Parent SchemaNode (None for the root and identities).
+        children: Child nodes by local name.
+        qchildren: Child nodes by qualified name.
+        key_sids: Tuple of list key SIDs (None if not a list).
+        type: YANG data type of a leaf (None otherwise).
+    """
+
+    __slots__ = ("sid", "identifier", "name", "qname", "module", "kind",
+                 "parent", "children", "qchildren", "key_sids", "type")
+
+    def __init__(self, sid, identifier, name, module, kind, parent=None, key_sids=None, dtype=None):
+        self.sid = sid
+        self.identifier = identifier
+        self.name = name
+        self.module = module
+        self.qname = f"{module}:{name}" if module else name
+        self.kind = kind
+        self.parent = parent
+        self.children = {}
+        self.qchildren = {}
+        self.key_sids = key_sids
+        self.type = dtype
+
+    def child(self, name):
+        """
+        Return the child node matching a path segment, or None.
+
+        Args:
+            name: Qualified ("module:name") or local child name.
+        """
+        node = self.qchildren.get(name)
+        if node is None:
+            node = self.children.get(name)
+        return node
+
+    def ancestry(self):
+        """Return the list of nodes from the top-level node down to this node."""
+        chain = []
+        node = self
+        while node is not None and node.kind != "root":
+            chain.append(node)
+            node = node.parent
+        chain.reverse()
+        return chain
+
+    def __repr__(self):
+        return f"SchemaNode({self.sid}, {self.identifier!r}, kind={self.kind!r})"
+
+
+class SchemaTree:
+    """
+    Schema tree of the data nodes and identities described by SID tables.
+
+    Attributes:
+        root: Root SchemaNode; top-level data nodes are its children.
+        nodes: Mapping of SID value to SchemaNode.
+        identities: Mapping of local identity name to the list of matching SIDs.
+
+    Example:
+        - tree = SchemaTree(model.sids, model.types, model.list_keys)
+        - tree.root.child("module:container").child("list").key_sids
+    """
+
+    def __init__(self, sids: dict, types: dict, key_mapping: dict):
+        key_mapping = normalize_key_mapping(key_mapping)
+        self.root = SchemaNode(0, "/", "", None, "root")
+        self.nodes = {}
+        self.identities = {}
+
+        # Sort by depth so that parents are always created before their children
+        data_items = []
+        for identifier, sid in sids.items():
+            if not isinstance(identifier, str):
+                continue
+            if identifier.startswith("/"):
+                data_items.append((identifier.count("/"), identifier, sid))
+            elif ":" in identifier:
+                self._add_identity(identifier, sid)
+        data_items.sort(key=lambda item: item[0])
+
+        paths = {"": self.root}
+        for _, identifier, sid in data_items:
+            parent_path, _, segment = identifier.rpartition("/")
+
+            # Attach to the closest known ancestor
+            parent = paths.get(parent_path)
+            while parent is None:
+                parent_path = parent_path.rpartition("/")[0]
+                parent = paths.get(parent_path)
+
+            module, _, name = segment.rpartition(":")
+            if not module:
+                module = parent.module
+
+            key_sids = key_mapping.get(sid)
+            dtype = types.get(identifier)
+            if key_sids is not None:
+                kind = "list"
+            elif dtype is not None:
+                kind = "leaf"
+            else:
+                kind = "container"
+
+            node = SchemaNode(sid, identifier, name, module, kind, parent, key_sids, dtype)
+            parent.children.setdefault(name, node)
+            parent.qchildren.setdefault(node.qname, node)
+
+            paths[identifier] = node
+            self.nodes[sid] = node
+
+    def _add_identity(self, identifier, sid):
+        """Register an identity ("module:identity") by SID and local name."""
+        module, _, name = identifier.partition(":")
+        self.nodes.setdefault(sid, SchemaNode(sid, identifier, name, module, "identity"))
+        self.identities.setdefault(name, []).append(sid)
+
+
 class ModelSID:
     """
     Base class for loading and indexing YANG model SID files.
@@ -15,16 +191,170 @@ class ModelSID:
         sids: Mapping of YANG identifier to SID value.
         types: Mapping of YANG identifier to data type.
         ids: Inverse mapping of SID value to identifier.
-        key_mapping: Mapping of list SIDs to their key component SIDs.
+        key_mapping: Mapping of list SIDs to their key component SIDs (string keys, as in SID files).
+        list_keys: Mapping of list SID to the tuple of its key SIDs (int keys).
+        sid_types: Mapping of SID value to data type.
+        enums: Mapping of enumeration leaf SID to its EnumTable (names by value, values by name).
+        schema: SchemaTree of the data nodes and identities.
+        cache_dir: Directory of compiled model snapshots (None: no snapshot cache).
 
     Example:
         - model = ModelSID(["module-1.sid", "module-2.sid"])
+        - model = ModelSID(["module-1.sid"], cache_dir="~/.cache/pycoreconf")
     """
 
-    def __init__(self, sid_files: list[str]):
+    def __init__(self, sid_files: list[str], cache_dir: str = None):
         self.sid_files = sid_files # .sid file paths
-        self.sids, self.types, self.key_mapping = self._collect_sid_data() #req. ltn22/pyang
+        if cache_dir is None:
+            cache_dir = os.environ.get(CACHE_DIR_ENV) or None
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+
+        tables = self._load_snapshot() if self.cache_dir else None
+        if tables is None:
+            tables = self._collect_sid_data() #req. ltn22/pyang
+            if self.cache_dir:
+                self._save_snapshot(tables)
+        self.sids, self.types, self.key_mapping = tables
+
         self.ids = {v: k for k, v in self.sids.items()} # {sid:id}
+        self._build_sid_tables()
+        self.schema = SchemaTree(self.sids, self.types, self.list_keys)
+
+    def _build_sid_tables(self) -> None:
+        """Build the int-keyed views of the key mapping and type tables."""
+        self.list_keys = normalize_key_mapping(self.key_mapping) # {list_sid: (key_sid, ...)}
+        self.sid_types = {self.sids[identifier]: dtype
+                          for identifier, dtype in self.types.items() if identifier in self.sids}
+        self.enums = {sid: enum_table(dtype)
+                      for sid, dtype in self.sid_types.items() if isinstance(dtype, dict)}
+
+    ## Interning
+    # --------------------------------------------------------------------------
+
+    def _table_size(self) -> int:
+        """Return the approximate memory size of the SID tables (sids, ids, types, key_mapping)."""
+        seen = set()
+        return sum(_deep_sizeof(table, seen) for table in (self.sids, self.ids, self.types, self.key_mapping))
+
+    def _intern_tables(self) -> int:
+        """
+        Share identifier strings and type descriptors with other interned models.
+
+        Identifiers are interned with sys.intern(); equal type descriptors
+        (names, enumerations, unions) are replaced by one process-wide object.
+        The tables are rebuilt, never mutated in place.
+
+        Returns:
+            Approximate number of bytes released by sharing.
+        """
+
+        saved = 0
+
+        def intern(value):
+            nonlocal saved
+            interned = sys.intern(value)
+            if interned is not value:
+                saved += sys.getsizeof(value)
+            return interned
+
+        def share(dtype):
+            nonlocal saved
+            if isinstance(dtype, str):
+                return intern(dtype)
+            key = json.dumps(dtype, sort_keys=True)
+            shared = _shared_types.setdefault(key, dtype)
+            if shared is not dtype:
+                saved += _deep_sizeof(dtype)
+            return shared
+
+        self.sids = {intern(identifier): sid for identifier, sid in self.sids.items()}
+        self.ids = {sid: identifier for identifier, sid in self.sids.items()}
+        self.types = {intern(identifier): share(dtype) for identifier, dtype in self.types.items()}
+        self._build_sid_tables()
+
+        for node in self.schema.nodes.values():
+            node.identifier = self.ids.get(node.sid, node.identifier)
+            node.name = intern(node.name)
+            node.qname = intern(node.qname)
+            if node.module is not None:
+                node.module = intern(node.module)
+            if node.type is not None:
+                node.type = self.types.get(node.identifier, node.type)
+
+        _logger.debug("Interned model tables (saved=%d bytes)", saved)
+
+        return saved
+
+    ## Snapshot Cache
+    # --------------------------------------------------------------------------
+
+    def _snapshot_path(self) -> str:
+        """
+        Return the snapshot file path for the current SID files.
+
+        The name is a hash of the library version, the snapshot format and the
+        content of each SID file (in order), so any change to a source file
+        selects a new snapshot.
+        """
+
+        digest = hashlib.sha256()
+        digest.update(f"{__version__}/{SNAPSHOT_FORMAT}/{marshal.version}".encode())
+        for sid_filename in self.sid_files:
+            with open(sid_filename, "rb") as f:
+                content = f.read()
+            digest.update(len(content).to_bytes(8, "big"))
+            digest.update(content)
+
+        return os.path.join(self.cache_dir, f"model-{digest.hexdigest()}.snapshot")
+
+    def _load_snapshot(self):
+        """
+        Load the SID tables from the snapshot cache.
+
+        Returns:
+            Tuple of (sids: dict, types: dict, key_mapping: dict), or None if
+            there is no valid snapshot for the current SID files.
+        """
+
+        path = self._snapshot_path()
+        try:
+            with open(path, "rb") as f:
+                snapshot = marshal.loads(f.read())
+            version, tables = snapshot
+            if version != SNAPSHOT_FORMAT:
+                raise ValueError(f"unsupported snapshot format {version}")
+        except FileNotFoundError:
+            _logger.debug("No model snapshot at %s", path)
+            return None
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            _logger.warning("Ignoring unreadable model snapshot %s: %s", path, e)
+            return None
+
+        _logger.debug("Loaded model snapshot: %s", path)
+        return tables
+
+    def _save_snapshot(self, tables) -> None:
+        """Write the SID tables to the snapshot cache (atomically; errors are logged)."""
+
+        path = self._snapshot_path()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".model-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(marshal.dumps((SNAPSHOT_FORMAT, tables)))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            _logger.warning("Could not write model snapshot %s: %s", path, e)
+            return
+
+        _logger.debug("Saved model snapshot: %s", path)
+
+    ## SID Files
+    # --------------------------------------------------------------------------
 
     def _parse_sid_file(self, sid_filename: str) -> tuple:
         """
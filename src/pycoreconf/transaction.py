@@ -0,0 +1,194 @@
+# Batched, all-or-nothing datastore edits
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class UndoLog:
+    """
+    Changes made to a SID tree, recorded before they are made so they can be reverted.
+
+    Dict slots are saved with their previous value (or as missing) on every
+    write; lists are saved once, as a shallow copy of their entries, before
+    their first change.
+    """
+
+    __slots__ = ("_slots", "_lists")
+
+    def __init__(self):
+        self._slots = []  # [(holder, slot, previous value)]
+        self._lists = {}  # {id(list): (list, saved entries)}
+
+    def save_slot(self, holder, slot):
+        """Record the current value of holder[slot], before it is set or removed."""
+        self._slots.append((holder, slot, holder.get(slot, _MISSING)))
+
+    def save_entries(self, entries):
+        """Record the entries of a list, before an entry is added or removed."""
+        if id(entries) not in self._lists:
+            self._lists[id(entries)] = (entries, list(entries))
+
+    def rollback(self):
+        """Revert every recorded change, most recent first."""
+        for holder, slot, previous in reversed(self._slots):
+            if previous is _MISSING:
+                holder.pop(slot, None)
+            else:
+                holder[slot] = previous
+        for entries, saved in self._lists.values():
+            entries[:] = saved
+
+
+class Transaction:
+    """
+    Edits to a CORECONFDatastore, applied together on commit (see CORECONFDatastore.transaction()).
+
+    XPaths are compiled and values converted when an edit is queued, so that
+    invalid paths and values are reported before anything is applied. On commit,
+    the edits are applied in order in a single pass: the parent node of a leaf
+    is located once and reused by the following edits under it, and the list
+    indexes of replaced subtrees are invalidated once, at the end. If an edit
+    fails, all the changes already made are reverted and the error is re-raised.
+
+    Example:
+        - with ds.transaction() as tx:
+              tx["/greeting/message"] = "Hello!"
+              del tx["/greeting/author"]
+    """
+
+    def __init__(self, datastore):
+        self._ds = datastore
+        self._ops = [] # [(operation, compiled xpath, keys, converted value, xpath)]
+        self._done = False
+
+    def __setitem__(self, xpath, value):
+        """Queue a write of a YANG value at XPath (as ds[xpath] = value)."""
+        self._queue("set", xpath, value)
+
+    def __delitem__(self, xpath):
+        """Queue the removal of the node at XPath (as del ds[xpath])."""
+        self._queue("delete", xpath, None)
+
+    def merge(self, xpath, value):
+        """
+        Queue a merge of a YANG value into the node at XPath.
+
+        Containers are merged recursively and list entries matched by their key
+        values (unmatched entries are appended); leaves and leaf-lists are replaced.
+        """
+        self._queue("merge", xpath, value)
+
+    def __len__(self):
+        return len(self._ops)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def commit(self):
+        """
+        Apply the queued edits.
+
+        Raises:
+            KeyError: If a deleted path does not exist (no edit is applied).
+            TypeError: If a list entry is written with a non-dict value (no edit is applied).
+            RuntimeError: If the transaction was already committed or rolled back.
+        """
+
+        self._check_open()
+        self._done = True
+
+        ds = self._ds
+        undo = UndoLog()
+        stale = []
+        parents = {} # {(parent SID, keys): parent node} located by earlier edits
+        journal = ds.journal is not None
+        journaled = [] # journal entries of each edit, made as it is applied (recorded on success)
+
+        try:
+            for operation, compiled, keys, value, xpath in self._ops:
+                if operation == "merge":
+                    changes = ds._merge(compiled, keys, value, xpath, undo)
+                    parents.clear()
+                    if journal:
+                        journaled.append(ds._journal_entries(compiled, keys, operation, value, changes))
+                    continue
+
+                if operation == "delete":
+                    ds._remove(compiled, keys, xpath, undo, stale)
+                    if ds.schema.nodes[compiled.target_sid].type is None or self._is_key(compiled):
+                        parents.clear() # a container, list or list entry was removed, or an entry lost a key
+                    if journal:
+                        journaled.append(ds._journal_entries(compiled, keys, operation, value))
+                    continue
+
+                chain = compiled.chain
+                parent_key = self._parent_key(compiled, keys)
+                parent = parents.get(parent_key) if parent_key is not None else None
+
+                if parent is not None:
+                    located = (parent, chain[-1][0] - parent_key[0])
+                else:
+                    located = ds._locate(chain, keys, create=True, undo=undo)
+                    if parent_key is not None:
+                        parents[parent_key] = located[0]
+
+                changes = ds._write(compiled, keys, value, xpath, located, undo, stale)
+                if isinstance(value, (dict, list)) or self._is_key(compiled):
+                    parents.clear() # the nodes below the target were replaced, or an entry was rekeyed
+                if journal:
+                    journaled.append(ds._journal_entries(compiled, keys, operation, value, changes))
+        except Exception:
+            undo.rollback()
+            ds._list_indexes.clear()
+            _logger.debug("Transaction rolled back (edits=%d)", len(self._ops))
+            raise
+
+        ds._invalidate_subtrees(stale)
+        for i, (operation, compiled, keys, value, _) in enumerate(self._ops):
+            ds._record(compiled, keys, operation, value, entries=journaled[i] if journal else None)
+
+        _logger.debug("Transaction committed (edits=%d)", len(self._ops))
+
+    def rollback(self):
+        """Discard the queued edits."""
+        self._check_open()
+        self._done = True
+        self._ops.clear()
+
+    def _queue(self, operation, xpath, value):
+        self._check_open()
+        compiled, keys = self._ds._compile_xpath(xpath)
+        if operation != "delete":
+            value = self._ds._to_sid_value(compiled.target_sid, value)
+        self._ops.append((operation, compiled, keys, value, xpath))
+
+    def _check_open(self):
+        if self._done:
+            raise RuntimeError("Transaction already committed or rolled back")
+
+    @staticmethod
+    def _is_key(compiled):
+        """Return True if the target is a key leaf of its enclosing list entry."""
+        chain = compiled.chain
+        return len(chain) > 1 and bool(chain[-2][1]) and chain[-1][0] in chain[-2][1]
+
+    @staticmethod
+    def _parent_key(compiled, keys):
+        """
+        Return (parent SID, keys) identifying the parent node of the target,
+        or None if the target is a list entry (its holder is the list itself).
+        """
+        if len(keys) != compiled.parent_key_count:
+            return None
+        chain = compiled.chain
+        return (chain[-2][0] if len(chain) > 1 else 0, keys)
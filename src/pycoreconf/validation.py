@@ -0,0 +1,436 @@
+# Native validation of identifier- and SID-keyed trees against the SID tables
+
+import base64
+import binascii
+import cbor2 as cbor
+import logging
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+from .converters import (
+    INTEGER_TYPES, WIDE_INTEGER_TYPES, UNHANDLED_TYPES,
+    BITS_CBOR_TAG_VALUE, ENUMERATION_CBOR_TAG_VALUE,
+    IDENTITYREF_CBOR_TAG_VALUE, INSTANCE_IDENTIFIER_CBOR_TAG_VALUE,
+)
+
+_logger = logging.getLogger(__name__)
+
+# Problem found in a tree: data path (e.g. "/module:list[2]/leaf") and description
+ValidationIssue = namedtuple("ValidationIssue", ["path", "message"])
+
+# Value ranges of the YANG integer types
+_INTEGER_RANGES = {
+    "int8": (-2**7, 2**7 - 1),
+    "int16": (-2**15, 2**15 - 1),
+    "int32": (-2**31, 2**31 - 1),
+    "int64": (-2**63, 2**63 - 1),
+    "uint8": (0, 2**8 - 1),
+    "uint16": (0, 2**16 - 1),
+    "uint32": (0, 2**32 - 1),
+    "uint64": (0, 2**64 - 1),
+}
+
+# Member types expected for a tagged union value (RFC 9254 Section 6.12)
+_TAGGED_TYPES = {
+    IDENTITYREF_CBOR_TAG_VALUE: "identityref",
+    BITS_CBOR_TAG_VALUE: "bits",
+    INSTANCE_IDENTIFIER_CBOR_TAG_VALUE: "instance-identifier",
+}
+
+_MISSING = object()
+
+
+class ConfigValidationError(Exception):
+    """
+    Raised when config validation fails.
+
+    Attributes:
+        errors: List of ValidationIssue found by the native validator
+                (empty when the error wraps a yangson exception).
+    """
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = list(errors) if errors else []
+
+
+def _accept(value):
+    return None
+
+
+def _is_int(value):
+    return type(value) is int
+
+
+def _is_number(value):
+    return type(value) in (int, float) or isinstance(value, Decimal)
+
+
+def _type_error(dtype, value):
+    return f"invalid {dtype} value {value!r}"
+
+
+class Validator:
+    """
+    Validator of config trees compiled from the schema tree of a model.
+
+    Each typed leaf gets a check for its identifier-tree (JSON/Python) and
+    SID-tree (CBOR) representations, compiled once; trees are then walked
+    against the schema, checking:
+      - member names/SIDs exist under their parent,
+      - containers are maps, lists are arrays of entries,
+      - leaf values match their type (integer ranges by width, enumeration
+        names/values, existing identities, ...),
+      - list entries have all their keys, and key values are unique.
+
+    Types without a native representation check (e.g. typedefs such as
+    yang:date-and-time, leafref) accept any leaf value.
+
+    Example:
+        - issues = Validator(model.schema, model.sids).check_identifier_tree(config)
+    """
+
+    def __init__(self, schema, sids):
+        self.schema = schema
+        self._sids = sids
+        self._identifier_checks = {}
+        self._sid_checks = {}
+
+        for sid, node in schema.nodes.items():
+            if node.kind == "leaf":
+                self._identifier_checks[sid] = self._compile_check(node.type, cbor_form=False)
+                self._sid_checks[sid] = self._compile_check(node.type, cbor_form=True)
+
+        _logger.debug("Compiled validator (leaves=%d)", len(self._sid_checks))
+
+    # Tree walks
+    # --------------------------------------------------------------------------
+
+    def check_identifier_tree(self, config):
+        """
+        Validate an identifier-keyed tree (as accepted by encode()).
+
+        Returns:
+            List of ValidationIssue (empty if the tree is valid).
+        """
+        issues = []
+        if type(config) is not dict:
+            issues.append(ValidationIssue("/", "expected an object"))
+        else:
+            self._walk_identifier_children(config, self.schema.root, (None, ""), issues)
+        return issues
+
+    def check_sid_tree(self, data, sid=0, path=None):
+        """
+        Validate a SID-keyed tree, or the subtree of a node.
+
+        Args:
+            data: SID-keyed tree (deltas relative to *sid*), or value of node *sid*.
+            sid: SID of the node holding *data* (0 for a whole tree).
+            path: Data path of the node, used in issue paths (default: its identifier).
+
+        Returns:
+            List of ValidationIssue (empty if the tree is valid).
+        """
+        issues = []
+        node = self.schema.root if sid == 0 else self.schema.nodes[sid]
+        trail = (None, path if path is not None else (node.identifier if sid else ""))
+        if node.kind == "root":
+            if type(data) is not dict:
+                issues.append(ValidationIssue("/", "expected a map"))
+            else:
+                self._walk_sid_children(data, node, trail, issues)
+        else:
+            self._check_sid_node(data, node, trail, issues)
+        return issues
+
+    def check_sid_entry(self, entry, list_sid, path=None):
+        """Validate a SID-keyed list entry of the list *list_sid*."""
+        issues = []
+        node = self.schema.nodes[list_sid]
+        self._check_sid_entry(entry, node, (None, path if path is not None else node.identifier), issues)
+        return issues
+
+    def check_unique_keys(self, entries, list_sid, path=None):
+        """Validate that the entries of a SID-keyed list instance have unique key values."""
+        issues = []
+        node = self.schema.nodes[list_sid]
+        key_deltas = [k_sid - list_sid for k_sid in node.key_sids]
+        self._check_unique(entries, key_deltas, (None, path if path is not None else node.identifier), issues)
+        return issues
+
+    def _walk_identifier_children(self, obj, parent, trail, issues):
+        for name, value in obj.items():
+            node = parent.child(name) if type(name) is str else None
+            if node is None and type(name) is str and "/" in name:
+                # Flattened member ("container/leaf"), resolved by its path as encode() does
+                sid = self._sids.get(parent.identifier.rstrip("/") + "/" + name)
+                node = self.schema.nodes.get(sid) if sid is not None else None
+            child_trail = (trail, "/" + str(name))
+            if node is None or node.kind == "identity":
+                issues.append(ValidationIssue(_format(child_trail), "unknown node"))
+                continue
+            self._check_identifier_node(value, node, child_trail, issues)
+
+    def _check_identifier_node(self, value, node, trail, issues):
+        kind = node.kind
+        if kind == "leaf":
+            self._check_leaf(self._identifier_checks[node.sid], value, trail, issues)
+        elif kind == "list":
+            if type(value) is not list:
+                issues.append(ValidationIssue(_format(trail), "expected a list"))
+                return
+            key_nodes = [self.schema.nodes[k_sid] for k_sid in node.key_sids]
+            seen = set()
+            for i, entry in enumerate(value):
+                entry_trail = (trail, f"[{i}]")
+                if type(entry) is not dict:
+                    issues.append(ValidationIssue(_format(entry_trail), "expected a list entry object"))
+                    continue
+                entry_keys = []
+                for key_node in key_nodes:
+                    key = entry.get(key_node.name, entry.get(key_node.qname, _MISSING))
+                    if key is _MISSING:
+                        issues.append(ValidationIssue(_format(entry_trail), f"missing key '{key_node.name}'"))
+                        break
+                    entry_keys.append(key)
+                else:
+                    self._check_duplicate(entry_keys, seen, entry_trail, issues)
+                self._walk_identifier_children(entry, node, entry_trail, issues)
+        elif type(value) is dict:
+            self._walk_identifier_children(value, node, trail, issues)
+        elif type(value) is list and all(type(entry) is dict for entry in value):
+            for i, entry in enumerate(value): # keyless list
+                self._walk_identifier_children(entry, node, (trail, f"[{i}]"), issues)
+        else:
+            issues.append(ValidationIssue(_format(trail), "expected an object"))
+
+    def _walk_sid_children(self, obj, parent, trail, issues):
+        nodes = self.schema.nodes
+        parent_sid = parent.sid
+        for delta, value in obj.items():
+            node = nodes.get(parent_sid + delta) if type(delta) is int else None
+            if node is None or node.parent is not parent:
+                issues.append(ValidationIssue(_format(trail) + f"/{delta}", f"unknown SID delta {delta!r}"))
+                continue
+            child_trail = (trail, "/" + (node.qname if parent_sid == 0 else node.name))
+            self._check_sid_node(value, node, child_trail, issues)
+
+    def _check_sid_node(self, value, node, trail, issues):
+        kind = node.kind
+        if kind == "leaf":
+            self._check_leaf(self._sid_checks[node.sid], value, trail, issues)
+        elif kind == "list":
+            if type(value) is not list:
+                issues.append(ValidationIssue(_format(trail), "expected an array"))
+                return
+            for i, entry in enumerate(value):
+                self._check_sid_entry(entry, node, (trail, f"[{i}]"), issues)
+            self._check_unique(value, [k_sid - node.sid for k_sid in node.key_sids], trail, issues)
+        elif type(value) is dict:
+            self._walk_sid_children(value, node, trail, issues)
+        elif type(value) is list and all(type(entry) is dict for entry in value):
+            for i, entry in enumerate(value): # keyless list
+                self._walk_sid_children(entry, node, (trail, f"[{i}]"), issues)
+        else:
+            issues.append(ValidationIssue(_format(trail), "expected a map"))
+
+    def _check_sid_entry(self, entry, node, trail, issues):
+        if type(entry) is not dict:
+            issues.append(ValidationIssue(_format(trail), "expected a list entry map"))
+            return
+        for k_sid in node.key_sids:
+            if k_sid - node.sid not in entry:
+                issues.append(ValidationIssue(_format(trail), f"missing key '{self.schema.nodes[k_sid].name}'"))
+        self._walk_sid_children(entry, node, trail, issues)
+
+    def _check_unique(self, entries, key_deltas, trail, issues):
+        seen = set()
+        for i, entry in enumerate(entries):
+            if type(entry) is dict and all(d in entry for d in key_deltas):
+                self._check_duplicate([entry[d] for d in key_deltas], seen, (trail, f"[{i}]"), issues)
+
+    @staticmethod
+    def _check_duplicate(key_values, seen, trail, issues):
+        try:
+            key = tuple(key_values)
+            hash(key)
+        except TypeError:
+            key = repr(key_values)
+        if key in seen:
+            issues.append(ValidationIssue(_format(trail), f"duplicate key values {list(key_values)!r}"))
+        seen.add(key)
+
+    @staticmethod
+    def _check_leaf(check, value, trail, issues):
+        if type(value) is dict:
+            issues.append(ValidationIssue(_format(trail), "expected a leaf value"))
+            return
+        if type(value) is list: # leaf-list
+            for i, item in enumerate(value):
+                error = check(item)
+                if error is not None:
+                    issues.append(ValidationIssue(_format((trail, f"[{i}]")), error))
+            return
+        error = check(value)
+        if error is not None:
+            issues.append(ValidationIssue(_format(trail), error))
+
+    # Leaf checks
+    # --------------------------------------------------------------------------
+
+    def _compile_check(self, dtype, cbor_form):
+        """
+        Compile the check of a leaf value of a YANG type.
+
+        Args:
+            dtype: YANG data type definition (name, enumeration dict or union list).
+            cbor_form: If True, check the SID-tree (CBOR) representation,
+                       otherwise the identifier-tree (JSON/Python) one.
+
+        Returns:
+            Callable taking a leaf value and returning an error message, or None.
+        """
+
+        if type(dtype) is str:
+            return self._compile_builtin_check(dtype, cbor_form)
+
+        if type(dtype) is dict: # enumeration ({"value":"name"})
+            if cbor_form:
+                values = frozenset(int(value) for value in dtype)
+                def check_enum(leaf):
+                    if type(leaf) is cbor.CBORTag and leaf.tag == ENUMERATION_CBOR_TAG_VALUE:
+                        leaf = leaf.value
+                    if _is_int(leaf) and leaf in values:
+                        return None
+                    return f"invalid enumeration value {leaf!r}"
+            else:
+                names = frozenset(dtype.values())
+                def check_enum(leaf):
+                    if type(leaf) is str and leaf in names:
+                        return None
+                    return f"invalid enumeration value {leaf!r}"
+            return check_enum
+
+        if type(dtype) is list: # union
+            return self._compile_union_check(dtype, cbor_form)
+
+        return _accept
+
+    def _compile_builtin_check(self, dtype, cbor_form):
+        if dtype in INTEGER_TYPES:
+            low, high = _INTEGER_RANGES[dtype]
+            as_string = not cbor_form and dtype in WIDE_INTEGER_TYPES # RFC 7951
+            def check_integer(leaf):
+                value = leaf
+                if as_string and type(leaf) is str:
+                    try:
+                        value = int(leaf)
+                    except ValueError:
+                        return _type_error(dtype, leaf)
+                if not _is_int(value):
+                    return _type_error(dtype, leaf)
+                if not low <= value <= high:
+                    return f"{dtype} value {value} out of range [{low}, {high}]"
+                return None
+            return check_integer
+
+        if dtype in ("string", "inet:uri"):
+            return lambda leaf: None if type(leaf) is str else _type_error(dtype, leaf)
+
+        if dtype == "boolean":
+            return lambda leaf: None if type(leaf) is bool else _type_error(dtype, leaf)
+
+        if dtype == "decimal64":
+            def check_decimal(leaf):
+                if _is_number(leaf):
+                    return None
+                if not cbor_form and type(leaf) is str: # RFC 7951
+                    try:
+                        Decimal(leaf)
+                        return None
+                    except InvalidOperation:
+                        pass
+                return _type_error(dtype, leaf)
+            return check_decimal
+
+        if dtype == "binary":
+            if cbor_form:
+                return lambda leaf: None if type(leaf) is bytes else _type_error(dtype, leaf)
+            def check_base64(leaf):
+                if type(leaf) is str:
+                    try:
+                        base64.b64decode(leaf, validate=True)
+                        return None
+                    except (binascii.Error, ValueError):
+                        pass
+                return _type_error(dtype, leaf)
+            return check_base64
+
+        if dtype == "identityref":
+            nodes = self.schema.nodes
+            if cbor_form:
+                def check_identity(leaf):
+                    if type(leaf) is cbor.CBORTag and leaf.tag == IDENTITYREF_CBOR_TAG_VALUE:
+                        leaf = leaf.value
+                    node = nodes.get(leaf) if _is_int(leaf) else None
+                    if node is None or node.kind != "identity":
+                        return f"unknown identity SID {leaf!r}"
+                    return None
+            else:
+                sids = self._sids
+                def check_identity(leaf):
+                    node = nodes.get(sids.get(leaf)) if type(leaf) is str else None
+                    if node is None or node.kind != "identity":
+                        return f"unknown identity {leaf!r}"
+                    return None
+            return check_identity
+
+        if dtype == "bits":
+            accepted = (bytes, str) if cbor_form else (str,)
+            return lambda leaf: None if type(leaf) in accepted else _type_error(dtype, leaf)
+
+        if dtype in UNHANDLED_TYPES:
+            return _accept
+        return _accept # typedef (e.g. yang:date-and-time): not checked
+
+    def _compile_union_check(self, dtype, cbor_form):
+        """Compile a union check accepting a value valid for any member type."""
+
+        members = [(sub_dtype, self._compile_check(sub_dtype, cbor_form)) for sub_dtype in dtype]
+
+        def check_union(leaf):
+            if cbor_form and type(leaf) is cbor.CBORTag:
+                if leaf.tag == ENUMERATION_CBOR_TAG_VALUE:
+                    candidates = [check for sub_dtype, check in members if type(sub_dtype) is dict]
+                else:
+                    expected = _TAGGED_TYPES.get(leaf.tag)
+                    candidates = [check for sub_dtype, check in members if sub_dtype == expected]
+                if not candidates:
+                    return f"unexpected CBOR tag {leaf.tag} for union {dtype}"
+                leaf = leaf.value
+            else:
+                candidates = [check for _, check in members]
+
+            for check in candidates:
+                if check(leaf) is None:
+                    return None
+            return f"value {leaf!r} matches no member of union {dtype}"
+
+        return check_union
+
+
+def _format(trail):
+    """Return the data path of a trail of (parent trail, segment) pairs."""
+    segments = []
+    while trail is not None:
+        trail, segment = trail
+        segments.append(segment)
+    return "".join(reversed(segments)) or "/"
+
+
+def format_issues(issues, limit=5):
+    """Return a one-line summary of validation issues (the first *limit* listed)."""
+    shown = "; ".join(f"{issue.path}: {issue.message}" for issue in issues[:limit])
+    more = f"; ... ({len(issues) - limit} more)" if len(issues) > limit else ""
+    return f"{len(issues)} error(s): {shown}{more}"
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Unit tests for batch conversion (encode_many / decode_many)."""
+
+import unittest
+import helpers
+
+import pycoreconf
+from pycoreconf.batch import BatchItemError
+
+
+class TestBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ccm = pycoreconf.CORECONFModel(helpers.resolve_filepath("samples/basic/example-1.sid"))
+        cls.configs = [{"example-1:greeting": {"message": f"Hello {i}"}} for i in range(20)]
+        cls.payloads = [cls.ccm.encode(config) for config in cls.configs]
+
+    def test_in_process(self):
+        self.assertEqual(self.ccm.encode_many(iter(self.configs)), self.payloads)
+        self.assertEqual(self.ccm.decode_many(self.payloads), self.configs)
+
+    def test_process_pool_preserves_order(self):
+        with self.ccm.process_pool(2) as pool:
+            payloads = self.ccm.encode_many(self.configs, pool=pool, chunksize=3)
+            configs = self.ccm.decode_many(payloads, pool=pool, chunksize=3)
+
+        self.assertEqual(payloads, self.payloads)
+        self.assertEqual(configs, self.configs)
+
+    def test_capture_errors(self):
+        configs = list(self.configs[:3])
+        configs[1] = {"example-1:unknown": 1}
+
+        results = self.ccm.encode_many(configs, errors="capture")
+        self.assertEqual(results[0], self.payloads[0])
+        self.assertEqual(results[2], self.payloads[2])
+        self.assertIsInstance(results[1], BatchItemError)
+        self.assertEqual(results[1].index, 1)
+        self.assertIsInstance(results[1].error, KeyError)
+
+    def test_capture_errors_in_pool(self):
+        payloads = list(self.payloads[:4])
+        payloads[2] = b"\xff"
+
+        with self.ccm.process_pool(2) as pool:
+            results = self.ccm.decode_many(payloads, pool=pool, chunksize=1, errors="capture")
+
+        self.assertEqual(results[3], self.configs[3])
+        self.assertIsInstance(results[2], BatchItemError)
+        self.assertEqual(results[2].index, 2)
+
+    def test_raise_on_first_error(self):
+        with self.assertRaises(BatchItemError) as ctx:
+            self.ccm.decode_many([self.payloads[0], b"\xff"])
+        self.assertEqual(ctx.exception.index, 1)
+
+    def test_invalid_errors_mode(self):
+        with self.assertRaises(ValueError):
+            self.ccm.encode_many(self.configs, errors="ignore")
+
+
+if __name__ == "__main__":
+    unittest.main()
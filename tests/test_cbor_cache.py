@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Unit tests for incremental CBOR export (per-subtree cache behind ds.to_cbor())."""
+
+import json
+import random
+import unittest
+import helpers
+
+import cbor2 as cbor
+import pycoreconf
+
+RULE_5 = "/schc/rule[rule-id-value='5'][rule-id-length='3']"
+RULE_6 = "/schc/rule[rule-id-value='6'][rule-id-length='3']"
+ENTRY_1 = ("/entry[field-id='fid-ipv6-trafficclass'][field-position='1']"
+           "[direction-indicator='di-bidirectional']")
+
+
+class TestCborCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sids = [
+            helpers.resolve_filepath("samples/multisid/ietf-schc@2023-01-28.sid"),
+            helpers.resolve_filepath("samples/multisid/ietf-schc-oam@2021-11-10.sid"),
+        ]
+        cls.ccm = pycoreconf.CORECONFModel(sids)
+        with open(helpers.resolve_filepath("samples/multisid/schc.json")) as f:
+            cls.cbor_data = cls.ccm.encode(json.load(f))
+        cls.schc = cls.ccm.sids["/ietf-schc:schc"]
+
+    def setUp(self):
+        self.ds = self.ccm.create_datastore_from_cbor(self.cbor_data)
+        self.assertEqual(self.ds.to_cbor(), self.cbor_data)
+
+    def cached_entries(self):
+        return self.ds._cbor_cache._top[self.schc][2]
+
+    def assertExportMatches(self):
+        self.assertEqual(self.ds.to_cbor(), cbor.dumps(self.ds.data))
+
+    def test_only_changed_entry_reencoded(self):
+        rules = self.ds.data[self.schc][1]
+        before = {id(rule): self.cached_entries()[id(rule)][1] for rule in rules}
+
+        self.ds[RULE_5 + ENTRY_1 + "/field-length"] = 6
+        self.assertExportMatches()
+
+        for rule in rules:
+            cached = self.cached_entries()[id(rule)][1]
+            if rule is rules[0]: # rule 5
+                self.assertIsNot(cached, before[id(rule)])
+            else:
+                self.assertIs(cached, before[id(rule)])
+
+    def test_mutations_keep_export_consistent(self):
+        self.ds[RULE_6 + "/rule-id-value"] = 16 # key change
+        self.assertExportMatches()
+        del self.ds["/schc/rule[rule-id-value='16'][rule-id-length='3']"]
+        self.assertExportMatches()
+        self.ds["/schc/rule[rule-id-value='20'][rule-id-length='4']/rule-nature"] = "ietf-schc:nature-compression"
+        self.assertExportMatches()
+        del self.ds[RULE_5 + ENTRY_1]
+        self.assertExportMatches()
+
+        with self.ds.transaction() as tx:
+            tx.merge("/schc", {"rule": [{"rule-id-value": 5, "rule-id-length": 3, "rule-nature": "ietf-schc:nature-no-compression"}]})
+        self.assertExportMatches()
+
+        with self.assertRaises(KeyError):
+            with self.ds.transaction() as tx:
+                tx[RULE_5 + "/rule-nature"] = "ietf-schc:nature-compression"
+                del tx[RULE_6]
+        self.assertExportMatches()
+
+        del self.ds["/schc"]
+        self.assertEqual(self.ds.to_cbor(), cbor.dumps({}))
+
+    def test_random_edits(self):
+        rng = random.Random(0)
+        paths = self.ds.predicates("/schc/rule")
+        for _ in range(50):
+            rule = "/schc/rule" + rng.choice(paths)
+            if rng.random() < 0.5:
+                self.ds[rule + "/rule-nature"] = rng.choice(["ietf-schc:nature-compression", "ietf-schc:nature-no-compression"])
+            else:
+                self.ds[rule + "/fcn-size"] = rng.randint(1, 8)
+            self.assertExportMatches()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Unit tests for the compiled leaf converters (pycoreconf.converters)."""
+
+import logging
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import cbor2 as cbor
+from pycoreconf import converters
+from pycoreconf.converters import TypeWarnings, compile_encoder, compile_decoder
+
+
+SIDS = {"mod:ident-a": 1000, "mod:ident-b": 1001}
+IDS = {v: k for k, v in SIDS.items()}
+ENUM = {"0": "off", "1": "on"}
+
+
+class TestCompiledEncoder(unittest.TestCase):
+    def test_scalar_types(self):
+        self.assertEqual(compile_encoder("uint8", SIDS)("7"), 7)
+        self.assertEqual(compile_encoder("decimal64", SIDS)("1.5"), 1.5)
+        self.assertEqual(compile_encoder("binary", SIDS)("AQI="), b"\x01\x02")
+        self.assertEqual(compile_encoder("identityref", SIDS)("mod:ident-b"), 1001)
+
+    def test_enumeration(self):
+        self.assertEqual(compile_encoder(ENUM, SIDS)("on"), 1)
+        with self.assertRaises(KeyError):
+            compile_encoder(ENUM, SIDS)("unknown")
+
+    def test_union_tags_member_type(self):
+        encode = compile_encoder(["identityref", ENUM, "uint8"], SIDS)
+
+        self.assertEqual(encode("mod:ident-a"), cbor.CBORTag(45, 1000))
+        self.assertEqual(encode("off"), cbor.CBORTag(44, 0))
+        self.assertEqual(encode(12), 12)
+
+
+class TestCompiledDecoder(unittest.TestCase):
+    def test_scalar_types(self):
+        self.assertEqual(compile_decoder("binary", IDS)(b"\x01\x02"), "AQI=")
+        self.assertEqual(compile_decoder("identityref", IDS)(1000), "mod:ident-a")
+        self.assertEqual(compile_decoder(ENUM, IDS)(1), "on")
+
+    def test_rfc7951_json_representations(self):
+        self.assertEqual(compile_decoder("int64", IDS)(2**40), 2**40)
+        self.assertEqual(compile_decoder("int64", IDS, use_native_types=False)(2**40), str(2**40))
+        self.assertEqual(compile_decoder("decimal64", IDS, use_native_types=False)(1.5), "1.5")
+        self.assertEqual(compile_decoder("unknown", IDS, use_native_types=False)(Decimal("0.1")), "0.1")
+
+    def test_union_tagged_values(self):
+        decode = compile_decoder(["identityref", ENUM, "uint8"], IDS)
+
+        self.assertEqual(decode(cbor.CBORTag(45, 1001)), "mod:ident-b")
+        self.assertEqual(decode(cbor.CBORTag(44, 1)), "on")
+        self.assertEqual(decode(5), 5)
+
+
+
+class TestTypeWarnings(unittest.TestCase):
+    def test_logged_once_per_sid(self):
+        type_warnings = TypeWarnings()
+        unhandled = compile_encoder("leafref", SIDS, sid=10, type_warnings=type_warnings)
+        union = compile_decoder(["identityref", "uint8"], IDS, sid=11, type_warnings=type_warnings)
+
+        with self.assertLogs("pycoreconf.converters", "WARNING") as logs:
+            for _ in range(3):
+                self.assertEqual(unhandled("x"), "x")
+                self.assertEqual(union("not-a-number"), "not-a-number")
+            compile_encoder("leafref", SIDS, sid=12, type_warnings=type_warnings)("y")
+
+        self.assertEqual(len(logs.records), 3)
+        self.assertEqual(type_warnings.counts(),
+                         {(10, "unhandled"): 3, (11, "union"): 3, (12, "unhandled"): 1})
+
+        type_warnings.reset()
+        self.assertEqual(type_warnings.counts(), {})
+
+    def test_counted_per_model(self):
+        first, second = TypeWarnings(), TypeWarnings()
+        with self.assertLogs("pycoreconf.converters", "WARNING") as logs:
+            compile_encoder("leafref", SIDS, sid=10, type_warnings=first)("x")
+            compile_encoder("leafref", SIDS, sid=10, type_warnings=second)("x")
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(first.counts(), {(10, "unhandled"): 1})
+        self.assertEqual(second.counts(), {(10, "unhandled"): 1})
+
+    def test_thread_safe_counts(self):
+        type_warnings = TypeWarnings()
+        unhandled = compile_encoder("leafref", SIDS, sid=10, type_warnings=type_warnings)
+        with self.assertLogs("pycoreconf.converters", "WARNING"):
+            with ThreadPoolExecutor(4) as pool:
+                list(pool.map(unhandled, range(2000)))
+        self.assertEqual(type_warnings.counts(), {(10, "unhandled"): 2000})
+
+    def test_trace_flag(self):
+        encode = compile_encoder(["uint8", "string"], SIDS, sid=10)
+        logger = logging.getLogger("pycoreconf.converters")
+        level = logger.level
+        logger.setLevel(logging.DEBUG)
+        self.addCleanup(logger.setLevel, level)
+
+        with self.assertLogs(logger, "DEBUG") as logs:
+            encode("7")
+            logger.debug("end")
+        self.assertEqual([r.getMessage() for r in logs.records], ["end"])
+
+        converters.TRACE = True
+        self.addCleanup(setattr, converters, "TRACE", False)
+        with self.assertLogs(logger, "DEBUG") as logs:
+            encode("7")
+        self.assertEqual(logs.records[0].getMessage(), "Matched union subtype uint8")
+
+
+if __name__ == "__main__":
+    unittest.main()
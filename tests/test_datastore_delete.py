@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Unit tests for in-place CORECONFDatastore.__delitem__()."""
+
+import unittest
+import json
+import helpers
+
+import pycoreconf
+
+
+class TestDatastoreDelete(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sid_path = helpers.resolve_filepath("samples/datastore/coreconf-m2m@2026-03-29.sid")
+        cls.model = pycoreconf.CORECONFModel(cls.sid_path)
+
+    def setUp(self):
+        self.ds = self.model.create_datastore()
+        self.solar = "/transducers/transducer[type='solar-radiation'][id='0']"
+        self.wind = "/transducers/transducer[type='wind-speed'][id='1']"
+        self.ds[self.solar] = {"precision": 2, "unit": "W/m2"}
+        self.ds[self.wind] = {"precision": 1}
+
+    def test_delete_list_entry(self):
+        del self.ds[self.solar]
+
+        self.assertIsNone(self.ds[self.solar])
+        self.assertEqual(self.ds.predicates("/transducers/transducer"), ["[type='wind-speed'][id='1']"])
+
+    def test_delete_leaf_in_entry(self):
+        del self.ds[self.solar + "/precision"]
+
+        self.assertIsNone(self.ds[self.solar + "/precision"])
+        self.assertEqual(self.ds[self.solar + "/unit"], "W/m2")
+        self.assertEqual(self.ds[self.wind + "/precision"], 1)
+
+    def test_delete_container(self):
+        self.ds["/state/uptime"] = 10
+        del self.ds["/state"]
+
+        result = json.loads(self.ds.to_json())
+        self.assertNotIn("coreconf-m2m:state", result)
+        self.assertIn("coreconf-m2m:transducers", result)
+
+    def test_delete_top_level_leaf(self):
+        self.ds["/characteristics/name"] = "station"
+        del self.ds["/characteristics/name"]
+
+        result = json.loads(self.ds.to_json())
+        self.assertEqual(result["coreconf-m2m:characteristics"], {})
+
+    def test_delete_missing_raises(self):
+        with self.assertRaises(KeyError):
+            del self.ds["/transducers/transducer[type='tilt'][id='9']"]
+        with self.assertRaises(KeyError):
+            del self.ds[self.solar + "/quantity"]
+        with self.assertRaises(KeyError):
+            del self.ds["/state"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Unit tests for the datastore change journal and structural diff."""
+
+import copy
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import helpers
+
+import cbor2 as cbor
+import pycoreconf
+from pycoreconf.diff import JournalEntry
+from pycoreconf.sequence import read_sequence
+
+RULE_10 = "/schc/rule[rule-id-value='10'][rule-id-length='3']"
+RULE_11 = "/schc/rule[rule-id-value='11'][rule-id-length='3']"
+
+
+class TestJournal(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = pycoreconf.CORECONFModel(helpers.resolve_filepath("samples/datastore/ietf-schc@2026-02-24.sid"))
+        cls.rule_sid = cls.model.sids["/ietf-schc:schc/rule"]
+        cls.fcn_sid = cls.model.sids["/ietf-schc:schc/rule/fcn-size"]
+
+    def test_mutations_recorded(self):
+        ds = self.model.create_datastore()
+        ds.start_journal()
+        ds[RULE_10 + "/fcn-size"] = 3
+        with ds.transaction() as tx:
+            tx[RULE_11] = {"w-size": 2}
+        del ds[RULE_10 + "/fcn-size"]
+
+        self.assertEqual(ds.journal, [
+            JournalEntry([self.fcn_sid, 10, 3], "set", 3),
+            JournalEntry([self.rule_sid, 11, 3], "set", {self.model.sids["/ietf-schc:schc/rule/rule-id-value"] - self.rule_sid: 11,
+                                                           self.model.sids["/ietf-schc:schc/rule/rule-id-length"] - self.rule_sid: 3,
+                                                           self.model.sids["/ietf-schc:schc/rule/w-size"] - self.rule_sid: 2}),
+            JournalEntry([self.fcn_sid, 10, 3], "delete", None),
+        ])
+
+    def test_recorded_values_not_changed_by_later_edits(self):
+        ds = self.model.create_datastore()
+        ds.start_journal()
+        ds["/schc"] = {"rule": [{"rule-id-value": 11, "rule-id-length": 3, "w-size": 2}]}
+        recorded = copy.deepcopy(ds.data)
+        ds[RULE_11 + "/w-size"] = 5
+
+        schc_sid = self.model.sids["/ietf-schc:schc"]
+        self.assertEqual(ds.journal[0].value, recorded[schc_sid])
+        first = bytes.fromhex("a1") + cbor.dumps(schc_sid) + cbor.dumps(recorded[schc_sid])
+        self.assertTrue(ds.to_ipatch().startswith(first))
+
+    def test_merge_journaled_per_instance(self):
+        ds = self.model.create_datastore()
+        ds.start_journal()
+        ds[RULE_10 + "/fcn-size"] = 3
+        before = copy.deepcopy(ds.data)
+        ds.journal.clear()
+
+        with ds.transaction() as tx:
+            tx.merge("/schc", {"rule": [
+                {"rule-id-value": 10, "rule-id-length": 3, "fcn-size": 4, "w-size": 2},
+                {"rule-id-value": 11, "rule-id-length": 3, "w-size": 1},
+            ]})
+
+        # The merge does not replace /schc (which would drop rule 10 on the device)
+        expected = self.model.create_datastore()
+        expected.data = before
+        self.assertEqual(ds.to_ipatch(), ds.to_ipatch(expected.diff(ds)))
+        self.assertEqual([entry.iid for entry in ds.journal],
+                         [[self.fcn_sid, 10, 3], [self.model.sids["/ietf-schc:schc/rule/w-size"], 10, 3],
+                          [self.rule_sid, 11, 3]])
+
+    def apply_ipatch(self, ds, payload):
+        """Apply an iPATCH payload as a device would: each node is replaced (or removed)."""
+        for item in read_sequence(payload):
+            (iid, value), = item.value.items()
+            sid, keys = (iid[0], list(iid[1:])) if isinstance(iid, (list, tuple)) else (iid, [])
+            xpath = ds._create_xpath(sid, keys)
+            if ds[xpath] is not None:
+                del ds[xpath]
+            if value is not None:
+                ds[xpath] = ds._from_sid_value(sid, value)
+
+    def test_partial_entry_set_replayed(self):
+        ds = self.model.create_datastore()
+        ds[RULE_10] = {"fcn-size": 3, "w-size": 1, "rule-nature": "ietf-schc:nature-fragmentation"}
+        ds[RULE_10 + "/entry[entry-index='0']/field-position"] = 1
+        old = self.model.create_datastore()
+        old.data = copy.deepcopy(ds.data)
+
+        ds.start_journal()
+        ds[RULE_10] = {"w-size": 7, "fcn-size": 3} # partial set: leaves merged into the entry
+        with ds.transaction() as tx:
+            tx[RULE_11] = {"w-size": 2} # new entry
+            tx[RULE_10] = {"dtag-size": 4}
+
+        w_size = self.model.sids["/ietf-schc:schc/rule/w-size"]
+        self.assertEqual(ds.journal[0], JournalEntry([w_size, 10, 3], "set", 7)) # fcn-size unchanged
+
+        self.apply_ipatch(old, ds.to_ipatch())
+        self.assertEqual(old.diff(ds), [])
+        self.assertEqual(ds.diff(old), [])
+
+    def test_rolled_back_transaction_not_recorded(self):
+        ds = self.model.create_datastore()
+        ds.start_journal()
+        with self.assertRaises(KeyError):
+            with ds.transaction() as tx:
+                tx[RULE_10 + "/fcn-size"] = 3
+                del tx[RULE_11]
+        self.assertEqual(ds.journal, [])
+
+    def test_journal_to_ipatch(self):
+        ds = self.model.create_datastore()
+        ds.start_journal()
+        ds[RULE_10 + "/fcn-size"] = 3
+        del ds[RULE_10 + "/fcn-size"]
+
+        payload = ds.to_ipatch()
+        self.assertEqual(payload, bytes.fromhex("a1") + cbor.dumps([self.fcn_sid, 10, 3]) + cbor.dumps(3)
+                         + bytes.fromhex("a1") + cbor.dumps([self.fcn_sid, 10, 3]) + cbor.dumps(None))
+
+    def test_recording_opt_in(self):
+        ds = self.model.create_datastore()
+        ds[RULE_10 + "/fcn-size"] = 3
+        self.assertIsNone(ds.journal)
+        with self.assertRaises(ValueError):
+            ds.to_ipatch()
+        self.assertEqual(ds.to_ipatch([]), b"")
+
+        journal = ds.start_journal()
+        ds[RULE_10 + "/fcn-size"] = 4
+        self.assertIs(ds.start_journal(), journal)
+        self.assertEqual(journal, [JournalEntry([self.fcn_sid, 10, 3], "set", 4)])
+
+        ds.journal = None
+        ds[RULE_10 + "/fcn-size"] = 5
+        self.assertEqual(len(journal), 1)
+
+
+class TestDiff(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sids = [
+            helpers.resolve_filepath("samples/multisid/ietf-schc@2023-01-28.sid"),
+            helpers.resolve_filepath("samples/multisid/ietf-schc-oam@2021-11-10.sid"),
+        ]
+        cls.ccm = pycoreconf.CORECONFModel(sids)
+        with open(helpers.resolve_filepath("samples/multisid/schc.json")) as f:
+            cls.config = json.load(f)
+        cls.cbor_data = cls.ccm.encode(cls.config)
+
+    def datastores(self):
+        return (self.ccm.create_datastore_from_cbor(self.cbor_data),
+                self.ccm.create_datastore_from_cbor(self.cbor_data))
+
+    def test_identical(self):
+        ds, other = self.datastores()
+        self.assertEqual(ds.diff(other), [])
+        self.assertEqual(ds.to_ipatch(ds.diff(other)), b"")
+
+    def test_changes_matched_by_keys(self):
+        ds, other = self.datastores()
+        rule_5 = "/schc/rule[rule-id-value='5'][rule-id-length='3']"
+        entry = rule_5 + ("/entry[field-id='fid-ipv6-trafficclass'][field-position='1']"
+                          "[direction-indicator='di-bidirectional']")
+        other[entry + "/field-length"] = 6
+        del other["/schc/rule[rule-id-value='6'][rule-id-length='3']"]
+        other["/schc/rule[rule-id-value='9'][rule-id-length='3']/rule-nature"] = "ietf-schc:nature-no-compression"
+
+        # Reordered entries are matched by keys, not position
+        other.data[self.ccm.sids["/ietf-schc:schc"]][1].reverse()
+
+        sids = self.ccm.sids
+        rule_sid = sids["/ietf-schc:schc/rule"]
+        fid = sids["ietf-schc:fid-ipv6-trafficclass"]
+        di = sids["ietf-schc:di-bidirectional"]
+        nature_delta = sids["/ietf-schc:schc/rule/rule-nature"] - rule_sid
+
+        self.assertCountEqual(ds.diff(other), [
+            ([rule_sid, 6, 3], None),
+            ([sids["/ietf-schc:schc/rule/entry/field-length"], 5, 3, fid, 1, di], 6),
+            ([rule_sid, 9, 3], {sids["/ietf-schc:schc/rule/rule-id-value"] - rule_sid: 9,
+                                sids["/ietf-schc:schc/rule/rule-id-length"] - rule_sid: 3,
+                                nature_delta: sids["ietf-schc:nature-no-compression"]}),
+        ])
+
+    def test_diff_of_mapped_datastores(self):
+        ds, other = self.datastores()
+        other["/schc/rule[rule-id-value='8'][rule-id-length='3']/rule-nature"] = "ietf-schc:nature-compression"
+
+        tmp = tempfile.mkdtemp()
+        path = os.path.join(tmp, "snapshot.cbor")
+        with open(path, "wb") as f:
+            f.write(self.cbor_data)
+        mapped = self.ccm.create_datastore_from_file(path)
+        self.addCleanup(shutil.rmtree, tmp)
+
+        self.assertEqual(mapped.diff(other), ds.diff(other))
+        self.assertEqual(mapped.diff(self.ccm.create_datastore_from_file(path)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
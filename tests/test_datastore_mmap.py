@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Unit tests for memory-mapped datastores (create_datastore_from_file)."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import helpers
+
+import cbor2 as cbor
+import pycoreconf
+from pycoreconf.mapped import MappedNode
+
+RULE_5 = "/schc/rule[rule-id-value='5'][rule-id-length='3']"
+RULE_6 = "/schc/rule[rule-id-value='6'][rule-id-length='3']"
+
+
+class TestDatastoreFromFile(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sids = [
+            helpers.resolve_filepath("samples/multisid/ietf-schc@2023-01-28.sid"),
+            helpers.resolve_filepath("samples/multisid/ietf-schc-oam@2021-11-10.sid"),
+        ]
+        cls.ccm = pycoreconf.CORECONFModel(sids)
+        with open(helpers.resolve_filepath("samples/multisid/schc.json")) as f:
+            cls.config = json.load(f)
+        cls.cbor_data = cls.ccm.encode(cls.config)
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "snapshot.cbor")
+        with open(self.path, "wb") as f:
+            f.write(self.cbor_data)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def rules(self, ds):
+        return ds.data[self.ccm.sids["/ietf-schc:schc"]][1]
+
+    def test_read_matches_eager_datastore(self):
+        ds = self.ccm.create_datastore_from_file(self.path)
+        eager = self.ccm.create_datastore_from_cbor(self.cbor_data)
+
+        self.assertEqual(ds[RULE_6], eager[RULE_6])
+        self.assertEqual(ds[RULE_5 + "/rule-nature"], eager[RULE_5 + "/rule-nature"])
+        self.assertEqual(ds.predicates("/schc/rule"), eager.predicates("/schc/rule"))
+        self.assertEqual(json.loads(ds.to_json()), json.loads(eager.to_json()))
+
+    def test_only_accessed_path_is_resolved(self):
+        ds = self.ccm.create_datastore_from_file(self.path)
+        ds[RULE_5 + "/rule-nature"]
+
+        # Rule entries are resolved one level: their entry lists stay in the file
+        entry_delta = self.ccm.sids["/ietf-schc:schc/rule/entry"] - self.ccm.sids["/ietf-schc:schc/rule"]
+        with_entries = [rule for rule in self.rules(ds) if entry_delta in rule]
+        self.assertEqual(len(with_entries), 2)
+        for rule in with_entries:
+            self.assertIsInstance(rule[entry_delta], MappedNode)
+
+    def test_unmodified_write_back_is_identical(self):
+        ds = self.ccm.create_datastore_from_file(self.path)
+        ds[RULE_5]
+        self.assertEqual(ds.to_cbor(), self.cbor_data)
+
+    def test_copy_on_write(self):
+        ds = self.ccm.create_datastore_from_file(self.path)
+        eager = self.ccm.create_datastore_from_cbor(self.cbor_data)
+
+        for datastore in (ds, eager):
+            datastore[RULE_5 + "/rule-nature"] = "ietf-schc:nature-no-compression"
+            del datastore[RULE_6]
+
+        self.assertEqual(cbor.loads(ds.to_cbor()), cbor.loads(eager.to_cbor()))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.cbor_data)
+
+        # Writing back over the mapped file through a replacement file
+        tmp_path = self.path + ".new"
+        with open(tmp_path, "wb") as f:
+            f.write(ds.to_cbor())
+        os.replace(tmp_path, self.path)
+        reloaded = self.ccm.create_datastore_from_file(self.path)
+        self.assertEqual(reloaded[RULE_5 + "/rule-nature"], "ietf-schc:nature-no-compression")
+        self.assertIsNone(reloaded[RULE_6])
+
+    def test_without_mmap(self):
+        ds = self.ccm.create_datastore_from_file(self.path, mmap=False)
+        self.assertFalse(ds._mapped)
+        self.assertEqual(ds.to_cbor(), self.cbor_data)
+
+    def test_empty_file(self):
+        open(self.path, "wb").close()
+        ds = self.ccm.create_datastore_from_file(self.path)
+        self.assertEqual(ds.to_cbor(), cbor.dumps({}))
+
+
+if __name__ == "__main__":
+    unittest.main()
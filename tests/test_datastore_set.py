@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Unit tests for in-place CORECONFDatastore.__setitem__()."""
+
+import unittest
+import json
+import helpers
+
+import pycoreconf
+
+
+class TestDatastoreSet(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sid_path = helpers.resolve_filepath("samples/datastore/ietf-schc@2026-02-24.sid")
+        cls.model = pycoreconf.CORECONFModel(cls.sid_path)
+
+    def setUp(self):
+        self.ds = self.model.create_datastore()
+
+    def test_nested_entries_created_in_sid_tree(self):
+        self.ds["/schc/rule[rule-id-value='11'][rule-id-length='3']/entry[entry-index='0']/field-position"] = 1
+
+        # {schc: {rule: [{rule-id-value, rule-id-length, entry: [{entry-index, field-position}]}]}}
+        self.assertEqual(self.ds.data, {2678: {1: [{39: 11, 38: 3, 5: [{6: 0, 10: 1}]}]}})
+
+    def test_existing_entry_is_reused(self):
+        rule = "/schc/rule[rule-id-value='10'][rule-id-length='3']"
+        self.ds[rule + "/fcn-size"] = 3
+        self.ds[rule + "/w-size"] = 2
+
+        rules = self.ds.data[2678][1]
+        self.assertEqual(len(rules), 1)
+        self.assertEqual(rules[0][24], 3)
+        self.assertEqual(rules[0][43], 2)
+
+    def test_leaf_value_is_converted(self):
+        entry = "/schc/rule[rule-id-value='10'][rule-id-length='3']/entry[entry-index='0']"
+        self.ds[entry] = {}
+        self.ds[entry + "/field-id"] = "ietf-schc:fid-ipv6-version"
+
+        sid = self.model.sids["ietf-schc:fid-ipv6-version"]
+        self.assertEqual(self.ds.data[2678][1][0][5][0][7], sid)
+        self.assertEqual(self.ds[entry + "/field-id"], "ietf-schc:fid-ipv6-version")
+
+    def test_entry_dict_is_merged(self):
+        rule = "/schc/rule[rule-id-value='10'][rule-id-length='3']"
+        self.ds[rule] = {"fcn-size": 3}
+        self.ds[rule] = {"w-size": 2, "rule-nature": "ietf-schc:nature-fragmentation"}
+
+        result = json.loads(self.ds.to_json())
+        entry = result["ietf-schc:schc"]["rule"][0]
+        self.assertEqual(entry["fcn-size"], 3)
+        self.assertEqual(entry["w-size"], 2)
+        self.assertEqual(entry["rule-nature"], "ietf-schc:nature-fragmentation")
+
+    def test_container_value_replaces_subtree(self):
+        rule = "/schc/rule[rule-id-value='10'][rule-id-length='3']"
+        self.ds[rule + "/inactivity-timer"] = {"ticks-duration": 20}
+        self.ds[rule + "/inactivity-timer"] = {"ticks-numbers": 5}
+
+        self.assertEqual(self.ds[rule + "/inactivity-timer"], {"ticks-numbers": 5})
+
+    def test_non_dict_entry_value_raises(self):
+        with self.assertRaises(TypeError):
+            self.ds["/schc/rule[rule-id-value='10'][rule-id-length='3']"] = 1
+
+    def test_unknown_path_raises(self):
+        with self.assertRaises(KeyError):
+            self.ds["/schc/unknown"] = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
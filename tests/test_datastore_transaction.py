@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Unit tests for batched CORECONFDatastore edits (ds.transaction())."""
+
+import copy
+import unittest
+import helpers
+
+import pycoreconf
+
+RULE_10 = "/schc/rule[rule-id-value='10'][rule-id-length='3']"
+RULE_11 = "/schc/rule[rule-id-value='11'][rule-id-length='3']"
+
+
+class TestDatastoreTransaction(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sid_path = helpers.resolve_filepath("samples/datastore/ietf-schc@2026-02-24.sid")
+        cls.model = pycoreconf.CORECONFModel(cls.sid_path)
+
+    def setUp(self):
+        self.ds = self.model.create_datastore()
+        self.ds[RULE_10 + "/fcn-size"] = 3
+        self.ds[RULE_10 + "/entry[entry-index='0']/field-position"] = 1
+
+    def test_edits_applied_on_exit(self):
+        with self.ds.transaction() as tx:
+            tx[RULE_10 + "/w-size"] = 2
+            tx[RULE_10 + "/fcn-size"] = 4
+            tx[RULE_11 + "/rule-nature"] = "ietf-schc:nature-fragmentation"
+            del tx[RULE_10 + "/entry[entry-index='0']"]
+
+            # Nothing is applied before the block exits
+            self.assertIsNone(self.ds[RULE_10 + "/w-size"])
+
+        self.assertEqual(self.ds[RULE_10 + "/w-size"], 2)
+        self.assertEqual(self.ds[RULE_10 + "/fcn-size"], 4)
+        self.assertEqual(self.ds[RULE_11 + "/rule-nature"], "ietf-schc:nature-fragmentation")
+        self.assertIsNone(self.ds[RULE_10 + "/entry[entry-index='0']"])
+        self.assertEqual(self.ds.predicates("/schc/rule"),
+                         ["[rule-id-value='10'][rule-id-length='3']", "[rule-id-value='11'][rule-id-length='3']"])
+
+    def test_rekeyed_entry_matches_sequential_edits(self):
+        old_path = "/schc/rule[rule-id-value='10'][rule-id-length='3']"
+        steps = [(old_path + "/rule-id-value", 12), (old_path + "/rule-id-length", 4)]
+
+        sequential = self.model.create_datastore()
+        sequential[RULE_10 + "/fcn-size"] = 3
+        for path, value in steps:
+            sequential[path] = value
+
+        with self.ds.transaction() as tx:
+            for path, value in steps:
+                tx[path] = value
+
+        rules = self.ds.data[2678][1]
+        self.assertEqual(sorted((r[39], r[38]) for r in rules), [(10, 4), (12, 3)])
+        self.assertEqual(sorted((r[39], r[38]) for r in rules),
+                         sorted((r[39], r[38]) for r in sequential.data[2678][1]))
+
+    def test_failed_commit_rolls_back(self):
+        before = copy.deepcopy(self.ds.data)
+
+        with self.assertRaises(KeyError):
+            with self.ds.transaction() as tx:
+                tx[RULE_10 + "/w-size"] = 2
+                tx[RULE_11 + "/entry[entry-index='5']/field-position"] = 1
+                del tx[RULE_10 + "/entry[entry-index='0']"]
+                del tx[RULE_10 + "/l2-word-size"] # missing: fails on commit
+
+        self.assertEqual(self.ds.data, before)
+        self.assertIsNone(self.ds[RULE_11])
+        self.assertEqual(self.ds[RULE_10 + "/entry[entry-index='0']/field-position"], 1)
+
+    def test_error_in_block_discards_edits(self):
+        before = copy.deepcopy(self.ds.data)
+
+        with self.assertRaises(KeyError):
+            with self.ds.transaction() as tx:
+                tx[RULE_10 + "/w-size"] = 2
+                tx["/schc/unknown"] = 1 # rejected when queued
+
+        self.assertEqual(self.ds.data, before)
+
+    def test_merge(self):
+        with self.ds.transaction() as tx:
+            tx.merge("/schc", {"rule": [
+                {"rule-id-value": 10, "rule-id-length": 3, "w-size": 2,
+                 "entry": [{"entry-index": 1, "field-position": 2}]},
+                {"rule-id-value": 11, "rule-id-length": 3},
+            ]})
+
+        self.assertEqual(self.ds[RULE_10 + "/fcn-size"], 3)
+        self.assertEqual(self.ds[RULE_10 + "/w-size"], 2)
+        self.assertEqual(self.ds[RULE_10 + "/entry[entry-index='0']/field-position"], 1)
+        self.assertEqual(self.ds[RULE_10 + "/entry[entry-index='1']/field-position"], 2)
+        self.assertIsNotNone(self.ds[RULE_11])
+
+    def test_failed_merge_rolls_back(self):
+        before = copy.deepcopy(self.ds.data)
+
+        with self.assertRaises(TypeError):
+            with self.ds.transaction() as tx:
+                tx.merge(RULE_10, {"w-size": 2, "entry": [{"entry-index": 1}]})
+                tx[RULE_11] = 5 # list entry value must be a dict
+
+        self.assertEqual(self.ds.data, before)
+
+    def test_commit_twice_raises(self):
+        tx = self.ds.transaction()
+        tx[RULE_10 + "/w-size"] = 2
+        tx.commit()
+
+        self.assertEqual(self.ds[RULE_10 + "/w-size"], 2)
+        with self.assertRaises(RuntimeError):
+            tx.commit()
+
+
+if __name__ == "__main__":
+    unittest.main()
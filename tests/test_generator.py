@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Unit tests for the synthetic workload generator."""
+
+import io
+import json
+import unittest
+import helpers
+
+import cbor2 as cbor
+import pycoreconf
+from pycoreconf.generator import WorkloadGenerator
+
+SAMPLE_MODELS = [
+    ["samples/basic/example-1.sid"],
+    ["samples/libconf/example-2.sid"],
+    ["samples/multisid/ietf-schc@2023-01-28.sid", "samples/multisid/ietf-schc-oam@2021-11-10.sid"],
+    ["samples/datastore/coreconf-m2m@2026-03-29.sid"],
+    ["samples/datastore/ietf-schc@2026-02-24.sid"],
+]
+
+
+def load_model(sid_files):
+    return pycoreconf.CORECONFModel([helpers.resolve_filepath(p) for p in sid_files])
+
+
+class TestWorkloadGenerator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.schc = load_model(SAMPLE_MODELS[2])
+
+    def test_configs_valid_for_samples(self):
+        for sid_files in SAMPLE_MODELS:
+            with self.subTest(model=sid_files[0]):
+                ccm = load_model(sid_files)
+                config = WorkloadGenerator(ccm, seed=3).config(target_size=8192)
+                ccm.validate(config)
+                self.assertEqual(ccm.decode(ccm.encode(config)), config)
+
+    def test_deterministic(self):
+        first = WorkloadGenerator(self.schc, seed=7).config(target_size=4096)
+        self.assertEqual(WorkloadGenerator(self.schc, seed=7).config(target_size=4096), first)
+        self.assertNotEqual(WorkloadGenerator(self.schc, seed=8).config(target_size=4096), first)
+
+    def test_target_size(self):
+        for target in (10_000, 100_000):
+            size = len(self.schc.encode(WorkloadGenerator(self.schc).config(target_size=target)))
+            self.assertGreaterEqual(size, target)
+            self.assertLess(size, target * 1.1)
+
+    def test_key_values_exhausted(self):
+        # example-2 list "foo" is keyed by a uint8: at most 256 distinct entries
+        ccm = load_model(SAMPLE_MODELS[1])
+        config = WorkloadGenerator(ccm).config(target_size=10**6)
+        numbers = [entry["number"] for entry in config["example-2:bag"]["foo"]]
+        self.assertEqual(sorted(numbers), list(range(256)))
+        ccm.validate(config)
+
+    def test_write_formats(self):
+        gen = WorkloadGenerator(self.schc, seed=1)
+        expected = list(WorkloadGenerator(self.schc, seed=1).configs(3, target_size=2048))
+
+        text = io.StringIO()
+        self.assertEqual(gen.write(text, count=3, fmt="json", target_size=2048), 3)
+        self.assertEqual([json.loads(line) for line in text.getvalue().splitlines()], expected)
+
+        seq = io.BytesIO()
+        gen.write(seq, count=3, fmt="cbor-seq", target_size=2048)
+        seq.seek(0)
+        decoder = cbor.CBORDecoder(seq)
+        items = [decoder.decode() for _ in range(3)]
+        self.assertEqual(seq.tell(), len(seq.getvalue()))
+        self.assertEqual(items, [cbor.loads(self.schc.encode(config)) for config in expected])
+        seq.seek(0)
+        self.assertEqual(list(self.schc.iter_decode(seq, as_rfc7951=True)),
+                         [self.schc.decode(self.schc.encode(config), as_rfc7951=True) for config in expected])
+
+        single = io.BytesIO()
+        gen.write(single, fmt="cbor", target_size=2048)
+        self.assertEqual(single.getvalue(), self.schc.encode(expected[0]))
+
+        with self.assertRaises(ValueError):
+            gen.write(io.BytesIO(), count=2, fmt="cbor")
+        with self.assertRaises(ValueError):
+            gen.write(io.BytesIO(), fmt="xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
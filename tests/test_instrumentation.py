@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Unit tests for the optional instrumentation of models and datastores."""
+
+import unittest
+import helpers
+
+import pycoreconf
+from pycoreconf.instrumentation import Instrumentation, count_tree
+
+CONFIG = {"example-1:greeting": {"author": "Obi", "message": "Hello there!"}}
+RULE = "/schc/rule[rule-id-value='10'][rule-id-length='3']"
+
+
+class TestModelInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.ccm = pycoreconf.CORECONFModel(helpers.resolve_filepath("samples/basic/example-1.sid"))
+        self.addCleanup(self.ccm.disable_instrumentation)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self.ccm.instrumentation)
+        self.ccm.encode(CONFIG)
+
+        inst = self.ccm.enable_instrumentation()
+        self.assertIs(self.ccm.instrumentation, inst)
+        self.assertEqual(inst.snapshot(), {})
+
+        self.ccm.disable_instrumentation()
+        self.ccm.encode(CONFIG)
+        self.assertEqual(inst.snapshot(), {})
+
+    def test_encode_decode_counters(self):
+        inst = self.ccm.enable_instrumentation()
+        payload = self.ccm.encode(CONFIG)
+        self.ccm.encode(CONFIG)
+        self.ccm.decode(payload)
+
+        stats = inst.snapshot()
+        self.assertEqual(stats["encode"]["calls"], 2)
+        self.assertEqual(stats["encode"]["errors"], 0)
+        self.assertEqual(stats["encode"]["bytes_out"], 2 * len(payload))
+        self.assertEqual(stats["encode"]["nodes"], 2 * 2)  # config and greeting dicts
+        self.assertEqual(stats["encode"]["leaves"], 2 * 2)
+        self.assertGreater(stats["encode"]["seconds"], 0)
+
+        self.assertEqual(stats["decode"]["calls"], 1)
+        self.assertEqual(stats["decode"]["bytes_in"], len(payload))
+        self.assertEqual(stats["decode"]["leaves"], 2)
+
+    def test_keyword_arguments(self):
+        inst = self.ccm.enable_instrumentation()
+        payload = self.ccm.encode(config=CONFIG)
+        self.assertEqual(self.ccm.decode(data=payload, as_rfc7951=True), CONFIG)
+        self.assertEqual(self.ccm.decode_to_json(payload), '{"example-1:greeting": {"author": "Obi", "message": "Hello there!"}}')
+
+        stats = inst.snapshot()
+        self.assertEqual(stats["encode"]["bytes_out"], len(payload))
+        self.assertEqual(stats["encode"]["leaves"], 2)
+        self.assertEqual(stats["decode"]["calls"], 2)
+        self.assertEqual(stats["decode"]["bytes_in"], 2 * len(payload))
+        self.assertEqual(stats["decode"]["errors"], 0)
+
+    def test_errors_recorded(self):
+        inst = self.ccm.enable_instrumentation()
+        with self.assertRaises(Exception):
+            self.ccm.decode(b"\xff\xff")
+        self.assertEqual(inst.snapshot()["decode"]["errors"], 1)
+
+    def test_callbacks(self):
+        events = []
+        inst = self.ccm.enable_instrumentation(count_nodes=False,
+                                               callbacks=[lambda op, s, m: events.append((op, m))])
+        inst.add_callback(lambda op, s, m: 1 / 0)  # failures are logged, not raised
+
+        with self.assertLogs("pycoreconf.instrumentation", "ERROR"):
+            payload = self.ccm.encode(CONFIG)
+        self.assertEqual(events, [("encode", {"nodes": 0, "leaves": 0, "bytes_in": 0,
+                                              "bytes_out": len(payload), "error": False})])
+
+    def test_reset(self):
+        inst = self.ccm.enable_instrumentation()
+        self.ccm.encode(CONFIG)
+        inst.reset()
+        self.assertEqual(inst.snapshot(), {})
+
+    def test_count_tree(self):
+        self.assertEqual(count_tree({1: [{2: 3}, {2: 4}], 5: "x"}), (4, 3))
+        self.assertEqual(Instrumentation().snapshot(), {})
+
+
+class TestDatastoreInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.ccm = pycoreconf.CORECONFModel(helpers.resolve_filepath("samples/datastore/ietf-schc@2026-02-24.sid"))
+        self.ds = self.ccm.create_datastore()
+        self.inst = self.ccm.enable_instrumentation()
+        self.addCleanup(self.ccm.disable_instrumentation)
+
+    def test_operations(self):
+        self.ds[RULE + "/fcn-size"] = 3
+        self.assertEqual(self.ds[RULE + "/fcn-size"], 3)
+        self.assertEqual(self.ds.predicates("/schc/rule"), ["[rule-id-value='10'][rule-id-length='3']"])
+        payload = self.ds.to_cbor()
+        del self.ds[RULE + "/fcn-size"]
+
+        stats = self.inst.snapshot()
+        for op in ("set", "get", "predicates", "to_cbor", "delete"):
+            self.assertEqual(stats[op]["calls"], 1, op)
+        self.assertEqual(stats["set"]["leaves"], 1)
+        self.assertEqual(stats["predicates"]["nodes"], 1)
+        self.assertEqual(stats["to_cbor"]["bytes_out"], len(payload))
+
+        # XPath compilation is recorded on cache misses only
+        self.assertEqual(stats["resolve_xpath"]["calls"], 2)
+
+    def test_keyword_set(self):
+        self.ds.__setitem__(xpath=RULE + "/fcn-size", value=3)
+        self.assertEqual(self.inst.snapshot()["set"]["leaves"], 1)
+
+    def test_failed_set(self):
+        with self.assertRaises(KeyError):
+            self.ds["/schc/unknown"] = 1
+        self.assertEqual(self.inst.snapshot()["set"]["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
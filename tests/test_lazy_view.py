@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Unit tests for lazy CORECONF payload views (CORECONFModel.decode_lazy)."""
+
+import json
+import unittest
+import helpers
+
+import cbor2 as cbor
+import pycoreconf
+from pycoreconf.lazy import LazyMap, LazyList
+
+
+class TestLazyView(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sids = [
+            helpers.resolve_filepath("samples/multisid/ietf-schc@2023-01-28.sid"),
+            helpers.resolve_filepath("samples/multisid/ietf-schc-oam@2021-11-10.sid"),
+        ]
+        cls.ccm = pycoreconf.CORECONFModel(sids)
+        with open(helpers.resolve_filepath("samples/multisid/schc.json")) as f:
+            cls.config = json.load(f)
+        cls.cbor_data = cls.ccm.encode(cls.config)
+
+    def test_view_matches_decode(self):
+        view = self.ccm.decode_lazy(self.cbor_data)
+
+        self.assertIsInstance(view, LazyMap)
+        self.assertEqual(view, self.ccm.decode(self.cbor_data))
+        self.assertEqual(view.materialize(), self.config)
+
+    def test_only_accessed_subtrees_are_decoded(self):
+        view = self.ccm.decode_lazy(memoryview(self.cbor_data))
+        rules = view["ietf-schc:schc"]["rule"]
+
+        self.assertIsInstance(rules, LazyList)
+        expected = self.config["ietf-schc:schc"]["rule"][2]
+        self.assertEqual(rules[2]["rule-id-value"], expected["rule-id-value"])
+
+        # Only the accessed rule has been converted
+        self.assertEqual(list(rules._cache), [2])
+        self.assertEqual(list(rules[2]._cache), ["rule-id-value"])
+
+    def test_subtree_materialize(self):
+        view = self.ccm.decode_lazy(self.cbor_data)
+        rules = view["ietf-schc:schc"]["rule"]
+
+        self.assertEqual(rules.materialize(), self.config["ietf-schc:schc"]["rule"])
+        self.assertEqual(rules[-1].materialize(), self.config["ietf-schc:schc"]["rule"][-1])
+
+    def test_rfc7951_view(self):
+        view = self.ccm.decode_lazy(self.cbor_data, as_rfc7951=True)
+        self.assertEqual(view.materialize(), self.ccm.decode(self.cbor_data, as_rfc7951=True))
+
+    def test_missing_key_raises(self):
+        view = self.ccm.decode_lazy(self.cbor_data)
+        with self.assertRaises(KeyError):
+            view["ietf-schc:unknown"]
+
+
+class TestLazyViewEncoding(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ccm = pycoreconf.CORECONFModel(helpers.resolve_filepath("samples/basic/example-1.sid"))
+
+    def test_indefinite_length_map(self):
+        # {_ 60001: {_ 2: "Hi"}} (greeting/message)
+        data = b"\xbf" + cbor.dumps(60001) + b"\xbf\x02\x62Hi\xff\xff"
+        view = self.ccm.decode_lazy(data)
+
+        self.assertEqual(view["example-1:greeting"]["message"], "Hi")
+        self.assertEqual(len(view), 1)
+        self.assertEqual(view.materialize(), {"example-1:greeting": {"message": "Hi"}})
+
+    def test_truncated_payload_raises(self):
+        data = self.ccm.encode({"example-1:greeting": {"message": "Hello"}})
+        view = self.ccm.decode_lazy(data[:-2])
+        with self.assertRaises(cbor.CBORDecodeError):
+            view["example-1:greeting"]["message"]
+
+
+if __name__ == "__main__":
+    unittest.main()
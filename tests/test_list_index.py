@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Unit tests for the datastore list-entry key indexes."""
+
+import unittest
+import helpers
+
+import pycoreconf
+
+
+class TestListIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sid_path = helpers.resolve_filepath("samples/datastore/ietf-schc@2026-02-24.sid")
+        cls.model = pycoreconf.CORECONFModel(cls.sid_path)
+
+    def setUp(self):
+        self.ds = self.model.create_datastore()
+        for rule_id in range(3):
+            for entry_index in range(3):
+                path = self.entry(rule_id, entry_index)
+                self.ds[path + "/field-position"] = entry_index + 1
+
+    def rule(self, rule_id):
+        return f"/schc/rule[rule-id-value='{rule_id}'][rule-id-length='3']"
+
+    def entry(self, rule_id, entry_index):
+        return self.rule(rule_id) + f"/entry[entry-index='{entry_index}']"
+
+    def test_nested_list_instances_are_indexed_separately(self):
+        self.assertEqual(self.ds[self.entry(1, 2) + "/field-position"], 3)
+
+        # One index for the rules, one per entry list reached through a rule
+        self.assertIn((2679, ()), self.ds._list_indexes)
+        self.assertIn((2684, (1, 3)), self.ds._list_indexes)
+        self.assertEqual(list(self.ds._list_indexes[(2684, (1, 3))][1]),
+                         [(1, 3, 0), (1, 3, 1), (1, 3, 2)])
+
+    def test_delete_only_invalidates_changed_list(self):
+        other = self.ds._list_indexes[(2684, (0, 3))]
+        del self.ds[self.entry(1, 1)]
+
+        self.assertIs(self.ds._list_indexes[(2684, (0, 3))], other)
+        self.assertIsNone(self.ds[self.entry(1, 1)])
+        self.assertEqual(self.ds.predicates(self.rule(1) + "/entry"),
+                         ["[entry-index='0']", "[entry-index='2']"])
+
+    def test_delete_entry_drops_nested_indexes(self):
+        del self.ds[self.rule(2)]
+
+        self.assertNotIn((2684, (2, 3)), self.ds._list_indexes)
+        self.assertIn((2684, (0, 3)), self.ds._list_indexes)
+
+    def test_key_leaf_update_reindexes_entry(self):
+        self.ds[self.entry(0, 2) + "/entry-index"] = 7
+
+        self.assertIsNone(self.ds[self.entry(0, 2)])
+        self.assertEqual(self.ds[self.entry(0, 7) + "/field-position"], 3)
+
+    def test_new_entries_are_added_incrementally(self):
+        index = self.ds._list_indexes[(2679, ())][1]
+        self.ds[self.rule(9) + "/fcn-size"] = 1
+
+        self.assertIs(self.ds._list_indexes[(2679, ())][1], index)
+        self.assertIn((9, 3), index)
+
+    def test_replaced_list_is_reindexed(self):
+        self.ds[self.rule(0) + "/entry"] = [{"entry-index": 5}]
+
+        self.assertEqual(self.ds.predicates(self.rule(0) + "/entry"), ["[entry-index='5']"])
+        self.assertIsNone(self.ds[self.entry(0, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Unit tests for the compiled model snapshot cache (cache_dir)."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import helpers
+
+import pycoreconf
+from pycoreconf.sid import ModelSID
+
+
+class TestModelSnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp, "cache")
+        self.sid_file = os.path.join(self.tmp, "example-1.sid")
+        shutil.copy(helpers.resolve_filepath("samples/basic/example-1.sid"), self.sid_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def snapshots(self):
+        return [f for f in os.listdir(self.cache_dir) if f.endswith(".snapshot")]
+
+    def test_snapshot_written_and_reused(self):
+        first = pycoreconf.CORECONFModel(self.sid_file, cache_dir=self.cache_dir)
+        self.assertEqual(len(self.snapshots()), 1)
+
+        with mock.patch.object(ModelSID, "_collect_sid_data", side_effect=AssertionError("SID files parsed")):
+            second = pycoreconf.CORECONFModel(self.sid_file, cache_dir=self.cache_dir)
+
+        self.assertEqual(second.sids, first.sids)
+        self.assertEqual(second.types, first.types)
+        self.assertEqual(second.key_mapping, first.key_mapping)
+        self.assertEqual(second.decode(second.encode({"example-1:greeting": {"message": "Hi"}})),
+                         {"example-1:greeting": {"message": "Hi"}})
+
+    def test_snapshot_invalidated_on_source_change(self):
+        pycoreconf.CORECONFModel(self.sid_file, cache_dir=self.cache_dir)
+
+        with open(self.sid_file, "r") as f:
+            content = f.read()
+        with open(self.sid_file, "w") as f:
+            f.write(content.replace('"sid": "60003"', '"sid": "60009"'))
+
+        model = pycoreconf.CORECONFModel(self.sid_file, cache_dir=self.cache_dir)
+        self.assertEqual(model.sids["/example-1:greeting/message"], 60009)
+        self.assertEqual(len(self.snapshots()), 2)
+
+    def test_corrupt_snapshot_is_rebuilt(self):
+        pycoreconf.CORECONFModel(self.sid_file, cache_dir=self.cache_dir)
+        path = os.path.join(self.cache_dir, self.snapshots()[0])
+        with open(path, "wb") as f:
+            f.write(b"\x00garbage")
+
+        with self.assertLogs("pycoreconf.sid", level="WARNING"):
+            model = pycoreconf.CORECONFModel(self.sid_file, cache_dir=self.cache_dir)
+        self.assertEqual(model.sids["/example-1:greeting/message"], 60003)
+
+        # The rebuilt snapshot replaced the corrupt one
+        with mock.patch.object(ModelSID, "_collect_sid_data", side_effect=AssertionError("SID files parsed")):
+            pycoreconf.CORECONFModel(self.sid_file, cache_dir=self.cache_dir)
+
+    def test_cache_dir_from_environment(self):
+        with mock.patch.dict(os.environ, {"PYCORECONF_CACHE_DIR": self.cache_dir}):
+            model = pycoreconf.CORECONFModel(self.sid_file)
+
+        self.assertEqual(model.cache_dir, self.cache_dir)
+        self.assertEqual(len(self.snapshots()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Unit tests for projection decoding (decode(..., select=[...]))."""
+
+import json
+import unittest
+import helpers
+
+import pycoreconf
+
+RULE_5 = "/schc/rule[rule-id-value='5'][rule-id-length='3']"
+ENTRY_1 = ("/entry[field-id='fid-ipv6-trafficclass'][field-position='1']"
+           "[direction-indicator='di-bidirectional']")
+
+
+class TestProjection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sids = [
+            helpers.resolve_filepath("samples/multisid/ietf-schc@2023-01-28.sid"),
+            helpers.resolve_filepath("samples/multisid/ietf-schc-oam@2021-11-10.sid"),
+        ]
+        cls.ccm = pycoreconf.CORECONFModel(sids)
+        with open(helpers.resolve_filepath("samples/multisid/schc.json")) as f:
+            cls.config = json.load(f)
+        cls.cbor_data = cls.ccm.encode(cls.config)
+        cls.rules = cls.config["ietf-schc:schc"]["rule"]
+
+    def test_select_list_entry(self):
+        decoded = self.ccm.decode(self.cbor_data, select=[RULE_5])
+        self.assertEqual(decoded, {"ietf-schc:schc": {"rule": [self.rules[0]]}})
+
+    def test_select_leaf_keeps_entry_keys(self):
+        decoded = self.ccm.decode(self.cbor_data, select=RULE_5 + ENTRY_1 + "/target-value")
+
+        entry = self.rules[0]["entry"][1]
+        expected_entry = {k: entry[k] for k in ("field-id", "field-position", "direction-indicator", "target-value")}
+        expected_rule = {"rule-id-value": 5, "rule-id-length": 3, "entry": [expected_entry]}
+        self.assertEqual(decoded, {"ietf-schc:schc": {"rule": [expected_rule]}})
+
+    def test_select_leaf_in_every_entry(self):
+        decoded = self.ccm.decode(self.cbor_data, select=["/schc/rule/rule-nature"])
+        rules = decoded["ietf-schc:schc"]["rule"]
+
+        self.assertEqual(len(rules), len(self.rules))
+        for rule, original in zip(rules, self.rules):
+            self.assertEqual(set(rule), {"rule-id-value", "rule-id-length", "rule-nature"})
+            self.assertEqual(rule["rule-nature"], original["rule-nature"])
+
+    def test_overlapping_selections_are_merged(self):
+        decoded = self.ccm.decode(self.cbor_data, select=["/schc/rule/rule-nature", RULE_5])
+        rules = decoded["ietf-schc:schc"]["rule"]
+
+        self.assertEqual(rules[0], self.rules[0])
+        self.assertEqual(set(rules[1]), {"rule-id-value", "rule-id-length", "rule-nature"})
+
+    def test_no_match_returns_empty(self):
+        decoded = self.ccm.decode(self.cbor_data, select=["/schc/rule[rule-id-value='99'][rule-id-length='3']"])
+        self.assertEqual(decoded, {})
+
+    def test_unknown_path_raises(self):
+        with self.assertRaises(KeyError):
+            self.ccm.decode(self.cbor_data, select=["/schc/unknown"])
+
+    def test_datastore_from_cbor_with_select(self):
+        ds = self.ccm.create_datastore_from_cbor(self.cbor_data, select=[RULE_5 + ENTRY_1])
+
+        self.assertEqual(ds[RULE_5 + ENTRY_1 + "/field-length"], 8)
+        self.assertIsNone(ds["/schc/rule[rule-id-value='6'][rule-id-length='3']"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Unit tests for the SID schema tree (pycoreconf.sid.SchemaTree)."""
+
+import unittest
+import helpers
+
+import pycoreconf
+from pycoreconf.sid import SchemaTree
+
+
+class TestSchemaTree(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sids = [
+            helpers.resolve_filepath("samples/multisid/ietf-schc@2023-01-28.sid"),
+            helpers.resolve_filepath("samples/multisid/ietf-schc-oam@2021-11-10.sid"),
+        ]
+        cls.model = pycoreconf.CORECONFModel(sids)
+        cls.schema = cls.model.schema
+
+    def test_node_kinds_and_links(self):
+        schc = self.schema.root.child("ietf-schc:schc")
+        rule = schc.child("rule")
+
+        self.assertEqual(schc.kind, "container")
+        self.assertEqual(rule.kind, "list")
+        self.assertIs(rule.parent, schc)
+        self.assertEqual(rule.key_sids, tuple(self.model.key_mapping[str(rule.sid)]))
+
+        leaf = self.schema.nodes[rule.key_sids[0]]
+        self.assertEqual(leaf.kind, "leaf")
+        self.assertEqual(leaf.type, self.model.types[leaf.identifier])
+
+    def test_local_and_qualified_lookup(self):
+        schc = self.schema.root.child("schc")
+        rule = schc.child("rule")
+
+        self.assertIs(self.schema.root.child("ietf-schc:schc"), schc)
+        self.assertIs(schc.child("ietf-schc:rule"), rule)
+
+        # Augmented node from another module
+        augmented = rule.child("proxy-behavior")
+        self.assertEqual(augmented.module, "ietf-schc-oam")
+        self.assertIs(rule.child("ietf-schc-oam:proxy-behavior"), augmented)
+        self.assertIsNone(rule.child("ietf-schc:proxy-behavior"))
+
+    def test_ancestry(self):
+        node = self.schema.nodes[self.model.sids["/ietf-schc:schc/rule/entry/target-value/value"]]
+        self.assertEqual([n.name for n in node.ancestry()],
+                         ["schc", "rule", "entry", "target-value", "value"])
+
+    def test_identities_by_local_name(self):
+        sid = self.model.sids["ietf-schc-oam:proxy-pingv6"]
+        self.assertEqual(self.schema.identities["proxy-pingv6"], [sid])
+        self.assertEqual(self.schema.nodes[sid].kind, "identity")
+
+    def test_build_from_plain_tables(self):
+        tree = SchemaTree(
+            {"/root": 100, "/root/list": 110, "/root/list/id": 111, "mod:ident": 200},
+            {"/root/list/id": "uint8"},
+            {"110": [111]},
+        )
+        self.assertEqual(tree.root.child("root").child("list").key_sids, (111,))
+        self.assertEqual(tree.identities, {"ident": [200]})
+
+
+class TestIntKeyedTables(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = pycoreconf.CORECONFModel(
+            helpers.resolve_filepath("samples/datastore/coreconf-m2m@2026-03-29.sid"))
+
+    def test_list_keys(self):
+        transducer = self.model.sids["/coreconf-m2m:transducers/transducer"]
+
+        self.assertEqual(self.model.list_keys[transducer], (100096, 100064))
+        # String-keyed view kept for compatibility
+        self.assertEqual(self.model.key_mapping[str(transducer)], [100096, 100064])
+
+    def test_sid_types_and_enums(self):
+        sid = self.model.sids["/coreconf-m2m:transducers/transducer/quantity/timestamp-source"]
+
+        self.assertEqual(self.model.sid_types[sid], {"0": "source", "1": "receiver"})
+        self.assertEqual(self.model.enums[sid].names, {0: "source", 1: "receiver"})
+        self.assertEqual(self.model.enums[sid].values, {"source": 0, "receiver": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Unit tests for CBOR sequence reading and writing (iter_decode / write_sequence)."""
+
+import io
+import mmap
+import os
+import tempfile
+import threading
+import unittest
+import helpers
+
+import cbor2 as cbor
+import pycoreconf
+from pycoreconf.sequence import SequenceItem
+
+
+class TestSequence(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ccm = pycoreconf.CORECONFModel(helpers.resolve_filepath("samples/basic/example-1.sid"))
+        cls.configs = [{"example-1:greeting": {"message": "Hi" * i}} for i in range(1, 6)]
+        cls.data = b"".join(cls.ccm.encode(config) for config in cls.configs)
+
+    def test_write_then_read(self):
+        fp = io.BytesIO()
+        index = self.ccm.write_sequence(fp, iter(self.configs))
+
+        self.assertEqual(fp.getvalue(), self.data)
+        self.assertEqual(len(index), len(self.configs))
+        self.assertEqual(index[0][0], 0)
+        self.assertEqual(index[-1][0] + index[-1][1], len(self.data))
+
+        fp.seek(0)
+        self.assertEqual(list(self.ccm.iter_decode(fp)), self.configs)
+
+    def test_offsets_and_resume(self):
+        items = list(self.ccm.iter_decode(self.data, with_offsets=True))
+
+        self.assertIsInstance(items[0], SequenceItem)
+        self.assertEqual([item.value for item in items], self.configs)
+        for item, config in zip(items, self.configs):
+            self.assertEqual(self.data[item.offset:item.offset + item.size], self.ccm.encode(config))
+
+        resumed = list(self.ccm.iter_decode(io.BytesIO(self.data), offset=items[1].offset + items[1].size))
+        self.assertEqual(resumed, self.configs[2:])
+
+    def test_mmap(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(self.data)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self.assertEqual(list(self.ccm.iter_decode(mm)), self.configs)
+
+    def test_pipe(self):
+        read_fd, write_fd = os.pipe()
+
+        def writer():
+            with os.fdopen(write_fd, "wb") as w:
+                self.ccm.write_sequence(w, self.configs)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        with os.fdopen(read_fd, "rb") as r:
+            items = list(self.ccm.iter_decode(r, with_offsets=True))
+        thread.join()
+
+        self.assertEqual([item.value for item in items], self.configs)
+        self.assertEqual(items[-1].offset + items[-1].size, len(self.data))
+
+    def test_datastores_and_select(self):
+        datastores = list(self.ccm.iter_decode(self.data, as_datastore=True))
+        self.assertEqual(datastores[2]["/example-1:greeting/message"], "HiHiHi")
+
+        selected = list(self.ccm.iter_decode(self.data, select="/greeting/message"))
+        self.assertEqual(selected, self.configs)
+
+    def test_truncated_sequence_raises(self):
+        decoded = []
+        with self.assertRaises(cbor.CBORDecodeEOF):
+            for config in self.ccm.iter_decode(self.data[:-1]):
+                decoded.append(config)
+        self.assertEqual(decoded, self.configs[:-1])
+
+    def test_empty_sequence(self):
+        self.assertEqual(list(self.ccm.iter_decode(b"")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,9 @@ import helpers
 import pycoreconf
 from pycoreconf.model import ConfigValidationError
 import json
+import copy
+import io
+from decimal import Decimal
 
 try:
     import yangson
@@ -130,6 +133,46 @@ class TestSerialization(unittest.TestCase):
         decoded = ccm.decode(encoded)
         self.assertEqual(config, decoded)
 
+    def test_encode_stream_matches_encode(self):
+        """Test encode_stream writes the same bytes as encode."""
+        sids = [
+            "samples/multisid/ietf-schc@2023-01-28.sid",
+            "samples/multisid/ietf-schc-oam@2021-11-10.sid"
+        ]
+        ccm = self.make_ccm(sids)
+        config = json.loads(self.load_config_file("samples/multisid/schc.json"))
+
+        buffer = io.BytesIO()
+        ccm.encode_stream(config, buffer)
+
+        self.assertEqual(buffer.getvalue(), ccm.encode(config))
+        self.assertEqual(ccm.decode(buffer.getvalue()), config)
+
+    def test_encode_does_not_modify_input(self):
+        """Test encode leaves the input config untouched."""
+        sids = [
+            "samples/multisid/ietf-schc@2023-01-28.sid",
+            "samples/multisid/ietf-schc-oam@2021-11-10.sid"
+        ]
+        ccm = self.make_ccm(sids)
+        config = json.loads(self.load_config_file("samples/multisid/schc.json"))
+        snapshot = copy.deepcopy(config)
+
+        ccm.encode(config)
+        ccm.create_datastore(config)
+
+        self.assertEqual(config, snapshot)
+
+    def test_encode_non_json_leaf_values(self):
+        """Test encode accepts leaf values that are not JSON-serializable."""
+        ccm = self.make_ccm("samples/datastore/coreconf-m2m@2026-03-29.sid")
+        def config(value):
+            return {"coreconf-m2m:transducers": {"transducer": [
+                {"type": "coreconf-m2m:tilt", "id": 0, "quantity": {"value": value}}
+            ]}}
+
+        self.assertEqual(ccm.encode(config(Decimal("12"))), ccm.encode(config(12)))
+
 class TestValidation(unittest.TestCase):
     def make_ccm(self, sid_paths, desc_file=None):
         if isinstance(sid_paths, str):
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Unit tests for the shared model registry (CORECONFModel.get)."""
+
+import sys
+import unittest
+import helpers
+
+from pycoreconf import CORECONFModel
+
+SCHC = helpers.resolve_filepath("samples/multisid/ietf-schc@2023-01-28.sid")
+SCHC_OAM = helpers.resolve_filepath("samples/multisid/ietf-schc-oam@2021-11-10.sid")
+
+
+class TestSharedModel(unittest.TestCase):
+    def setUp(self):
+        CORECONFModel._registry.clear()
+        self.addCleanup(CORECONFModel._registry.clear)
+
+    def test_same_files_return_same_model(self):
+        first = CORECONFModel.get([SCHC, SCHC_OAM])
+        second = CORECONFModel.get([SCHC, SCHC_OAM])
+        other = CORECONFModel.get(SCHC)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertIsNot(first, CORECONFModel([SCHC, SCHC_OAM]))
+
+    def test_identifiers_and_types_shared_across_models(self):
+        both = CORECONFModel.get([SCHC, SCHC_OAM])
+        single = CORECONFModel.get(SCHC)
+
+        identifier = "/ietf-schc:schc/rule/entry/field-id"
+        key_both = next(k for k in both.sids if k == identifier)
+        key_single = next(k for k in single.sids if k == identifier)
+        self.assertIs(key_both, key_single)
+        self.assertIs(key_both, sys.intern(identifier))
+
+        for identifier, dtype in single.types.items():
+            self.assertIs(both.types[identifier], dtype)
+        self.assertIs(both.schema.nodes[both.sids[identifier]].type, both.types[identifier])
+
+    def test_converters_use_interned_tables(self):
+        ccm = CORECONFModel.get(SCHC)
+        sid = ccm.sids["/ietf-schc:schc/rule/rule-nature"] # identityref
+
+        self.assertIs(ccm._encoders[sid].__self__, ccm.sids)
+        lookups = [cell.cell_contents for cell in ccm._decoders[sid].__closure__
+                   if getattr(cell.cell_contents, "__self__", None) is not None]
+        self.assertTrue(lookups)
+        for lookup in lookups:
+            self.assertIs(lookup.__self__, ccm.ids)
+
+    def test_shared_model_behaves_like_a_model(self):
+        ccm = CORECONFModel.get([SCHC, SCHC_OAM])
+        config = {"ietf-schc:schc": {"rule": [{"rule-id-value": 1, "rule-id-length": 3,
+                                                "rule-nature": "ietf-schc:nature-compression"}]}}
+
+        self.assertEqual(ccm.decode(ccm.encode(config)), config)
+
+    def test_shared_model_is_read_only(self):
+        ccm = CORECONFModel.get(SCHC)
+        with self.assertRaises(RuntimeError):
+            ccm.add_modules_path("./yang")
+
+    def test_stats_report_saved_memory(self):
+        before = CORECONFModel.shared_stats()
+        CORECONFModel.get(SCHC)
+        CORECONFModel.get(SCHC)
+        CORECONFModel.get([SCHC, SCHC_OAM])
+        stats = CORECONFModel.shared_stats()
+
+        self.assertEqual(stats["models"], 2)
+        self.assertEqual(stats["hits"] - before["hits"], 1)
+        self.assertGreater(stats["reused_bytes"], before["reused_bytes"])
+        self.assertGreater(stats["interned_bytes"], before["interned_bytes"])
+        self.assertEqual(stats["saved_bytes"], stats["reused_bytes"] + stats["interned_bytes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
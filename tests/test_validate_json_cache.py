@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Unit tests for the cached yangson DataModel behind validate_json() and validate_many()."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import helpers
+
+import pycoreconf
+from pycoreconf.model import ConfigValidationError
+from pycoreconf.batch import BatchItemError
+
+try:
+    import yangson
+except ImportError:
+    yangson = None
+
+VALID = '{"example-4-a:bag": {"foo": 42}}'
+INVALID = '{"example-4-a:bag": {"foo": 256}}' # foo is uint8
+
+
+@unittest.skipIf(yangson is None, "yangson not installed")
+class TestDataModelCache(unittest.TestCase):
+    def setUp(self):
+        # Work on a copy of the sample so that file modifications can be tested
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        for name in ("description.json", "example-4-a.yang", "example-4-a.sid"):
+            shutil.copy(helpers.resolve_filepath("samples/validation/" + name), self.tmp)
+
+        self.ccm = pycoreconf.CORECONFModel(os.path.join(self.tmp, "example-4-a.sid"),
+                                            model_description_file=os.path.join(self.tmp, "description.json"))
+        self.ccm.add_modules_path([self.tmp, helpers.resolve_filepath("samples/validation/ietf/")])
+
+        patcher = mock.patch.object(yangson.DataModel, "from_file", wraps=yangson.DataModel.from_file)
+        self.from_file = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def touch(self, name):
+        path = os.path.join(self.tmp, name)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_model_parsed_once(self):
+        self.ccm.validate_json(VALID)
+        self.ccm.validate_json(VALID)
+        with self.assertRaises(ConfigValidationError):
+            self.ccm.validate_json(INVALID)
+        self.assertEqual(self.from_file.call_count, 1)
+
+    def test_add_modules_path_invalidates(self):
+        self.ccm.validate_json(VALID)
+        self.ccm.add_modules_path(self.tmp)
+        self.ccm.validate_json(VALID)
+        self.assertEqual(self.from_file.call_count, 2)
+
+    def test_modified_files_invalidate(self):
+        self.ccm.validate_json(VALID)
+        self.touch("example-4-a.yang")
+        self.ccm.validate_json(VALID)
+        self.touch("description.json")
+        self.ccm.validate_json(VALID)
+        self.assertEqual(self.from_file.call_count, 3)
+
+    def test_validate_many(self):
+        results = self.ccm.validate_many([VALID, INVALID, {"example-4-a:bag": {"foo": 7}}], errors="capture")
+        self.assertEqual(self.from_file.call_count, 1)
+        self.assertIsNone(results[0])
+        self.assertIsNone(results[2])
+        self.assertIsInstance(results[1], BatchItemError)
+        self.assertEqual(results[1].index, 1)
+        self.assertIsInstance(results[1].error, ConfigValidationError)
+
+        with self.assertRaises(BatchItemError) as e:
+            self.ccm.validate_many([VALID, INVALID])
+        self.assertEqual(e.exception.index, 1)
+
+    def test_validate_many_requires_description(self):
+        ccm = pycoreconf.CORECONFModel(os.path.join(self.tmp, "example-4-a.sid"))
+        with self.assertRaises(RuntimeError):
+            ccm.validate_many([VALID])
+
+
+if __name__ == "__main__":
+    unittest.main()
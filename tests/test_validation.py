@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Unit tests for native validation (ccm.validate() and ds.validate())."""
+
+import copy
+import json
+import unittest
+import helpers
+
+import cbor2 as cbor
+import pycoreconf
+from pycoreconf.model import ConfigValidationError
+
+RULE_5 = "/schc/rule[rule-id-value='5'][rule-id-length='3']"
+RULE_6 = "/schc/rule[rule-id-value='6'][rule-id-length='3']"
+
+
+class TestValidate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sids = [
+            helpers.resolve_filepath("samples/multisid/ietf-schc@2023-01-28.sid"),
+            helpers.resolve_filepath("samples/multisid/ietf-schc-oam@2021-11-10.sid"),
+        ]
+        cls.ccm = pycoreconf.CORECONFModel(sids)
+        with open(helpers.resolve_filepath("samples/multisid/schc.json")) as f:
+            cls.config = json.load(f)
+        cls.cbor_data = cls.ccm.encode(cls.config)
+
+    def issues(self, config):
+        with self.assertRaises(ConfigValidationError) as e:
+            self.ccm.validate(config)
+        return {(issue.path, issue.message) for issue in e.exception.errors}
+
+    def test_valid_trees(self):
+        self.ccm.validate(self.config)
+        self.ccm.validate(json.dumps(self.config))
+        self.ccm.validate(cbor.loads(self.cbor_data))
+
+    def test_identifier_tree_errors(self):
+        config = copy.deepcopy(self.config)
+        rules = config["ietf-schc:schc"]["rule"]
+        rules[0]["rule-id-length"] = 256
+        rules[1]["rule-id-value"] = rules[2]["rule-id-value"]
+        rules[1]["rule-id-length"] = rules[2]["rule-id-length"]
+        del rules[3]["rule-id-value"]
+        rules[4]["rule-nature"] = "ietf-schc:nature-unknown"
+        rules[5]["fcn-size"] = "3"
+        rules[6]["unknown-leaf"] = 1
+
+        self.assertEqual(self.issues(config), {
+            ("/ietf-schc:schc/rule[0]/rule-id-length", "uint8 value 256 out of range [0, 255]"),
+            ("/ietf-schc:schc/rule[2]", f"duplicate key values {[rules[2]['rule-id-value'], rules[2]['rule-id-length']]!r}"),
+            ("/ietf-schc:schc/rule[3]", "missing key 'rule-id-value'"),
+            ("/ietf-schc:schc/rule[4]/rule-nature", "unknown identity 'ietf-schc:nature-unknown'"),
+            ("/ietf-schc:schc/rule[5]/fcn-size", "invalid uint8 value '3'"),
+            ("/ietf-schc:schc/rule[6]/unknown-leaf", "unknown node"),
+        })
+
+    def test_flattened_keys(self):
+        ccm = pycoreconf.CORECONFModel(helpers.resolve_filepath("samples/basic/example-1.sid"))
+        ccm.validate({"example-1:greeting/message": "Hello!"})
+        ccm.validate({"example-1:greeting": {"message": "Hello!"}})
+
+        with self.assertRaises(ConfigValidationError) as e:
+            ccm.validate({"example-1:greeting/message": 42, "example-1:greeting/unknown": 1})
+        self.assertEqual({(issue.path, issue.message) for issue in e.exception.errors}, {
+            ("/example-1:greeting/message", "invalid string value 42"),
+            ("/example-1:greeting/unknown", "unknown node"),
+        })
+
+    def test_sid_tree_errors(self):
+        sids = self.ccm.sids
+        schc = sids["/ietf-schc:schc"]
+        rule = sids["/ietf-schc:schc/rule"]
+        data = cbor.loads(self.cbor_data)
+        rules = data[schc][rule - schc]
+        rules[0][sids["/ietf-schc:schc/rule/rule-nature"] - rule] = rule # not an identity
+        rules[1][sids["/ietf-schc:schc/rule/fcn-size"] - rule] = -1
+        rules[2][9999] = 0
+
+        self.assertEqual(self.issues(data), {
+            ("/ietf-schc:schc/rule[0]/rule-nature", f"unknown identity SID {rule}"),
+            ("/ietf-schc:schc/rule[1]/fcn-size", "uint8 value -1 out of range [0, 255]"),
+            ("/ietf-schc:schc/rule[2]/9999", "unknown SID delta 9999"),
+        })
+
+    def test_enum_and_union(self):
+        ccm = pycoreconf.CORECONFModel(helpers.resolve_filepath("samples/datastore/coreconf-m2m@2026-03-29.sid"))
+        enum_sid, dtype = next((sid, dtype) for sid, dtype in ccm.sid_types.items() if isinstance(dtype, dict))
+        validator = ccm._get_validator()
+        value = int(next(iter(dtype)))
+
+        self.assertEqual(validator.check_sid_tree(value, enum_sid), [])
+        self.assertEqual(validator.check_sid_tree(cbor.CBORTag(44, value), enum_sid), [])
+        self.assertEqual(len(validator.check_sid_tree(max(ccm.enums[enum_sid].names) + 1, enum_sid)), 1)
+
+        union_sid = next(sid for sid, dtype in self.ccm.sid_types.items() if dtype == ["identityref", "uint8"])
+        validator = self.ccm._get_validator()
+        identity = self.ccm.sids["ietf-schc:nature-compression"]
+        self.assertEqual(validator.check_sid_tree(cbor.CBORTag(45, identity), union_sid), [])
+        self.assertEqual(validator.check_sid_tree(7, union_sid), [])
+        self.assertEqual(len(validator.check_sid_tree(cbor.CBORTag(45, 7), union_sid)), 1)
+        self.assertEqual(len(validator.check_sid_tree(cbor.CBORTag(44, 7), union_sid)), 1)
+
+
+class TestDatastoreValidate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sids = [
+            helpers.resolve_filepath("samples/multisid/ietf-schc@2023-01-28.sid"),
+            helpers.resolve_filepath("samples/multisid/ietf-schc-oam@2021-11-10.sid"),
+        ]
+        cls.ccm = pycoreconf.CORECONFModel(sids)
+        with open(helpers.resolve_filepath("samples/multisid/schc.json")) as f:
+            cls.cbor_data = cls.ccm.encode(json.load(f))
+
+    def setUp(self):
+        self.ds = self.ccm.create_datastore_from_cbor(self.cbor_data)
+
+    def test_full_validation(self):
+        self.ds.validate()
+        self.ds[RULE_5 + "/fcn-size"] = 300
+        with self.assertRaises(ConfigValidationError) as e:
+            self.ds.validate()
+        self.assertEqual([issue.path for issue in e.exception.errors], ["/ietf-schc:schc/rule[0]/fcn-size"])
+
+    def test_touched_only(self):
+        # Invalid data outside the edits is not visited
+        sids = self.ccm.sids
+        rule = sids["/ietf-schc:schc/rule"]
+        self.ds.data[sids["/ietf-schc:schc"]][rule - sids["/ietf-schc:schc"]][3][sids["/ietf-schc:schc/rule/fcn-size"] - rule] = 999
+
+        self.ds[RULE_5 + "/fcn-size"] = 4
+        self.ds.validate(touched_only=True)
+
+        self.ds[RULE_6 + "/fcn-size"] = 256
+        with self.assertRaises(ConfigValidationError) as e:
+            self.ds.validate(touched_only=True)
+        self.assertEqual([issue.path for issue in e.exception.errors],
+                         ["/schc/rule[rule-id-value='6'][rule-id-length='3']/fcn-size"])
+
+        # Touched nodes are cleared by validate()
+        self.ds.validate(touched_only=True)
+
+    def test_touched_limit(self):
+        sids = self.ccm.sids
+        rule = sids["/ietf-schc:schc/rule"]
+        self.ds.data[sids["/ietf-schc:schc"]][rule - sids["/ietf-schc:schc"]][3][sids["/ietf-schc:schc/rule/fcn-size"] - rule] = 999
+
+        self.ds.touched_limit = 2
+        for size in (1, 2):
+            self.ds[RULE_5 + "/fcn-size"] = size # same node, tracked once
+        self.ds[RULE_6 + "/fcn-size"] = 3
+        self.ds.validate(touched_only=True)
+
+        self.ds[RULE_5 + "/fcn-size"] = 4
+        self.ds[RULE_6 + "/fcn-size"] = 4
+        self.ds[RULE_5 + "/w-size"] = 1 # beyond the limit: everything is validated
+        with self.assertRaises(ConfigValidationError) as e:
+            self.ds.validate(touched_only=True)
+        self.assertEqual([issue.path for issue in e.exception.errors], ["/ietf-schc:schc/rule[3]/fcn-size"])
+        self.assertEqual(self.ds._touched, {})
+
+    def test_touched_key_change(self):
+        self.ds[RULE_6 + "/rule-id-value"] = 5 # duplicates rule 5
+        with self.assertRaises(ConfigValidationError) as e:
+            self.ds.validate(touched_only=True)
+        self.assertEqual([issue.message for issue in e.exception.errors], ["duplicate key values [5, 3]"])
+
+    def test_touched_removed_node(self):
+        with self.ds.transaction() as tx:
+            tx[RULE_5 + "/fcn-size"] = 300
+            del tx[RULE_5]
+        self.ds.validate(touched_only=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Unit tests for the CORECONFDatastore compiled XPath cache."""
+
+import unittest
+import helpers
+
+import pycoreconf
+
+
+class TestXPathCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sid_path = helpers.resolve_filepath("samples/datastore/coreconf-m2m@2026-03-29.sid")
+        cls.model = pycoreconf.CORECONFModel(cls.sid_path)
+
+    def setUp(self):
+        self.ds = self.model.create_datastore()
+
+    def test_repeated_xpath_skips_parsing(self):
+        xpath = "/transducers/transducer[type='tilt'][id='3']/precision"
+        first = self.ds._compile_xpath(xpath)
+
+        self.ds._parse_xpath = None # any re-parse would fail
+        self.assertIs(self.ds._compile_xpath(xpath), first)
+
+    def test_template_shared_across_key_values(self):
+        compiled_a, keys_a = self.ds._compile_xpath("/transducers/transducer[type='tilt'][id='3']/unit")
+        compiled_b, keys_b = self.ds._compile_xpath("/transducers/transducer[type='wind-speed'][id='4']/unit")
+
+        self.assertIs(compiled_a, compiled_b)
+        self.assertEqual(keys_a, (self.model.sids["coreconf-m2m:tilt"], 3))
+        self.assertEqual(keys_b, (self.model.sids["coreconf-m2m:wind-speed"], 4))
+        self.assertEqual(compiled_a.target_sid, 100097)
+        self.assertEqual([sid for sid, _ in compiled_a.chain], [100062, 100063, 100097])
+
+    def test_cache_is_bounded(self):
+        self.ds.xpath_cache_size = 4
+        for i in range(10):
+            self.ds[f"/transducers/transducer[type='tilt'][id='{i}']/precision"] = i
+
+        self.assertEqual(len(self.ds._xpath_cache), 4)
+        self.assertIn("/transducers/transducer[type='tilt'][id='9']/precision", self.ds._xpath_cache)
+        self.assertEqual(self.ds["/transducers/transducer[type='tilt'][id='0']/precision"], 0)
+
+    def test_resolution_errors_are_not_cached(self):
+        with self.assertRaises(KeyError):
+            self.ds._compile_xpath("/transducers/unknown")
+        with self.assertRaises(ValueError):
+            self.ds._compile_xpath("/transducers/transducer[type='not-an-identity'][id='0']")
+
+        self.assertEqual(len(self.ds._xpath_cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()